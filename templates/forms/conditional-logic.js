@@ -5,20 +5,23 @@
  * Supports: ==, !=, >, <, >=, <=, AND, OR, is_empty, is_filled, contains
  */
 
+// Will be injected by form generator: question id -> ids whose conditions reference it
+const CONDITION_DEPENDENTS = {{CONDITION_DEPENDENTS}};
+
 /**
  * Get the current value of a field by ID
  */
 function getFieldValue(fieldId) {
     // Try radio buttons first
-    const radio = document.querySelector(`input[name="${fieldId}"]:checked`);
+    const radio = findElement(`input[name="${fieldId}"]:checked`);
     if (radio) return radio.value;
 
     // Try checkbox
-    const checkbox = document.querySelector(`input[name="${fieldId}"][type="checkbox"]`);
+    const checkbox = findElement(`input[name="${fieldId}"][type="checkbox"]`);
     if (checkbox) return checkbox.checked;
 
     // Try regular input/textarea/select
-    const field = document.getElementById(fieldId) || document.querySelector(`[name="${fieldId}"]`);
+    const field = findElement(`#${CSS.escape(fieldId)}`) || findElement(`[name="${fieldId}"]`);
     if (field) return field.value;
 
     return null;
@@ -109,6 +112,36 @@ function evaluateExpression(expr) {
     return true; // Default to showing the field
 }
 
+/**
+ * Tell autosave/progress tracking about a value or disabled state changed here,
+ * since programmatic changes fire no input events
+ */
+function notifyFieldChange(field) {
+    // Dispatched on the form: fields of sections not rendered yet are outside the document
+    const form = document.getElementById('form');
+    if (form) form.dispatchEvent(new CustomEvent('form:fieldchange', { detail: { field } }));
+}
+
+/**
+ * Templates holding sections not rendered yet (lazy mode)
+ */
+function lazyTemplates() {
+    return document.querySelectorAll('.lazy-section > template');
+}
+
+/**
+ * First element matching selector, rendered or inside a lazy section template
+ */
+function findElement(selector) {
+    const found = document.querySelector(selector);
+    if (found) return found;
+    for (const template of lazyTemplates()) {
+        const inTemplate = template.content.querySelector(selector);
+        if (inTemplate) return inTemplate;
+    }
+    return null;
+}
+
 /**
  * Announce conditional field visibility changes to screen readers
  */
@@ -132,11 +165,18 @@ function announceFieldChange(fieldTitle, visible) {
 }
 
 /**
- * Update visibility of conditional fields
+ * Update visibility of conditional fields within scope (default: the whole
+ * document, including sections not rendered yet)
  */
-function updateConditionalFields() {
+function updateConditionalFields(scope) {
+    if (!scope) {
+        updateConditionalFields(document);
+        lazyTemplates().forEach(template => updateConditionalFields(template.content));
+        return;
+    }
+
     // Handle show_if conditions
-    document.querySelectorAll('[data-show-if]').forEach(field => {
+    scope.querySelectorAll('[data-show-if]').forEach(field => {
         const condition = field.getAttribute('data-show-if');
         const shouldShow = evaluateExpression(condition);
 
@@ -167,59 +207,42 @@ function updateConditionalFields() {
 
                 // Clear value when hidden
                 if (field.type === 'radio' || field.type === 'checkbox') {
-                    field.checked = false;
-                } else {
+                    if (field.checked) {
+                        field.checked = false;
+                        notifyFieldChange(field);
+                    }
+                } else if (field.value !== '') {
                     field.value = '';
+                    notifyFieldChange(field);
                 }
             }
         }
     });
 
     // Handle required_if conditions
-    document.querySelectorAll('[data-required-if]').forEach(field => {
+    scope.querySelectorAll('[data-required-if]').forEach(field => {
         const condition = field.getAttribute('data-required-if');
         const shouldBeRequired = evaluateExpression(condition);
 
+        // validation.js reads the required attribute for required_if fields
         if (shouldBeRequired) {
             field.setAttribute('required', 'true');
             field.setAttribute('aria-required', 'true');
-
-            // Update validation rules
-            const validationRules = field.getAttribute('data-validation');
-            if (validationRules) {
-                try {
-                    const rules = JSON.parse(validationRules);
-                    rules.required = true;
-                    field.setAttribute('data-validation', JSON.stringify(rules));
-                } catch (e) {
-                    // If no validation rules, add required
-                    field.setAttribute('data-validation', JSON.stringify({ required: true }));
-                }
-            } else {
-                field.setAttribute('data-validation', JSON.stringify({ required: true }));
-            }
         } else {
             field.removeAttribute('required');
             field.setAttribute('aria-required', 'false');
-
-            // Update validation rules
-            const validationRules = field.getAttribute('data-validation');
-            if (validationRules) {
-                try {
-                    const rules = JSON.parse(validationRules);
-                    delete rules.required;
-                    field.setAttribute('data-validation', JSON.stringify(rules));
-                } catch (e) {}
-            }
         }
     });
 
     // Handle disabled_if conditions
-    document.querySelectorAll('[data-disabled-if]').forEach(field => {
+    scope.querySelectorAll('[data-disabled-if]').forEach(field => {
         const condition = field.getAttribute('data-disabled-if');
         const shouldBeDisabled = evaluateExpression(condition);
 
-        field.disabled = shouldBeDisabled;
+        if (field.disabled !== shouldBeDisabled) {
+            field.disabled = shouldBeDisabled;
+            notifyFieldChange(field);
+        }
 
         if (shouldBeDisabled) {
             field.setAttribute('aria-disabled', 'true');
@@ -231,6 +254,37 @@ function updateConditionalFields() {
     });
 }
 
+/**
+ * Re-evaluate the questions that depend on a changed question, directly or
+ * through other conditions (a hidden question's value is cleared), in
+ * dependency order. The generator rejects cycles, so this terminates.
+ */
+function updateDependents(questionId) {
+    const order = [];
+    const visited = new Set();
+    const visit = id => {
+        (CONDITION_DEPENDENTS[id] || []).forEach(dependent => {
+            if (!visited.has(dependent)) {
+                visited.add(dependent);
+                visit(dependent);
+                order.push(dependent);
+            }
+        });
+    };
+    visit(questionId);
+
+    // Reverse post-order is a topological order
+    for (let i = order.length - 1; i >= 0; i--) {
+        const questionDiv = findElement(`[data-question="${CSS.escape(order[i])}"]`);
+        if (questionDiv) updateConditionalFields(questionDiv);
+    }
+}
+
+function handleConditionalChange(event) {
+    const questionDiv = event.target.closest('[data-question]');
+    if (questionDiv) updateDependents(questionDiv.getAttribute('data-question'));
+}
+
 /**
  * Initialize conditional logic
  */
@@ -238,11 +292,11 @@ function initConditionalLogic() {
     // Update on page load
     updateConditionalFields();
 
-    // Update on any form change
+    // Update dependents of the changed question
     const form = document.getElementById('form');
     if (form) {
-        form.addEventListener('change', updateConditionalFields);
-        form.addEventListener('input', updateConditionalFields);
+        form.addEventListener('change', handleConditionalChange);
+        form.addEventListener('input', handleConditionalChange);
     }
 }
 
@@ -10,122 +10,249 @@ const savedIndicator = document.getElementById('savedIndicator');
 const TOTAL_QUESTIONS = {{TOTAL_QUESTIONS}};
 const STORAGE_KEY = '{{STORAGE_KEY}}';
 
-function loadData() {
-    const saved = localStorage.getItem(STORAGE_KEY);
-    if (saved) {
-        const data = JSON.parse(saved);
-        Object.keys(data).forEach(key => {
-            const elements = form.elements[key];
-            if (elements) {
-                if (elements.length > 1) {
-                    // Radio or checkbox group
-                    for (let elem of elements) {
-                        if (elem.type === 'radio') {
-                            elem.checked = elem.value === data[key];
-                        } else if (elem.type === 'checkbox') {
-                            elem.checked = data[key] === true || data[key] === 'true';
-                        }
-                    }
-                } else {
-                    // Single element
-                    if (elements.type === 'checkbox') {
-                        elements.checked = data[key] === true || data[key] === 'true';
-                    } else {
-                        elements.value = data[key] || '';
-                    }
-                }
-            }
+// Will be injected by form generator: question id -> [mode, field names that count as answered]
+const FIELD_INDEX = {{FIELD_INDEX}};
+
+// Autosave is batched; payloads larger than this go to IndexedDB instead of localStorage
+const SAVE_DELAY_MS = 500;
+const IDB_THRESHOLD = 256 * 1024;
+const STORE_MARKER_KEY = STORAGE_KEY + ':store';
+
+// Saved form data, kept in sync field by field (same shape as a FormData dump)
+let formState = {};
+let hasSavedData = false;
+let saveTimer = null;
+
+// Sections not rendered yet (lazy mode): placeholders holding an inert <template>
+const pendingSections = new Set(form.querySelectorAll('.lazy-section'));
+let sectionObserver = null;
+
+// Every field, rendered or still inside a template. Rendering a section moves
+// the template's own nodes into the page, so these references stay valid and
+// autosave, export and progress cover sections that were never rendered.
+const allFields = Array.from(form.elements).filter(elem => ['INPUT', 'TEXTAREA', 'SELECT'].includes(elem.tagName));
+pendingSections.forEach(placeholder => {
+    allFields.push(...placeholder.querySelector('template').content.querySelectorAll('input, textarea, select'));
+});
+
+// Field name -> question id, field name -> elements, and the ids of answered questions
+const fieldQuestion = {};
+const fieldElements = new Map();
+const answeredQuestions = new Set();
+Object.keys(FIELD_INDEX).forEach(id => {
+    FIELD_INDEX[id][1].forEach(name => { fieldQuestion[name] = id; });
+});
+allFields.forEach(elem => {
+    if (!elem.name) return;
+    if (!fieldElements.has(elem.name)) fieldElements.set(elem.name, []);
+    fieldElements.get(elem.name).push(elem);
+});
+
+function namedFields(name) {
+    return fieldElements.get(name) || [];
+}
+
+/* Storage: localStorage for small payloads, IndexedDB for large ones */
+
+function openFormDB() {
+    return new Promise((resolve, reject) => {
+        const request = indexedDB.open('meso-forms', 1);
+        request.onupgradeneeded = () => request.result.createObjectStore('forms');
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+function idbRequest(mode, action) {
+    return openFormDB().then(db => new Promise((resolve, reject) => {
+        const tx = db.transaction('forms', mode);
+        const request = action(tx.objectStore('forms'));
+        tx.oncomplete = () => { db.close(); resolve(request.result); };
+        tx.onerror = () => { db.close(); reject(tx.error); };
+    }));
+}
+
+function writeStorage(json) {
+    if (json.length > IDB_THRESHOLD && window.indexedDB) {
+        return idbRequest('readwrite', store => store.put(json, STORAGE_KEY)).then(() => {
+            localStorage.setItem(STORE_MARKER_KEY, 'idb');
+            localStorage.removeItem(STORAGE_KEY);
         });
-        updateProgress();
     }
+    localStorage.setItem(STORAGE_KEY, json);
+    if (localStorage.getItem(STORE_MARKER_KEY)) {
+        localStorage.removeItem(STORE_MARKER_KEY);
+        idbRequest('readwrite', store => store.delete(STORAGE_KEY)).catch(() => {});
+    }
+    return Promise.resolve();
 }
 
-function saveData() {
-    const formData = new FormData(form);
-    const data = {};
-    for (let [key, value] of formData.entries()) {
-        data[key] = value;
+function readStorage() {
+    if (localStorage.getItem(STORE_MARKER_KEY) === 'idb' && window.indexedDB) {
+        return idbRequest('readonly', store => store.get(STORAGE_KEY));
     }
-    // Also save unchecked checkboxes
-    form.querySelectorAll('input[type="checkbox"]').forEach(cb => {
-        if (!data[cb.name]) {
-            data[cb.name] = cb.checked;
-        }
+    return Promise.resolve(localStorage.getItem(STORAGE_KEY));
+}
+
+function clearStorage() {
+    localStorage.removeItem(STORAGE_KEY);
+    if (localStorage.getItem(STORE_MARKER_KEY)) {
+        localStorage.removeItem(STORE_MARKER_KEY);
+        if (window.indexedDB) idbRequest('readwrite', store => store.delete(STORAGE_KEY)).catch(() => {});
+    }
+}
+
+/* Form state */
+
+// Saved value of one field, as FormData records it (undefined when omitted);
+// unchecked checkboxes are saved as false
+function fieldValue(name) {
+    let value;
+    let isCheckbox = false;
+    namedFields(name).forEach(elem => {
+        if (elem.type === 'checkbox') isCheckbox = true;
+        if (elem.disabled) return;
+        if ((elem.type === 'radio' || elem.type === 'checkbox') && !elem.checked) return;
+        value = elem.value;
+    });
+    if (isCheckbox && !value) {
+        const checkboxes = namedFields(name).filter(elem => elem.type === 'checkbox');
+        value = checkboxes[checkboxes.length - 1].checked;
+    }
+    return value;
+}
+
+function collectFormData() {
+    const data = {};
+    fieldElements.forEach((_, name) => {
+        const value = fieldValue(name);
+        if (value !== undefined) data[name] = value;
     });
-    localStorage.setItem(STORAGE_KEY, JSON.stringify(data));
+    return data;
+}
 
-    if (savedIndicator) {
-        savedIndicator.classList.add('show');
-        setTimeout(() => {
-            savedIndicator.classList.remove('show');
-        }, 2000);
+// Refresh one field's entry in formState
+function updateFieldState(name) {
+    const value = fieldValue(name);
+    if (value === undefined) {
+        delete formState[name];
+    } else {
+        formState[name] = value;
     }
 }
 
-function updateProgress() {
-    const questions = form.querySelectorAll('[data-question]');
-    let answered = 0;
-
-    questions.forEach(q => {
-        const radios = q.querySelectorAll('input[type="radio"]');
-        if (radios.length > 0) {
-            // Get unique names
-            const names = new Set();
-            radios.forEach(r => names.add(r.name));
-            // Check if any radio group is answered
-            let hasAnswer = false;
-            names.forEach(name => {
-                if (form.querySelector(`input[name="${name}"]:checked`)) {
-                    hasAnswer = true;
-                }
-            });
-            if (hasAnswer) answered++;
-        } else {
-            // Has textareas or other inputs
-            const inputs = q.querySelectorAll('textarea, input[type="text"], input[type="number"]');
-            if (Array.from(inputs).some(i => i.value.trim())) {
-                answered++;
+function applyData(data) {
+    Object.keys(data).forEach(key => {
+        namedFields(key).forEach(elem => {
+            if (elem.type === 'radio') {
+                elem.checked = elem.value === data[key];
+            } else if (elem.type === 'checkbox') {
+                // Checked boxes are saved as their value
+                elem.checked = data[key] === true || data[key] === 'true' || data[key] === elem.value;
+            } else {
+                elem.value = data[key] || '';
             }
-        }
+        });
     });
+}
+
+function loadData() {
+    formState = collectFormData();
+    return readStorage().then(saved => {
+        if (saved) {
+            applyData(JSON.parse(saved));
+            // Restored answers may change which conditional questions apply
+            if (typeof updateConditionalFields === 'function') updateConditionalFields();
+            formState = collectFormData();
+            hasSavedData = true;
+            updateProgress();
+        }
+    }).catch(e => console.warn('Could not load saved progress:', e));
+}
+
+// Write formState now (also cancels a pending autosave)
+function saveData() {
+    clearTimeout(saveTimer);
+    saveTimer = null;
+    hasSavedData = true;
+
+    writeStorage(JSON.stringify(formState)).then(() => {
+        if (savedIndicator) {
+            savedIndicator.classList.add('show');
+            setTimeout(() => {
+                savedIndicator.classList.remove('show');
+            }, 2000);
+        }
+    }).catch(e => console.warn('Could not save progress:', e));
+}
+
+function scheduleSave() {
+    clearTimeout(saveTimer);
+    saveTimer = setTimeout(saveData, SAVE_DELAY_MS);
+}
 
+/* Progress */
+
+function isAnswered(questionId) {
+    const [mode, names] = FIELD_INDEX[questionId];
+    return names.some(name => namedFields(name).some(elem => (
+        mode === 'radio' ? elem.type === 'radio' && elem.checked : elem.value.trim()
+    )));
+}
+
+function renderProgress() {
+    const answered = answeredQuestions.size;
     const percent = Math.round((answered / TOTAL_QUESTIONS) * 100);
     if (progressFill) progressFill.style.width = percent + '%';
     if (progressPercent) progressPercent.textContent = percent;
     if (answeredCount) answeredCount.textContent = answered;
 }
 
-form.addEventListener('change', () => {
-    saveData();
-    updateProgress();
-});
+// Recompute every question (page load, restore, reset)
+function updateProgress() {
+    answeredQuestions.clear();
+    Object.keys(FIELD_INDEX).forEach(id => {
+        if (isAnswered(id)) answeredQuestions.add(id);
+    });
+    renderProgress();
+}
 
-form.addEventListener('input', () => {
-    saveData();
-    updateProgress();
-});
+// Recompute only the question a field belongs to
+function updateQuestionProgress(name) {
+    const id = fieldQuestion[name];
+    if (id === undefined) return;
+    if (isAnswered(id)) {
+        answeredQuestions.add(id);
+    } else {
+        answeredQuestions.delete(id);
+    }
+    renderProgress();
+}
 
-// Option highlighting
-document.querySelectorAll('.option input[type="radio"]').forEach(radio => {
-    radio.addEventListener('change', () => {
-        const name = radio.name;
-        document.querySelectorAll(`input[name="${name}"]`).forEach(r => {
-            r.closest('.option')?.classList.remove('selected');
-        });
-        if (radio.checked) {
-            radio.closest('.option')?.classList.add('selected');
-        }
-    });
+function handleFieldChange(event) {
+    const name = (event.detail?.field || event.target).name;
+    if (!name) return;
+    updateFieldState(name);
+    updateQuestionProgress(name);
+    scheduleSave();
+}
+
+form.addEventListener('change', handleFieldChange);
+form.addEventListener('input', handleFieldChange);
+// Dispatched by conditional logic when it clears or disables a field (detail.field)
+form.addEventListener('form:fieldchange', handleFieldChange);
+
+// Don't lose a pending autosave when the page is closed
+window.addEventListener('pagehide', () => {
+    if (saveTimer) saveData();
 });
 
 document.getElementById('exportBtn')?.addEventListener('click', () => {
-    const saved = localStorage.getItem(STORAGE_KEY);
-    if (saved) {
-        const data = JSON.parse(saved);
+    if (hasSavedData || saveTimer) {
         const exportData = {
             formTitle: document.querySelector('h1')?.textContent || 'Form',
             exportDate: new Date().toISOString(),
-            data: data
+            data: formState
         };
         const blob = new Blob([JSON.stringify(exportData, null, 2)], { type: 'application/json' });
         const url = URL.createObjectURL(blob);
@@ -146,8 +273,22 @@ document.getElementById('saveBtn')?.addEventListener('click', () => {
 
 document.getElementById('clearBtn')?.addEventListener('click', () => {
     if (confirm('⚠️ Are you sure you want to clear all your answers?')) {
-        localStorage.removeItem(STORAGE_KEY);
+        clearTimeout(saveTimer);
+        saveTimer = null;
+        clearStorage();
+        hasSavedData = false;
         form.reset();
+        // form.reset() does not reach fields of sections not rendered yet
+        pendingSections.forEach(placeholder => {
+            placeholder.querySelector('template').content.querySelectorAll('input, textarea').forEach(elem => {
+                if (elem.type === 'radio' || elem.type === 'checkbox') {
+                    elem.checked = elem.defaultChecked;
+                } else {
+                    elem.value = elem.defaultValue;
+                }
+            });
+        });
+        formState = collectFormData();
         updateProgress();
         document.querySelectorAll('.option.selected').forEach(opt => {
             opt.classList.remove('selected');
@@ -160,137 +301,203 @@ document.getElementById('printBtn')?.addEventListener('click', () => {
     window.print();
 });
 
-// Range slider value display
-document.querySelectorAll('.range-input input[type="range"]').forEach(slider => {
-    const output = slider.nextElementSibling;
-    if (output && output.tagName === 'OUTPUT') {
-        slider.addEventListener('input', () => {
-            const unit = output.textContent.match(/[^0-9.-]+$/)?.[0] || '';
-            output.textContent = slider.value + unit;
+/* Per-section setup: option highlighting, sliders, gauges, keyboard navigation */
+
+/**
+ * Attach widget listeners within root (the form, or a section rendered later)
+ */
+function initSection(root) {
+    // Option highlighting
+    root.querySelectorAll('.option input[type="radio"]').forEach(radio => {
+        radio.addEventListener('change', () => {
+            const name = radio.name;
+            document.querySelectorAll(`input[name="${name}"]`).forEach(r => {
+                r.closest('.option')?.classList.remove('selected');
+            });
+            if (radio.checked) {
+                radio.closest('.option')?.classList.add('selected');
+            }
         });
-    }
-});
+    });
 
-// Importance gauge updates
-document.querySelectorAll('.importance-gauge input[type="range"]').forEach(slider => {
-    const gaugeFill = slider.closest('.importance-gauge').querySelector('.gauge-fill');
-    const currentValue = slider.closest('.importance-gauge').querySelector('.gauge-current-value');
+    // Range slider value display
+    root.querySelectorAll('.range-input input[type="range"]').forEach(slider => {
+        const output = slider.nextElementSibling;
+        if (output && output.tagName === 'OUTPUT') {
+            slider.addEventListener('input', () => {
+                const unit = output.textContent.match(/[^0-9.-]+$/)?.[0] || '';
+                output.textContent = slider.value + unit;
+            });
+        }
+    });
 
-    slider.addEventListener('input', () => {
-        const min = parseFloat(slider.min);
-        const max = parseFloat(slider.max);
-        const value = parseFloat(slider.value);
-        const percent = ((value - min) / (max - min)) * 100;
+    // Importance gauge updates
+    root.querySelectorAll('.importance-gauge input[type="range"]').forEach(slider => {
+        const gaugeFill = slider.closest('.importance-gauge').querySelector('.gauge-fill');
+        const currentValue = slider.closest('.importance-gauge').querySelector('.gauge-current-value');
 
-        if (gaugeFill) {
-            gaugeFill.style.width = percent + '%';
-            gaugeFill.setAttribute('data-value', value);
-        }
+        slider.addEventListener('input', () => {
+            const min = parseFloat(slider.min);
+            const max = parseFloat(slider.max);
+            const value = parseFloat(slider.value);
+            const percent = ((value - min) / (max - min)) * 100;
+
+            if (gaugeFill) {
+                gaugeFill.style.width = percent + '%';
+                gaugeFill.setAttribute('data-value', value);
+            }
 
-        if (currentValue) {
-            currentValue.textContent = value;
-        }
+            if (currentValue) {
+                currentValue.textContent = value;
+            }
+        });
     });
-});
 
-// Initialize
-loadData();
-updateProgress();
-document.querySelectorAll('input[type="radio"]:checked').forEach(radio => {
-    radio.closest('.option')?.classList.add('selected');
-});
+    // Keyboard navigation for star ratings and likert scales
+    // Arrow key navigation for star ratings
+    root.querySelectorAll('.star-rating').forEach(fieldset => {
+        const inputs = Array.from(fieldset.querySelectorAll('input[type="radio"]'));
+        if (inputs.length === 0) return;
 
-/* Keyboard Navigation for Star Rating and Likert Scales */
+        // Reverse the array because stars are rendered in reverse order
+        const starsInOrder = inputs.reverse();
 
-// Arrow key navigation for star ratings
-document.querySelectorAll('.star-rating').forEach(fieldset => {
-    const inputs = Array.from(fieldset.querySelectorAll('input[type="radio"]'));
-    if (inputs.length === 0) return;
+        fieldset.addEventListener('keydown', (e) => {
+            if (!['ArrowLeft', 'ArrowRight', 'ArrowUp', 'ArrowDown'].includes(e.key)) return;
 
-    // Reverse the array because stars are rendered in reverse order
-    const starsInOrder = inputs.reverse();
+            e.preventDefault();
+            const currentIndex = starsInOrder.findIndex(input => input === document.activeElement);
 
-    fieldset.addEventListener('keydown', (e) => {
-        if (!['ArrowLeft', 'ArrowRight', 'ArrowUp', 'ArrowDown'].includes(e.key)) return;
-
-        e.preventDefault();
-        const currentIndex = starsInOrder.findIndex(input => input === document.activeElement);
+            if (currentIndex === -1) {
+                // No star focused, focus the first one
+                starsInOrder[0].focus();
+                return;
+            }
 
-        if (currentIndex === -1) {
-            // No star focused, focus the first one
-            starsInOrder[0].focus();
-            return;
-        }
+            let nextIndex = currentIndex;
+            if (e.key === 'ArrowRight' || e.key === 'ArrowUp') {
+                nextIndex = Math.min(currentIndex + 1, starsInOrder.length - 1);
+            } else if (e.key === 'ArrowLeft' || e.key === 'ArrowDown') {
+                nextIndex = Math.max(currentIndex - 1, 0);
+            }
 
-        let nextIndex = currentIndex;
-        if (e.key === 'ArrowRight' || e.key === 'ArrowUp') {
-            nextIndex = Math.min(currentIndex + 1, starsInOrder.length - 1);
-        } else if (e.key === 'ArrowLeft' || e.key === 'ArrowDown') {
-            nextIndex = Math.max(currentIndex - 1, 0);
-        }
+            if (nextIndex !== currentIndex) {
+                starsInOrder[nextIndex].focus();
+                starsInOrder[nextIndex].checked = true;
+                starsInOrder[nextIndex].dispatchEvent(new Event('change', { bubbles: true }));
+            }
+        });
 
-        if (nextIndex !== currentIndex) {
-            starsInOrder[nextIndex].focus();
-            starsInOrder[nextIndex].checked = true;
-            starsInOrder[nextIndex].dispatchEvent(new Event('change', { bubbles: true }));
-        }
+        // Make labels focusable and forward focus to inputs
+        fieldset.querySelectorAll('label').forEach((label, idx) => {
+            label.addEventListener('keydown', (e) => {
+                if (e.key === 'Enter' || e.key === ' ') {
+                    e.preventDefault();
+                    const input = fieldset.querySelector(`#${label.getAttribute('for')}`);
+                    if (input) {
+                        input.checked = true;
+                        input.dispatchEvent(new Event('change', { bubbles: true }));
+                        saveData();
+                    }
+                }
+            });
+        });
     });
 
-    // Make labels focusable and forward focus to inputs
-    fieldset.querySelectorAll('label').forEach((label, idx) => {
-        label.addEventListener('keydown', (e) => {
-            if (e.key === 'Enter' || e.key === ' ') {
-                e.preventDefault();
-                const input = fieldset.querySelector(`#${label.getAttribute('for')}`);
-                if (input) {
+    // Arrow key navigation for likert scales
+    root.querySelectorAll('.likert-scale').forEach(fieldset => {
+        const inputs = Array.from(fieldset.querySelectorAll('input[type="radio"]'));
+        if (inputs.length === 0) return;
+
+        fieldset.addEventListener('keydown', (e) => {
+            if (!['ArrowLeft', 'ArrowRight', 'Home', 'End'].includes(e.key)) return;
+
+            e.preventDefault();
+            const currentIndex = inputs.findIndex(input => input === document.activeElement);
+
+            let nextIndex = currentIndex;
+            if (e.key === 'ArrowRight') {
+                nextIndex = currentIndex === -1 ? 0 : Math.min(currentIndex + 1, inputs.length - 1);
+            } else if (e.key === 'ArrowLeft') {
+                nextIndex = currentIndex === -1 ? 0 : Math.max(currentIndex - 1, 0);
+            } else if (e.key === 'Home') {
+                nextIndex = 0;
+            } else if (e.key === 'End') {
+                nextIndex = inputs.length - 1;
+            }
+
+            if (nextIndex !== -1) {
+                inputs[nextIndex].focus();
+                inputs[nextIndex].checked = true;
+                inputs[nextIndex].dispatchEvent(new Event('change', { bubbles: true }));
+                saveData();
+            }
+        });
+
+        // Space/Enter to select
+        inputs.forEach(input => {
+            input.addEventListener('keydown', (e) => {
+                if (e.key === 'Enter' || e.key === ' ') {
+                    e.preventDefault();
                     input.checked = true;
                     input.dispatchEvent(new Event('change', { bubbles: true }));
                     saveData();
                 }
-            }
+            });
         });
     });
-});
-
-// Arrow key navigation for likert scales
-document.querySelectorAll('.likert-scale').forEach(fieldset => {
-    const inputs = Array.from(fieldset.querySelectorAll('input[type="radio"]'));
-    if (inputs.length === 0) return;
-
-    fieldset.addEventListener('keydown', (e) => {
-        if (!['ArrowLeft', 'ArrowRight', 'Home', 'End'].includes(e.key)) return;
-
-        e.preventDefault();
-        const currentIndex = inputs.findIndex(input => input === document.activeElement);
-
-        let nextIndex = currentIndex;
-        if (e.key === 'ArrowRight') {
-            nextIndex = currentIndex === -1 ? 0 : Math.min(currentIndex + 1, inputs.length - 1);
-        } else if (e.key === 'ArrowLeft') {
-            nextIndex = currentIndex === -1 ? 0 : Math.max(currentIndex - 1, 0);
-        } else if (e.key === 'Home') {
-            nextIndex = 0;
-        } else if (e.key === 'End') {
-            nextIndex = inputs.length - 1;
-        }
+}
 
-        if (nextIndex !== -1) {
-            inputs[nextIndex].focus();
-            inputs[nextIndex].checked = true;
-            inputs[nextIndex].dispatchEvent(new Event('change', { bubbles: true }));
-            saveData();
-        }
+function markSelectedOptions(root) {
+    root.querySelectorAll('input[type="radio"]:checked').forEach(radio => {
+        radio.closest('.option')?.classList.add('selected');
     });
+}
 
-    // Space/Enter to select
-    inputs.forEach(input => {
-        input.addEventListener('keydown', (e) => {
-            if (e.key === 'Enter' || e.key === ' ') {
-                e.preventDefault();
-                input.checked = true;
-                input.dispatchEvent(new Event('change', { bubbles: true }));
-                saveData();
-            }
+/* Lazy sections: render a section's template when it nears the viewport */
+
+function materializeSection(placeholder) {
+    if (!pendingSections.delete(placeholder)) return;
+    if (sectionObserver) sectionObserver.unobserve(placeholder);
+
+    const template = placeholder.querySelector('template');
+    const section = template.content.firstElementChild;
+    placeholder.replaceWith(template.content);
+
+    initSection(section);
+    markSelectedOptions(section);
+    if (typeof initValidation === 'function') initValidation(section);
+    if (typeof updateConditionalFields === 'function') updateConditionalFields(section);
+}
+
+// Render everything still pending (printing, validating the whole form)
+function materializeAllSections() {
+    Array.from(pendingSections).forEach(materializeSection);
+}
+
+function initLazySections() {
+    if (pendingSections.size === 0) return;
+    if (!('IntersectionObserver' in window)) {
+        materializeAllSections();
+        return;
+    }
+    sectionObserver = new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) materializeSection(entry.target);
         });
-    });
-});
+    }, { rootMargin: '1000px 0px' });
+    pendingSections.forEach(placeholder => sectionObserver.observe(placeholder));
+    window.addEventListener('beforeprint', materializeAllSections);
+}
+
+// Initialize
+initSection(form);
+updateProgress();
+loadData().then(() => markSelectedOptions(form));
+
+// After validation and conditional logic have initialized the rendered sections
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', initLazySections);
+} else {
+    initLazySections();
+}
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+MESO Forms Response Validator
+Validates exported form responses (JSON) against one form's compiled rules.
+
+Generated by tools/form-gen.py --validator from the same compiled form as
+the HTML, so the rule table matches validation.js. Regenerate rather than edit.
+
+Usage:
+    python3 validator.py responses/ more.json
+    cat responses.jsonl | python3 validator.py -
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+
+
+# Will be injected by form generator
+FORM = json.loads(r'''{{FORM_TABLES}}''')
+
+EMAIL_PATTERN = re.compile(r'^[^@]+@[^@]+\.[^@]+$')
+URL_PATTERN = re.compile(r'^https?://.*')
+SLUG_PATTERN = re.compile(r'^[a-z0-9-]+$')
+
+# Default error messages (same as validation.js)
+DEFAULT_MESSAGES = {
+    'required': 'This field is required',
+    'pattern': 'Invalid format',
+    'min_length': 'Too short',
+    'max_length': 'Too long',
+    'min': 'Value too low',
+    'max': 'Value too high',
+    'email': 'Enter a valid email address',
+    'url': 'Enter a valid URL',
+    'slug': 'Use lowercase letters, numbers, and hyphens only',
+}
+
+# Condition atoms, as in conditional-logic.js
+CONDITION_ATOMS = [
+    ('is_empty', re.compile(r'(\S+)\s+is_empty')),
+    ('is_filled', re.compile(r'(\S+)\s+is_filled')),
+    ('contains', re.compile(r'(\S+)\s+contains\s+[\'"](.+)[\'"]')),
+    ('compare', re.compile(r'(\S+)\s+(==|!=|>=|<=|>|<)\s+[\'"]?(.+?)[\'"]?')),
+]
+
+COMPARISONS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '>': lambda a, b: a > b,
+    '<': lambda a, b: a < b,
+    '>=': lambda a, b: a >= b,
+    '<=': lambda a, b: a <= b,
+}
+
+
+def _string(value):
+    """JS-style toString() of an exported value."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return '' if value is None else str(value)
+
+
+def _number(value):
+    """JS-style Number(): blank and missing are 0, garbage is NaN."""
+    if isinstance(value, bool):
+        return float(value)
+    text = _string(value).strip()
+    if not text:
+        return 0.0
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+def _compile_pattern(pattern):
+    try:
+        regex = re.compile(pattern)
+    except (re.error, TypeError):
+        return lambda value: False  # Invalid regex fails, as in validation.js
+    return lambda value: not value or regex.search(value) is not None
+
+
+def _min_check(minimum):
+    return lambda value: not value or _number(value) >= minimum
+
+
+def _max_check(maximum):
+    return lambda value: not value or _number(value) <= maximum
+
+
+CHECKS = {
+    'required': lambda _: lambda value: bool(value.strip()),
+    'pattern': _compile_pattern,
+    'min_length': lambda n: lambda value: not value or len(value) >= n,
+    'max_length': lambda n: lambda value: not value or len(value) <= n,
+    'min': _min_check,
+    'max': _max_check,
+    'email': lambda _: lambda value: not value or EMAIL_PATTERN.search(value) is not None,
+    'url': lambda _: lambda value: not value or URL_PATTERN.search(value) is not None,
+    'slug': lambda _: lambda value: not value or SLUG_PATTERN.search(value) is not None,
+}
+
+
+def compile_condition(expr):
+    """Parse a condition once into a function of the response's answers."""
+    if not expr or not expr.strip():
+        return lambda answers: True
+
+    for joiner, combine in ((' AND ', all), (' OR ', any)):
+        if joiner in expr:
+            parts = [compile_condition(part.strip()) for part in expr.split(joiner)]
+            return lambda answers: combine(part(answers) for part in parts)
+
+    for kind, pattern in CONDITION_ATOMS:
+        match = pattern.fullmatch(expr)
+        if not match:
+            continue
+        field = match.group(1)
+        if kind == 'is_empty':
+            return lambda answers: not _string(answers.get(field)).strip()
+        if kind == 'is_filled':
+            return lambda answers: bool(_string(answers.get(field)).strip())
+        if kind == 'contains':
+            term = match.group(2)
+            return lambda answers: term in _string(answers.get(field))
+        op = COMPARISONS[match.group(2)]
+        expected = re.sub(r'^[\'"]|[\'"]$', '', match.group(3))
+
+        def compare(answers, field=field, op=op, expected=expected):
+            actual = answers.get(field)
+            actual_num, expected_num = _number(actual), _number(expected)
+            if not math.isnan(actual_num) and not math.isnan(expected_num):
+                return op(actual_num, expected_num)
+            return op(_string(actual) if actual else '', expected)
+        return compare
+
+    # form-gen rejects unparseable conditions, so this is a stale validator
+    raise ValueError(f"Cannot parse condition: {expr!r}")
+
+
+def compile_rules(rules):
+    """Rule table -> [(checks, message)] with checks [(rule, check function)]."""
+    return [
+        ([(rule, CHECKS[rule](constraint)) for rule, constraint in checks], message)
+        for checks, message in rules
+    ]
+
+
+RULES = compile_rules(FORM['rules'])
+
+# (id, type, option values, rule index, show_if, required_if, disabled_if) per question
+QUESTIONS = [
+    (q_id, q_type, options, rule, compile_condition(show_if),
+     compile_condition(required_if) if required_if else None, compile_condition(disabled_if) if disabled_if else None)
+    for q_id, q_type, options, rule, show_if, required_if, disabled_if in FORM['questions']
+]
+VALIDATED = [question for question in QUESTIONS if question[3] is not None or question[5] is not None]
+
+
+def answers_of(data):
+    """Submitted answer per question id; checkbox questions join their checked values."""
+    answers = {}
+    for q_id, q_type, options, *_ in QUESTIONS:
+        if q_type == 'checkbox':
+            checked = [value for value in options
+                       if data.get(f"{q_id}-{value}") not in (None, False, '', 'false')]
+            answers[q_id] = ','.join(checked)
+        else:
+            answers[q_id] = data.get(q_id)
+    return answers
+
+
+def validate_response(data):
+    """
+    Validate one response's data mapping (field name -> value).
+
+    Returns [(question_id, error_message)], empty when valid. Questions
+    hidden by show_if or disabled by disabled_if are not validated.
+    """
+    answers = answers_of(data)
+    errors = []
+    for q_id, _, _, rule, show_if, required_if, disabled_if in VALIDATED:
+        if not show_if(answers) or (disabled_if is not None and disabled_if(answers)):
+            continue
+
+        checks, message = RULES[rule] if rule is not None else ([], None)
+        if required_if is not None:
+            checks = [check for check in checks if check[0] != 'required']
+            if required_if(answers):
+                checks.append(('required', CHECKS['required'](True)))
+
+        value = _string(answers[q_id])
+        for name, check in checks:
+            if not check(value):
+                errors.append((q_id, message or DEFAULT_MESSAGES.get(name, 'Invalid value')))
+                break  # Only the first error, as in validation.js
+    return errors
+
+
+# Will be injected by form generator (shared with tools/form-stats.py)
+{{RESPONSE_LOADER}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=f"Validate exported responses for: {FORM['title']}")
+    parser.add_argument('paths', nargs='+', help="Response JSON files, directories, or - for JSON Lines on stdin")
+    parser.add_argument('--json', action='store_true', help='Print a JSON report instead of text')
+    args = parser.parse_args()
+
+    total = 0
+    report = {}
+    for label, response in iter_responses(args.paths):
+        total += 1
+        try:
+            if isinstance(response, Exception):
+                raise response
+            errors = validate_response(response_data(response))
+        except (OSError, ValueError) as e:
+            errors = [(None, str(e))]
+        if errors:
+            report[label] = errors
+
+    if args.json:
+        json.dump({'form': FORM['title'], 'responses': total, 'invalid': len(report),
+                   'errors': {label: [list(error) for error in errors] for label, errors in report.items()}},
+                  sys.stdout, indent=2)
+        print()
+    else:
+        for label, errors in report.items():
+            for q_id, message in errors:
+                print(f"✗ {label}: {q_id + ': ' if q_id else ''}{message}")
+        if report:
+            print(f"✗ {len(report)} of {total} responses invalid", file=sys.stderr)
+        else:
+            print(f"✓ {total} responses valid", file=sys.stderr)
+
+    sys.exit(1 if report else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,8 @@
 /* Validation Framework - MESO Forms v2.0 */
 
-// Validation presets (injected from YAML)
-const VALIDATION_PRESETS = {{VALIDATION_PRESETS}};
+// Compiled rule table (injected from YAML, presets already merged):
+// [[[rule, constraint], ...], error_message or null]; data-validation holds an index
+const VALIDATION_RULES = {{VALIDATION_RULES}};
 
 // Validation rule functions
 const validators = {
@@ -71,29 +72,39 @@ const defaultMessages = {
     slug: 'Use lowercase letters, numbers, and hyphens only'
 };
 
+/**
+ * Checks and message for a field: its compiled rule, with 'required' decided by
+ * conditional logic (the required attribute) when the field has required_if
+ */
+function fieldRules(field) {
+    const index = field.getAttribute('data-validation');
+    const [checks, message] = index !== null ? VALIDATION_RULES[Number(index)] : [[], null];
+
+    if (!field.hasAttribute('data-required-if')) {
+        return [checks, message];
+    }
+    const conditional = checks.filter(([rule]) => rule !== 'required');
+    if (field.hasAttribute('required')) {
+        conditional.push(['required', true]);
+    }
+    return [conditional, message];
+}
+
 /**
  * Validate a field based on its validation rules
  * @param {HTMLElement} field - The input/textarea/select element
- * @param {Object} rules - Validation rules from data attributes
  * @returns {Object} - {valid: boolean, errors: string[]}
  */
-function validateField(field, rules) {
+function validateField(field) {
     const value = field.value;
     const errors = [];
-
-    // Apply preset if specified
-    if (rules.preset && VALIDATION_PRESETS[rules.preset]) {
-        const preset = VALIDATION_PRESETS[rules.preset];
-        Object.assign(rules, preset);
-    }
+    const [checks, message] = fieldRules(field);
 
     // Check each validation rule
-    for (const [rule, constraint] of Object.entries(rules)) {
-        if (rule === 'preset' || rule === 'error_message') continue;
-
+    for (const [rule, constraint] of checks) {
         const validator = validators[rule];
         if (validator && !validator(value, constraint)) {
-            const errorMsg = rules.error_message || defaultMessages[rule] || 'Invalid value';
+            const errorMsg = message || defaultMessages[rule] || 'Invalid value';
             errors.push(errorMsg);
             break; // Only show first error
         }
@@ -151,26 +162,16 @@ function clearError(field) {
 }
 
 /**
- * Initialize validation for all fields with validation rules
+ * Initialize validation for fields with validation rules within scope
+ * (the document, or a lazy section once rendered)
  */
-function initValidation() {
-    const fields = document.querySelectorAll('[data-validation]');
+function initValidation(scope = document) {
+    const fields = scope.querySelectorAll('[data-validation], [data-required-if]');
 
     fields.forEach(field => {
-        const rulesJson = field.getAttribute('data-validation');
-        if (!rulesJson) return;
-
-        let rules;
-        try {
-            rules = JSON.parse(rulesJson);
-        } catch (e) {
-            console.error('Invalid validation rules:', rulesJson);
-            return;
-        }
-
         // Validate on blur
         field.addEventListener('blur', () => {
-            const result = validateField(field, rules);
+            const result = validateField(field);
 
             if (!result.valid) {
                 showError(field, result.errors[0]);
@@ -182,7 +183,7 @@ function initValidation() {
         // Clear error on input (after error shown)
         field.addEventListener('input', () => {
             if (field.classList.contains('invalid')) {
-                const result = validateField(field, rules);
+                const result = validateField(field);
                 if (result.valid) {
                     clearError(field);
                 }
@@ -196,22 +197,15 @@ function initValidation() {
  * @returns {boolean} - True if all fields valid
  */
 function validateAll() {
-    const fields = document.querySelectorAll('[data-validation]');
+    // Sections not rendered yet have no fields in the document to check or focus
+    if (typeof materializeAllSections === 'function') materializeAllSections();
+
+    const fields = document.querySelectorAll('[data-validation], [data-required-if]');
     let allValid = true;
     let firstInvalidField = null;
 
     fields.forEach(field => {
-        const rulesJson = field.getAttribute('data-validation');
-        if (!rulesJson) return;
-
-        let rules;
-        try {
-            rules = JSON.parse(rulesJson);
-        } catch (e) {
-            return;
-        }
-
-        const result = validateField(field, rules);
+        const result = validateField(field);
 
         if (!result.valid) {
             showError(field, result.errors[0]);
@@ -235,7 +229,7 @@ function validateAll() {
 
 // Initialize validation when DOM is ready
 if (document.readyState === 'loading') {
-    document.addEventListener('DOMContentLoaded', initValidation);
+    document.addEventListener('DOMContentLoaded', () => initValidation());
 } else {
     initValidation();
 }
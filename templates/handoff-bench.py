@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Handoff Parser Benchmark
+Reproducible performance measurements for handoff-parser.py.
+
+Usage:
+    python3 handoff-bench.py generate <out.jsonl> [--size 100MB] [--seed 42]
+    python3 handoff-bench.py run [--size 100MB | --transcript PATH] [--modes full,fast,...]
+                                 [--repeat 3] [-o results.json] [--compare baseline.json]
+
+`generate` writes a seeded synthetic transcript (1 MB to 2 GB) with a mix of
+Edit/Write/Bash/TaskUpdate tool uses, tool_result payloads, assistant text
+and malformed lines. `run` times each parser mode in a fresh process and
+reports wall time, lines/sec, MB/sec and peak RSS, saved as JSON so runs
+from different commits can be compared.
+"""
+
+import argparse
+import bz2
+import gzip
+import json
+import lzma
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+PARSER_PATH = Path(__file__).parent / 'handoff-parser.py'
+RESULTS_VERSION = 1
+
+# Relative weights of generated line kinds
+DEFAULT_MIX = {
+    'text': 40,
+    'tool_result': 25,
+    'Bash': 12,
+    'Edit': 10,
+    'Write': 5,
+    'TaskUpdate': 3,
+    'meta': 5,
+}
+
+SIZE_UNITS = {'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'B': 1}
+
+
+def parse_size(value: str) -> int:
+    """argparse type for sizes like 500KB, 100MB, 2GB."""
+    text = value.strip().upper()
+    for unit, factor in SIZE_UNITS.items():
+        if text.endswith(unit):
+            try:
+                return int(float(text[:-len(unit)]) * factor)
+            except ValueError:
+                break
+    try:
+        return int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size: {value}")
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """argparse type for --mix kind=weight,... (unlisted kinds keep their default)."""
+    mix = dict(DEFAULT_MIX)
+    for item in value.split(','):
+        kind, _, weight = item.partition('=')
+        if kind not in DEFAULT_MIX or not weight.isdigit():
+            raise argparse.ArgumentTypeError(
+                f"Invalid mix entry '{item}' (kinds: {', '.join(DEFAULT_MIX)})")
+        mix[kind] = int(weight)
+    return mix
+
+
+def _words(rng: random.Random, count: int) -> str:
+    vocabulary = ('session', 'handoff', 'parser', 'context', 'token', 'stream', 'buffer',
+                  'colony', 'zooid', 'operon', 'commit', 'branch', 'refactor', 'test')
+    return ' '.join(rng.choice(vocabulary) for _ in range(count))
+
+
+def _synthetic_entry(rng: random.Random, kind: str, timestamp: str) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {'type': 'assistant', 'timestamp': timestamp}
+
+    if kind == 'text':
+        entry['content'] = [{'type': 'text', 'text': _words(rng, rng.randint(5, 400))}]
+    elif kind == 'tool_result':
+        if rng.random() < 0.05:
+            payload = 'feature/' + _words(rng, 1)
+        else:
+            payload = '\n'.join(_words(rng, 12) for _ in range(rng.randint(1, 200)))
+        entry['type'] = 'user'
+        entry['content'] = [{'type': 'tool_result', 'tool_use_id': f"toolu_{rng.getrandbits(48):x}",
+                             'content': payload}]
+    elif kind == 'Bash':
+        command = rng.choice(['git status', 'pytest -q', 'ls -la', 'git diff --stat',
+                              f"git commit -m '{_words(rng, 4)}'", 'make build'])
+        entry['content'] = [{'type': 'tool_use', 'name': 'Bash',
+                             'input': {'command': command, 'description': rng.choice(['', _words(rng, 3)])}}]
+    elif kind == 'Edit':
+        entry['content'] = [{'type': 'tool_use', 'name': 'Edit',
+                             'input': {'file_path': f"/repo/src/module_{rng.randint(0, 200)}.py",
+                                       'old_string': _words(rng, 8), 'new_string': _words(rng, 8)}}]
+    elif kind == 'Write':
+        content = '\n'.join(_words(rng, 10) for _ in range(rng.randint(1, 300)))
+        entry['content'] = [{'type': 'tool_use', 'name': 'Write',
+                             'input': {'file_path': f"/repo/docs/page_{rng.randint(0, 50)}.md",
+                                       'content': content}}]
+    elif kind == 'TaskUpdate':
+        entry['content'] = [{'type': 'tool_use', 'name': 'TaskUpdate',
+                             'input': {'taskId': str(rng.randint(1, 500)),
+                                       'status': rng.choice(['completed', 'in_progress'])}}]
+    else:
+        entry['type'] = 'system'
+        entry['cwd'] = '/repo'
+
+    return entry
+
+
+def generate_transcript(output_path: str, size: int, seed: int = 42,
+                        malformed_rate: float = 0.001, mix: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """
+    Write a synthetic JSONL transcript of roughly `size` bytes.
+
+    The same seed, size, rate and mix always produce the same file.
+    Returns a description (bytes, lines, malformed lines, parameters).
+    """
+    rng = random.Random(seed)
+    mix = mix or DEFAULT_MIX
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    start = datetime(2026, 1, 1, 9, 0, tzinfo=timezone.utc)
+
+    written = 0
+    lines = 0
+    malformed = 0
+    with open(output_path, 'w', buffering=1024 * 1024) as f:
+        first = {'type': 'system', 'session_id': f"bench-{seed}", 'cwd': '/repo',
+                 'timestamp': start.strftime('%Y-%m-%dT%H:%M:%S.000Z')}
+        line = json.dumps(first) + '\n'
+        f.write(line)
+        written += len(line.encode('utf-8'))
+        lines += 1
+
+        while written < size:
+            timestamp = (start + timedelta(milliseconds=lines * 250)).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+            if rng.random() < malformed_rate:
+                line = '{"type": "assistant", "content": [truncated\n'
+                malformed += 1
+            else:
+                kind = rng.choices(kinds, weights)[0]
+                line = json.dumps(_synthetic_entry(rng, kind, timestamp)) + '\n'
+            f.write(line)
+            written += len(line.encode('utf-8'))
+            lines += 1
+
+    return {
+        'path': str(output_path),
+        'size_bytes': written,
+        'lines': lines,
+        'malformed_lines': malformed,
+        'seed': seed,
+        'malformed_rate': malformed_rate,
+        'mix': mix,
+    }
+
+
+def describe_transcript(transcript_path: str) -> Dict[str, Any]:
+    """Size and line count of an existing (plain) transcript."""
+    lines = 0
+    with open(transcript_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            lines += block.count(b'\n')
+    return {'path': str(transcript_path), 'size_bytes': os.path.getsize(transcript_path), 'lines': lines}
+
+
+def _compressed_copy(transcript_path: str, compression: str, workdir: str) -> str:
+    """Write a compressed copy of the transcript into workdir (removed with it after the run)."""
+    openers = {'gzip': (gzip.open, '.gz'), 'xz': (lzma.open, '.xz'), 'bz2': (bz2.open, '.bz2')}
+    name = os.path.basename(transcript_path)
+    if compression == 'zstd':
+        target = os.path.join(workdir, f"{name}.zst")
+        with open(transcript_path, 'rb') as src, open(target, 'wb') as dst:
+            zstandard.ZstdCompressor().copy_stream(src, dst)
+        return target
+
+    opener, suffix = openers[compression]
+    target = os.path.join(workdir, f"{name}{suffix}")
+    with open(transcript_path, 'rb') as src, opener(target, 'wb') as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    return target
+
+
+def _mode_argv(mode: str, transcript_path: str, workdir: str, jobs: int) -> List[str]:
+    """Build handoff-parser.py arguments for one benchmark mode."""
+    if mode == 'full':
+        return [transcript_path]
+    if mode == 'fast':
+        return [transcript_path, '--decode', 'fast']
+    if mode == 'fields':
+        return [transcript_path, '--fields', 'duration_minutes,files_modified']
+    if mode == 'summary':
+        return [transcript_path, '--summary']
+    if mode == 'parallel':
+        return [transcript_path, '-j', str(jobs)]
+    if mode == 'render':
+        return [transcript_path, os.path.join(workdir, 'handoff.md')]
+    if mode == 'checkpoint-resume':
+        return [transcript_path, '--checkpoint', os.path.join(workdir, 'bench.checkpoint.json')]
+    if mode in ('gzip', 'xz', 'bz2', 'zstd'):
+        return [_compressed_copy(transcript_path, mode, workdir)]
+    raise ValueError(f"Unknown mode: {mode}")
+
+
+MODES = ['full', 'fast', 'fields', 'summary', 'parallel', 'render', 'checkpoint-resume',
+         'gzip', 'xz', 'bz2', 'zstd']
+
+
+def _run_once(argv: List[str]) -> Dict[str, float]:
+    """Run handoff-parser.py once; wall time and peak RSS of its process tree."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, str(PARSER_PATH)] + argv,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, rusage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode != 0:
+        raise RuntimeError(f"handoff-parser.py {' '.join(argv)} exited with {proc.returncode}")
+    return {'wall_seconds': wall, 'peak_rss_kb': rusage.ru_maxrss}
+
+
+def run_benchmark(transcript: Dict[str, Any], modes: List[str], repeat: int = 3,
+                  jobs: int = 0) -> List[Dict[str, Any]]:
+    """Time each mode `repeat` times (best wall time, max RSS)."""
+    jobs = jobs or os.cpu_count() or 1
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix='handoff-bench-') as workdir:
+        for mode in modes:
+            if mode == 'zstd' and zstandard is None:
+                print(f"  {mode:<18} skipped (zstandard not installed)", file=sys.stderr)
+                continue
+
+            argv = _mode_argv(mode, transcript['path'], workdir, jobs)
+            if mode == 'checkpoint-resume':
+                # Untimed priming run writes the checkpoint being resumed from
+                _run_once(argv)
+
+            runs = [_run_once(argv) for _ in range(repeat)]
+            wall = min(run['wall_seconds'] for run in runs)
+            result = {
+                'mode': mode,
+                'argv': argv[1:],
+                'wall_seconds': round(wall, 4),
+                'peak_rss_kb': max(run['peak_rss_kb'] for run in runs),
+                'lines_per_sec': round(transcript['lines'] / wall),
+                'mb_per_sec': round(transcript['size_bytes'] / (1024 * 1024) / wall, 2),
+                'repeat': repeat,
+            }
+            if argv[0] != transcript['path']:
+                result['input_bytes'] = os.path.getsize(argv[0])
+            results.append(result)
+
+            print(f"  {mode:<18} {result['wall_seconds']:>8.3f}s {result['mb_per_sec']:>9.2f} MB/s "
+                  f"{result['lines_per_sec']:>10} lines/s {result['peak_rss_kb'] / 1024:>8.1f} MB RSS",
+                  file=sys.stderr)
+
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', '-C', str(Path(__file__).parent), 'rev-parse', 'HEAD'],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.10) -> int:
+    """Print per-mode wall/RSS ratios against a baseline; returns regression count."""
+    previous = {result['mode']: result for result in baseline.get('results', [])}
+    regressions = 0
+
+    print(f"Compared with {baseline.get('git_commit') or 'baseline'}:", file=sys.stderr)
+    for result in current['results']:
+        old = previous.get(result['mode'])
+        if not old:
+            continue
+        wall_ratio = result['wall_seconds'] / old['wall_seconds']
+        rss_ratio = result['peak_rss_kb'] / old['peak_rss_kb']
+        flag = ''
+        if wall_ratio > 1 + threshold or rss_ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f"  {result['mode']:<18} wall x{wall_ratio:.2f}  rss x{rss_ratio:.2f}{flag}", file=sys.stderr)
+
+    return regressions
+
+
+def generate_main(args):
+    info = generate_transcript(args.output, args.size, args.seed, args.malformed_rate, args.mix)
+    print(json.dumps(info, indent=2))
+
+
+def run_main(args):
+    modes = args.modes.split(',') if args.modes else MODES
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        print(f"Error: Unknown mode(s): {', '.join(sorted(unknown))} (choose from {', '.join(MODES)})",
+              file=sys.stderr)
+        sys.exit(1)
+
+    tmpdir = None
+    if args.transcript:
+        transcript = describe_transcript(args.transcript)
+    else:
+        tmpdir = tempfile.mkdtemp(prefix='handoff-bench-data-')
+        path = os.path.join(tmpdir, f"bench-{args.seed}.jsonl")
+        print(f"Generating {args.size / (1024 * 1024):.1f} MB transcript (seed {args.seed})...", file=sys.stderr)
+        transcript = generate_transcript(path, args.size, args.seed, args.malformed_rate, args.mix)
+
+    try:
+        print(f"Benchmarking {transcript['path']} ({transcript['size_bytes']} bytes, "
+              f"{transcript['lines']} lines)", file=sys.stderr)
+        results = {
+            'version': RESULTS_VERSION,
+            'created': datetime.now(timezone.utc).isoformat(),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'transcript': transcript,
+            'results': run_benchmark(transcript, modes, args.repeat, args.jobs),
+        }
+    finally:
+        if tmpdir and not args.keep:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        print(f"Results written to: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if compare_results(results, baseline):
+            sys.exit(2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark handoff-parser.py')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_generator_args(sub):
+        sub.add_argument('--size', type=parse_size, default=parse_size('100MB'),
+                         help='Approximate transcript size, 1MB to 2GB (default: 100MB)')
+        sub.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        sub.add_argument('--malformed-rate', type=float, default=0.001,
+                         help='Fraction of malformed lines (default: 0.001)')
+        sub.add_argument('--mix', type=parse_mix,
+                         help=f"Line kind weights, e.g. Edit=20,text=10 (kinds: {', '.join(DEFAULT_MIX)})")
+
+    generate = subparsers.add_parser('generate', help='Write a synthetic transcript')
+    generate.add_argument('output', help='Output JSONL path')
+    add_generator_args(generate)
+    generate.set_defaults(func=generate_main)
+
+    run = subparsers.add_parser('run', help='Benchmark parser modes')
+    run.add_argument('--transcript', help='Benchmark this transcript instead of generating one')
+    add_generator_args(run)
+    run.add_argument('--modes', help=f"Comma-separated modes (default: all of {', '.join(MODES)})")
+    run.add_argument('--repeat', type=int, default=3, help='Runs per mode, best kept (default: 3)')
+    run.add_argument('-j', '--jobs', type=int, default=0, help='Workers for the parallel mode (default: CPU count)')
+    run.add_argument('-o', '--output', help='Write results JSON here (default: stdout)')
+    run.add_argument('--compare', help='Baseline results JSON; exits 2 on a >10%% wall/RSS regression')
+    run.add_argument('--keep', action='store_true', help='Keep the generated transcript')
+    run.set_defaults(func=run_main)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Handoff Parser Client
+Forwards handoff-parser.py invocations to a running `handoff-parser.py serve`
+daemon, skipping interpreter-heavy imports and template reads on every hook.
+
+Usage:
+    python3 handoff-client.py <transcript_path> [output_path] [options]
+
+Takes the same arguments as handoff-parser.py. Runs handoff-parser.py
+directly when no daemon is listening or the daemon declines the request.
+"""
+
+import json
+import os
+import socket
+import sys
+
+PARSER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'handoff-parser.py')
+
+
+def socket_path():
+    """Same resolution as default_socket_path() in handoff-parser.py."""
+    if os.environ.get('HANDOFF_PARSER_SOCKET'):
+        return os.environ['HANDOFF_PARSER_SOCKET']
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or '/tmp'
+    return os.path.join(runtime_dir, f"handoff-parser-{os.getuid()}.sock")
+
+
+def forward(argv):
+    """Send one request to the daemon and return its decoded response."""
+    request = json.dumps({'argv': argv, 'cwd': os.getcwd()}).encode('utf-8') + b'\n'
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path())
+        sock.sendall(request)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b'\n'):
+                break
+
+    return json.loads(b''.join(chunks))
+
+
+def main():
+    argv = sys.argv[1:]
+
+    try:
+        response = forward(argv)
+    except (OSError, ValueError):
+        response = None
+
+    if not response or response.get('status') != 'ok':
+        # No daemon (or it declined): replace this process with a direct parser run
+        os.execv(sys.executable, [sys.executable, PARSER_PATH] + argv)
+
+    sys.stdout.write(response['stdout'])
+    sys.stderr.write(response['stderr'])
+    sys.exit(response['exit_code'])
+
+
+if __name__ == '__main__':
+    main()
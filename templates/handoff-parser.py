@@ -4,300 +4,2512 @@ Handoff Transcript Parser
 Extracts session data from Claude Code JSONL transcripts.
 
 Usage:
-    python3 handoff-parser.py <transcript_path> [output_path]
+    python3 handoff-parser.py <transcript_path> [output_path] [--checkpoint [PATH]] [-j N] [--stats [PATH]]
+    python3 handoff-parser.py batch <path|dir|glob>... [-o out.jsonl] [--skeleton-dir DIR]
+    python3 handoff-parser.py serve [--socket PATH] [--idle-timeout SECS]
+    python3 handoff-parser.py ingest <path|dir|glob>... [--db ~/.claude/workspace/.index.db]
+    python3 handoff-parser.py lookup <file|token> [--command] [--prefix] [--db PATH]
 
 If output_path is provided, generates handoff skeleton.
 If output_path is /dev/null, prints JSON to stdout.
+With --checkpoint, only lines appended since the previous run are parsed.
+With -j N, a large transcript is split into line-aligned chunks parsed in parallel.
+With --decode fast, lines without tool blocks skip full JSON decoding.
+With --fields a,b, only the extractors those JSON fields need are run.
+With --summary, only the head and tail are read (session ID, times, project).
+With --follow, the transcript is tailed and the output refreshed as it grows.
+With --stats [PATH], phase timings and counters are reported (--profile PATH dumps cProfile,
+--trace-memory adds a tracemalloc peak).
+The batch subcommand parses many transcripts across a process pool.
+The serve subcommand runs a daemon that handoff-client.py forwards to.
+The ingest subcommand upserts parsed sessions into the workspace SQLite index.
+The lookup subcommand queries its file path / command token posting lists.
 """
 
+import argparse
+import bz2
+import contextlib
+import copy
+import cProfile
+import glob
+import gzip
+import hashlib
+import io
 import json
+import lzma
+import mmap
+import multiprocessing
+import os
+import re
+import signal
+import socket
+import socketserver
+import sqlite3
 import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Any, Optional, Tuple
 
+try:
+    import orjson
+    fast_loads = orjson.loads
+except ImportError:
+    fast_loads = json.loads
 
-def parse_transcript(transcript_path: str) -> Dict[str, Any]:
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# Commands kept for the handoff skeleton (only the most recent are rendered)
+RECENT_COMMANDS_LIMIT = 20
+
+# Per-line warnings: how many line numbers are listed per kind
+WARNING_SAMPLES = 5
+
+# Chunk-parallel parsing: smaller files are not worth the worker startup
+MIN_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Checkpoint sidecar format
+CHECKPOINT_VERSION = 2
+CHECKPOINT_HEAD_BYTES = 4096
+
+
+# Compressed transcripts: magic bytes -> format, and filename suffixes
+COMPRESSION_MAGIC = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+    (b'BZh', 'bz2'),
+)
+COMPRESSION_SUFFIXES = ('.gz', '.xz', '.zst', '.zstd', '.bz2')
+TRANSCRIPT_PATTERNS = ('*.jsonl',) + tuple(f"*.jsonl{suffix}" for suffix in COMPRESSION_SUFFIXES)
+
+# Read size for decompressed streams
+READ_BUFFER_BYTES = 1024 * 1024
+
+
+def detect_compression(transcript_path: str) -> Optional[str]:
+    """Identify a compressed transcript by its magic bytes (None if plain)."""
+    with open(transcript_path, 'rb') as f:
+        head = f.read(6)
+    for magic, compression in COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_transcript(transcript_path: str):
+    """
+    Open a transcript for binary reading, decompressing transparently.
+
+    gzip/xz/bz2 use the standard library; zstd needs the optional
+    `zstandard` module. Decompressed streams are read in large chunks.
+    """
+    compression = detect_compression(transcript_path)
+    if compression is None:
+        return open(transcript_path, 'rb')
+
+    if compression == 'gzip':
+        stream = gzip.open(transcript_path, 'rb')
+    elif compression == 'xz':
+        stream = lzma.open(transcript_path, 'rb')
+    elif compression == 'bz2':
+        stream = bz2.open(transcript_path, 'rb')
+    else:
+        if zstandard is None:
+            raise RuntimeError("zstd-compressed transcript requires the 'zstandard' module "
+                               "(pip install zstandard)")
+        raw = open(transcript_path, 'rb')
+        stream = zstandard.ZstdDecompressor().stream_reader(raw, read_size=READ_BUFFER_BYTES, closefd=True)
+
+    return io.BufferedReader(stream, buffer_size=READ_BUFFER_BYTES)
+
+
+def transcript_stem(transcript_path: str) -> str:
+    """Filename stem with any compression suffix removed (abc.jsonl.gz -> abc)."""
+    name = Path(transcript_path).name
+    for suffix in COMPRESSION_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    return Path(name).stem
+
+
+class TranscriptCursor:
+    """
+    Position reached in a transcript.
+
+    Only newline-terminated lines advance the cursor. A trailing partial
+    line (the session is still writing it) is held in `partial` so a
+    checkpoint never records half a line as consumed.
+    """
+
+    def __init__(self, offset: int = 0, line_num: int = 0):
+        self.offset = offset
+        self.line_num = line_num
+        self.partial: Optional[bytes] = None
+
+
+def read_lines(transcript_path: str, cursor: Optional[TranscriptCursor] = None) -> Iterator[Tuple[int, bytes]]:
+    """
+    Stream raw transcript lines as (line_num, bytes).
+
+    Reads in binary so memory stays bounded by the longest line rather
+    than the file size; compressed transcripts are decompressed on the fly.
+    With a cursor (plain files only), reading starts at cursor.offset and
+    a trailing partial line is left in cursor.partial instead of yielded.
+    """
+    if cursor is None:
+        with open_transcript(transcript_path) as f:
+            for line_num, line in enumerate(f, 1):
+                yield line_num, line
+        return
+
+    with open(transcript_path, 'rb') as f:
+        f.seek(cursor.offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                cursor.partial = line
+                return
+            cursor.offset += len(line)
+            cursor.line_num += 1
+            yield cursor.line_num, line
+
+
+def print_line_warning(line_num: int, kind: str, detail: str = ''):
+    """Default per-line warning sink: report straight to stderr."""
+    if kind == 'malformed':
+        print(f"Warning: Skipping malformed line {line_num}", file=sys.stderr)
+    elif kind == 'mismatch':
+        print(f"Warning: Fast path mismatch on line {line_num}: {detail}", file=sys.stderr)
+    else:
+        print(f"Warning: Error processing line {line_num}: {detail}", file=sys.stderr)
+
+
+class LineWarnings:
+    """
+    Aggregating per-line warning sink.
+
+    Counts warnings by kind and keeps the first WARNING_SAMPLES line
+    numbers (with details), so a corrupted transcript costs one summary
+    on stderr instead of one write per bad line. Chunk workers return
+    theirs to be merged in file order.
+    """
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.samples: Dict[str, List[Tuple[int, str]]] = {}
+
+    def __call__(self, line_num: int, kind: str, detail: str = ''):
+        count = self.counts.get(kind, 0)
+        self.counts[kind] = count + 1
+        if count < WARNING_SAMPLES:
+            self.samples.setdefault(kind, []).append((line_num, detail))
+
+    def merge(self, other: 'LineWarnings', line_offset: int = 0) -> 'LineWarnings':
+        """Fold in warnings from a later chunk whose line numbers start after line_offset."""
+        for kind, count in other.counts.items():
+            self.counts[kind] = self.counts.get(kind, 0) + count
+            samples = self.samples.setdefault(kind, [])
+            for line_num, detail in other.samples.get(kind, []):
+                if len(samples) < WARNING_SAMPLES:
+                    samples.append((line_offset + line_num, detail))
+        return self
+
+    def report(self, transcript_path: str):
+        """Print one summary per warning kind to stderr."""
+        name = os.path.basename(transcript_path)
+        for kind, count in self.counts.items():
+            samples = self.samples[kind]
+            plural = '' if count == 1 else 's'
+            more = ', ...' if count > len(samples) else ''
+
+            if kind == 'malformed':
+                line_nums = ', '.join(str(line_num) for line_num, _ in samples)
+                print(f"Warning: Skipped {count} malformed line{plural} in {name} "
+                      f"(line{plural} {line_nums}{more})", file=sys.stderr)
+                continue
+
+            if kind == 'mismatch':
+                print(f"Warning: Fast path mismatch on {count} line{plural} in {name}:", file=sys.stderr)
+            else:
+                print(f"Warning: Error processing {count} line{plural} in {name}:", file=sys.stderr)
+            for line_num, detail in samples:
+                print(f"  line {line_num}: {detail}", file=sys.stderr)
+            if more:
+                print("  ...", file=sys.stderr)
+
+
+def decode_lines(lines: Iterable[Tuple[int, bytes]],
+                 on_warning: Callable = print_line_warning) -> Iterator[Tuple[int, Any]]:
+    """Decode raw JSONL lines, skipping malformed ones."""
+    for line_num, line in lines:
+        try:
+            yield line_num, json.loads(line.strip())
+        except ValueError:
+            # Skip malformed lines (bad JSON or invalid UTF-8)
+            on_warning(line_num, 'malformed')
+
+
+# Raw-byte markers and targeted patterns for the fast decode path
+_TOOL_MARKERS = (b'"tool_use"', b'"tool_result"')
+_TARGETED_FIELDS = (
+    ('timestamp', b'"timestamp"', re.compile(rb'"timestamp"\s*:\s*"([^"\\]*)"')),
+    ('cwd', b'"cwd"', re.compile(rb'"cwd"\s*:\s*"([^"\\]*)"')),
+)
+_JSON_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"')
+
+
+def _at_top_level(line: bytes, pos: int) -> bool:
+    """Whether offset `pos` sits directly inside the line's outermost JSON object."""
+    if not line.lstrip().startswith(b'{'):
+        return False
+    prefix = _JSON_STRING.sub(b'', line[:pos])
+    if b'"' in prefix:
+        # Unbalanced quotes: pos is not the start of a token
+        return False
+    depth = prefix.count(b'{') + prefix.count(b'[') - prefix.count(b'}') - prefix.count(b']')
+    return depth == 1
+
+
+def _targeted_entry(line: bytes) -> Optional[Dict[str, str]]:
+    """
+    Pull timestamp/cwd straight out of raw bytes.
+
+    Returns None when the result could be ambiguous (field mentioned more
+    than once or nested below the top-level object, non-string or escaped
+    value) so the caller falls back to a full decode.
+    """
+    entry = {}
+    for key, marker, pattern in _TARGETED_FIELDS:
+        occurrences = line.count(marker)
+        if occurrences == 0:
+            continue
+        if occurrences > 1:
+            return None
+        match = pattern.search(line)
+        if match is None or not _at_top_level(line, match.start()):
+            return None
+        try:
+            entry[key] = match.group(1).decode('utf-8')
+        except UnicodeDecodeError:
+            return None
+    return entry
+
+
+def decode_lines_fast(lines: Iterable[Tuple[int, bytes]],
+                      on_warning: Callable = print_line_warning) -> Iterator[Tuple[int, Any]]:
+    """
+    Decode only what the extractors can use.
+
+    Lines without tool blocks skip json.loads: timestamp/cwd are pulled
+    out of the raw bytes, and lines with neither are dropped. Malformed
+    lines that are skipped this way go unreported.
+    """
+    for line_num, line in lines:
+        if line_num != 1 and not any(marker in line for marker in _TOOL_MARKERS):
+            entry = _targeted_entry(line)
+            if entry is not None:
+                if entry:
+                    yield line_num, entry
+                continue
+
+        try:
+            yield line_num, fast_loads(line)
+        except ValueError:
+            on_warning(line_num, 'malformed')
+
+
+def decode_lines_verified(lines: Iterable[Tuple[int, bytes]],
+                          on_warning: Callable = print_line_warning) -> Iterator[Tuple[int, Any]]:
+    """
+    Full decode, cross-checked against the fast path line by line.
+
+    Yields the fully decoded entries and reports every line where the
+    fast path would have extracted different events.
+    """
+    checked = 0
+    mismatches = 0
+
+    for line_num, line in lines:
+        fast = list(decode_lines_fast([(line_num, line)], lambda *args: None))
+        full = list(decode_lines([(line_num, line)], on_warning))
+        checked += 1
+
+        try:
+            fast_events = [event for _, entry in fast for event in _entry_events(line_num, entry)]
+            full_events = [event for _, entry in full for event in _entry_events(line_num, entry)]
+        except Exception:
+            # Extraction errors are reported by extract_events on the full entry
+            fast_events = full_events = None
+
+        if fast_events != full_events:
+            mismatches += 1
+            on_warning(line_num, 'mismatch', f"fast {fast_events!r} != full {full_events!r}")
+
+        yield from full
+
+    print(f"Fast path check: {checked - mismatches}/{checked} lines matched", file=sys.stderr)
+
+
+DECODERS = {
+    'full': decode_lines,
+    'fast': decode_lines_fast,
+    'verify': decode_lines_verified,
+}
+
+
+# Output field -> extraction source it depends on
+FIELD_SOURCES = {
+    'session_id': 'session_id',
+    'time_start': 'timestamp',
+    'time_end': 'timestamp',
+    'duration_minutes': 'timestamp',
+    'project': 'cwd',
+    'git_branch': 'git_branch',
+    'files_modified': 'files_modified',
+    'commands_run': 'commands_run',
+    'commands_total': 'commands_run',
+    'tasks_completed': 'tasks_completed',
+    'commits': 'commits',
+}
+
+# Tool name -> [(source, extractor)]. Extractors take (tool_input, timestamp)
+# and yield events; they only run when their source is requested.
+TOOL_EXTRACTORS: Dict[str, List[Tuple[str, Callable]]] = {}
+
+
+def tool_extractor(tool_name: str, source: str):
+    """Register an extractor for tool_use blocks of `tool_name`."""
+    def register(fn):
+        TOOL_EXTRACTORS.setdefault(tool_name, []).append((source, fn))
+        return fn
+    return register
+
+
+# Extract file operations (Edit/Write)
+@tool_extractor('Edit', 'files_modified')
+def _extract_edit(tool_input: Dict[str, Any], timestamp: str) -> Iterator[Tuple]:
+    file_path = tool_input.get('file_path')
+    if file_path:
+        yield ('edit', file_path)
+
+
+@tool_extractor('Write', 'files_modified')
+def _extract_write(tool_input: Dict[str, Any], timestamp: str) -> Iterator[Tuple]:
+    file_path = tool_input.get('file_path')
+    if file_path:
+        # Count lines without allocating a split list
+        yield ('write', file_path, tool_input.get('content', '').count('\n') + 1)
+
+
+# Extract bash commands
+@tool_extractor('Bash', 'commands_run')
+def _extract_command(tool_input: Dict[str, Any], timestamp: str) -> Iterator[Tuple]:
+    command = tool_input.get('command')
+    if command:
+        yield ('command', command, tool_input.get('description', ''), timestamp)
+
+
+# Extract git commits
+@tool_extractor('Bash', 'commits')
+def _extract_commit(tool_input: Dict[str, Any], timestamp: str) -> Iterator[Tuple]:
+    command = tool_input.get('command')
+    if command and 'git commit' in command:
+        yield ('commit', command, timestamp)
+
+
+# Extract task completions
+@tool_extractor('TaskUpdate', 'tasks_completed')
+def _extract_task(tool_input: Dict[str, Any], timestamp: str) -> Iterator[Tuple]:
+    if tool_input.get('status') == 'completed':
+        yield ('task', tool_input.get('taskId'), timestamp)
+
+
+class ExtractionPlan:
+    """
+    Which extractors to run for a set of requested output fields.
+
+    Built once per parse; work for unrequested fields (including tool
+    extractors and Write line counting) is skipped entirely.
+    """
+
+    def __init__(self, fields: Optional[Iterable[str]] = None):
+        requested = set(FIELD_SOURCES if fields is None else fields)
+        unknown = requested - set(FIELD_SOURCES)
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+
+        # Keep canonical output order regardless of request order
+        self.fields = [field for field in FIELD_SOURCES if field in requested]
+        sources = {FIELD_SOURCES[field] for field in self.fields}
+
+        self.timestamp = 'timestamp' in sources
+        self.session_id = 'session_id' in sources
+        self.cwd = 'cwd' in sources
+        self.git_branch = 'git_branch' in sources
+        self.tools = {}
+        for tool_name, extractors in TOOL_EXTRACTORS.items():
+            selected = [fn for source, fn in extractors if source in sources]
+            if selected:
+                self.tools[tool_name] = selected
+        self.content = bool(self.tools) or self.git_branch
+
+    def select(self, session_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Trim finalized session data to the requested fields."""
+        if len(self.fields) == len(FIELD_SOURCES):
+            return session_data
+        return {field: session_data[field] for field in self.fields}
+
+
+ALL_FIELDS = ExtractionPlan()
+
+
+def _entry_events(line_num: int, entry: Dict[str, Any],
+                  plan: ExtractionPlan = ALL_FIELDS) -> Iterator[Tuple]:
+    """Yield extraction events for a single transcript entry."""
+    # Extract timestamps
+    if plan.timestamp and 'timestamp' in entry:
+        yield ('timestamp', entry['timestamp'])
+
+    # Extract session ID from first message
+    if plan.session_id and line_num == 1 and 'session_id' in entry:
+        yield ('session_id', entry['session_id'])
+
+    # Extract project path (cwd)
+    if plan.cwd and 'cwd' in entry:
+        yield ('cwd', entry['cwd'])
+
+    # Look for content blocks with tool uses
+    content = entry.get('content') if plan.content else None
+    if not isinstance(content, list):
+        return
+
+    timestamp = entry.get('timestamp', '')
+    for block in content:
+        if not isinstance(block, dict):
+            continue
+
+        block_type = block.get('type')
+        if block_type == 'tool_use':
+            extractors = plan.tools.get(block.get('name'))
+            if extractors:
+                tool_input = block.get('input', {})
+                for extractor in extractors:
+                    yield from extractor(tool_input, timestamp)
+
+        # Extract tool results for git branch
+        elif block_type == 'tool_result' and plan.git_branch:
+            result = block.get('content')
+            if isinstance(result, str) and result.strip():
+                # Check if this looks like a branch name
+                if '\n' not in result and len(result) < 100 and '/' in result:
+                    yield ('branch', result.strip())
+
+
+def extract_events(entries: Iterable[Tuple[int, Any]],
+                   on_warning: Callable = print_line_warning,
+                   plan: ExtractionPlan = ALL_FIELDS) -> Iterator[Tuple]:
+    """Turn decoded entries into a flat stream of extraction events."""
+    for line_num, entry in entries:
+        try:
+            # Materialize per line so a bad entry contributes nothing
+            events = list(_entry_events(line_num, entry, plan))
+        except Exception as e:
+            on_warning(line_num, 'error', str(e))
+            continue
+        yield from events
+
+
+class SessionReducer:
+    """
+    Fold extraction events into session state with bounded memory.
+
+    Unique files, commits and completed tasks are kept in full because the
+    handoff renders all of them. Bash commands only keep the most recent
+    commands_limit in a ring buffer plus a running total; None keeps every
+    command (ingest stores the full history).
+    """
+
+    def __init__(self, commands_limit: Optional[int] = RECENT_COMMANDS_LIMIT):
+        self.session_id: Optional[str] = None
+        self.time_start: Optional[str] = None
+        self.time_end: Optional[str] = None
+        self.project: Optional[str] = None
+        self.git_branch: Optional[str] = None
+        self.file_operations: Dict[str, Dict[str, Any]] = {}
+        self.commands: Deque[Dict[str, str]] = deque(maxlen=commands_limit)
+        self.commands_total = 0
+        self.tasks_completed: List[Dict[str, Any]] = []
+        self.commits: List[Dict[str, str]] = []
+
+    def feed(self, events: Iterable[Tuple]) -> 'SessionReducer':
+        for event in events:
+            kind = event[0]
+
+            if kind == 'timestamp':
+                if self.time_start is None:
+                    self.time_start = event[1]
+                self.time_end = event[1]
+
+            elif kind == 'session_id':
+                self.session_id = event[1]
+
+            elif kind == 'cwd':
+                self.project = event[1]
+
+            elif kind == 'edit':
+                file_op = self.file_operations.get(event[1])
+                if file_op is None:
+                    self.file_operations[event[1]] = {'path': event[1], 'tool': 'Edit', 'count': 1}
+                elif file_op['tool'] == 'Edit':
+                    file_op['count'] += 1
+
+            elif kind == 'write':
+                self.file_operations[event[1]] = {
+                    'path': event[1],
+                    'tool': 'Write',
+                    'line_count': event[2]
+                }
+
+            elif kind == 'command':
+                self.commands.append({
+                    'command': event[1],
+                    'description': event[2],
+                    'timestamp': event[3]
+                })
+                self.commands_total += 1
+
+            elif kind == 'commit':
+                self.commits.append({'command': event[1], 'timestamp': event[2]})
+
+            elif kind == 'task':
+                self.tasks_completed.append({'id': event[1], 'timestamp': event[2]})
+
+            elif kind == 'branch':
+                if self.git_branch is None:
+                    self.git_branch = event[1]
+
+        return self
+
+    def merge(self, later: 'SessionReducer') -> 'SessionReducer':
+        """
+        Fold in a reducer that saw the lines immediately after this one.
+
+        Associative, so chunk results can be combined in file order and
+        match a single serial pass. Session ID only ever comes from the
+        first chunk's first line, so `later.session_id` is ignored.
+        """
+        if self.time_start is None:
+            self.time_start = later.time_start
+        if later.time_end is not None:
+            self.time_end = later.time_end
+        if later.project is not None:
+            self.project = later.project
+        if self.git_branch is None:
+            self.git_branch = later.git_branch
+
+        for path, later_op in later.file_operations.items():
+            file_op = self.file_operations.get(path)
+            if file_op is None or later_op['tool'] == 'Write':
+                self.file_operations[path] = dict(later_op)
+            elif file_op['tool'] == 'Edit':
+                file_op['count'] += later_op['count']
+
+        self.commands.extend(later.commands)
+        self.commands_total += later.commands_total
+        self.tasks_completed.extend(later.tasks_completed)
+        self.commits.extend(later.commits)
+        return self
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serialize reducer state for a checkpoint."""
+        return {
+            'session_id': self.session_id,
+            'time_start': self.time_start,
+            'time_end': self.time_end,
+            'project': self.project,
+            'git_branch': self.git_branch,
+            'file_operations': list(self.file_operations.values()),
+            'commands_limit': self.commands.maxlen,
+            'commands': list(self.commands),
+            'commands_total': self.commands_total,
+            'tasks_completed': self.tasks_completed,
+            'commits': self.commits
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'SessionReducer':
+        """Rebuild a reducer from to_state() output."""
+        reducer = cls(state['commands_limit'])
+        reducer.session_id = state['session_id']
+        reducer.time_start = state['time_start']
+        reducer.time_end = state['time_end']
+        reducer.project = state['project']
+        reducer.git_branch = state['git_branch']
+        reducer.file_operations = {op['path']: op for op in state['file_operations']}
+        reducer.commands.extend(state['commands'])
+        reducer.commands_total = state['commands_total']
+        reducer.tasks_completed = state['tasks_completed']
+        reducer.commits = state['commits']
+        return reducer
+
+    def session_data(self) -> Dict[str, Any]:
+        return {
+            'session_id': self.session_id if self.session_id is not None else 'unknown',
+            'time_start': self.time_start,
+            'time_end': self.time_end,
+            'duration_minutes': 0,
+            'project': self.project if self.project is not None else 'unknown',
+            'git_branch': self.git_branch if self.git_branch is not None else 'unknown',
+            'files_modified': list(self.file_operations.values()),
+            'commands_run': list(self.commands),
+            'commands_total': self.commands_total,
+            'tasks_completed': self.tasks_completed,
+            'commits': self.commits
+        }
+
+
+def finalize_session_data(session_data: Dict[str, Any], transcript_path: str) -> Dict[str, Any]:
+    """Fill derived fields: duration and filename-based session ID fallback."""
+    # Calculate duration
+    if session_data['time_start'] and session_data['time_end']:
+        try:
+            start = datetime.fromisoformat(session_data['time_start'].replace('Z', '+00:00'))
+            end = datetime.fromisoformat(session_data['time_end'].replace('Z', '+00:00'))
+            duration = end - start
+            session_data['duration_minutes'] = int(duration.total_seconds() / 60)
+        except Exception as e:
+            print(f"Warning: Could not calculate duration: {e}", file=sys.stderr)
+
+    # Extract session ID from transcript filename if not found
+    if session_data['session_id'] == 'unknown':
+        session_data['session_id'] = transcript_stem(transcript_path)
+
+    return session_data
+
+
+class ParseStats:
+    """
+    Counters and per-phase timings for one run (--stats).
+
+    Each pipeline stage is wrapped in a timer; since stages are chained
+    generators, a stage's own time is its inclusive time minus that of
+    the stage feeding it. With -j, worker phases are summed CPU seconds.
+    """
+
+    PHASES = ('read', 'decode', 'count', 'extract', 'reduce', 'render', 'write')
+
+    def __init__(self):
+        self.lines = 0
+        self.bytes = 0
+        self.tool_blocks: Dict[str, int] = {}
+        self.warnings = LineWarnings()
+        self.workers = 0
+        self.extra: Dict[str, Any] = {}
+        # Inclusive stage times: read, decode, count, extract, feed (+ render, write)
+        self._inclusive: Dict[str, float] = dict.fromkeys(
+            ('read', 'decode', 'count', 'extract', 'feed', 'render', 'write'), 0.0)
+
+    def _timed(self, items: Iterable, stage: str) -> Iterator:
+        clock = time.perf_counter
+        inclusive = self._inclusive
+        iterator = iter(items)
+        while True:
+            start = clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                inclusive[stage] += clock() - start
+                return
+            inclusive[stage] += clock() - start
+            yield item
+
+    def _counted(self, lines: Iterable[Tuple[int, bytes]]) -> Iterator[Tuple[int, bytes]]:
+        for item in lines:
+            self.lines += 1
+            self.bytes += len(item[1])
+            yield item
+
+    def _count_blocks(self, entries: Iterable[Tuple[int, Any]]) -> Iterator[Tuple[int, Any]]:
+        tool_blocks = self.tool_blocks
+        for item in entries:
+            content = item[1].get('content') if isinstance(item[1], dict) else None
+            if isinstance(content, list):
+                for block in content:
+                    if not isinstance(block, dict):
+                        continue
+                    block_type = block.get('type')
+                    if block_type == 'tool_use':
+                        name = str(block.get('name'))
+                        tool_blocks[name] = tool_blocks.get(name, 0) + 1
+                    elif block_type == 'tool_result':
+                        tool_blocks['tool_result'] = tool_blocks.get('tool_result', 0) + 1
+            yield item
+
+    def run(self, reducer: SessionReducer, lines: Iterable[Tuple[int, bytes]],
+            decode: Callable, plan: ExtractionPlan) -> SessionReducer:
+        """Instrumented equivalent of reducer.feed(extract_events(decode(lines)))."""
+        read = self._counted(self._timed(lines, 'read'))
+        decoded = self._timed(decode(read, self.warnings), 'decode')
+        counted = self._timed(self._count_blocks(decoded), 'count')
+        events = self._timed(extract_events(counted, self.warnings, plan), 'extract')
+
+        start = time.perf_counter()
+        reducer.feed(events)
+        self._inclusive['feed'] += time.perf_counter() - start
+        return reducer
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Time a non-pipeline phase (render, write)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._inclusive[name] += time.perf_counter() - start
+
+    def merge(self, other: 'ParseStats'):
+        """Add a chunk worker's counters and timings (warnings are merged separately)."""
+        self.lines += other.lines
+        self.bytes += other.bytes
+        for name, count in other.tool_blocks.items():
+            self.tool_blocks[name] = self.tool_blocks.get(name, 0) + count
+        for stage, seconds in other._inclusive.items():
+            self._inclusive[stage] += seconds
+        self.workers += 1
+
+    @property
+    def phases(self) -> Dict[str, float]:
+        inclusive = self._inclusive
+        return {
+            'read': inclusive['read'],
+            'decode': max(0.0, inclusive['decode'] - inclusive['read']),
+            # Tool block counting for the stats themselves
+            'count': max(0.0, inclusive['count'] - inclusive['decode']),
+            'extract': max(0.0, inclusive['extract'] - inclusive['count']),
+            'reduce': max(0.0, inclusive['feed'] - inclusive['extract']),
+            'render': inclusive['render'],
+            'write': inclusive['write'],
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        counts = self.warnings.counts
+        return {
+            'lines': self.lines,
+            'bytes': self.bytes,
+            'malformed_lines': counts.get('malformed', 0),
+            'error_lines': counts.get('error', 0),
+            'mismatch_lines': counts.get('mismatch', 0),
+            'tool_blocks': dict(sorted(self.tool_blocks.items(), key=lambda item: (-item[1], item[0]))),
+            'phases': {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            'workers': self.workers,
+            **self.extra,
+        }
+
+    def report(self, transcript_path: str):
+        """Print a readable stats block to stderr."""
+        data = self.to_dict()
+        out = sys.stderr
+        print(f"Stats: {transcript_path}", file=out)
+        print(f"  lines {data['lines']}, bytes {data['bytes']}, malformed {data['malformed_lines']}, "
+              f"errors {data['error_lines']}, mismatches {data['mismatch_lines']}", file=out)
+
+        timed = ' (summed across workers)' if self.workers else ''
+        print(f"  phases{timed}:", file=out)
+        for name, seconds in data['phases'].items():
+            print(f"    {name:<8} {seconds:>10.4f}s", file=out)
+
+        if data['tool_blocks']:
+            print("  tool blocks:", file=out)
+            for name, count in data['tool_blocks'].items():
+                print(f"    {name:<16} {count:>8}", file=out)
+
+        for key in ('wall_seconds', 'tracemalloc_peak_bytes', 'peak_rss_kb'):
+            if key in data:
+                print(f"  {key.replace('_', ' ')}: {data[key]}", file=out)
+
+
+def _stats_phase(stats: Optional[ParseStats], name: str):
+    """stats.phase(name), or a no-op context when stats are off."""
+    return stats.phase(name) if stats is not None else contextlib.nullcontext()
+
+
+def _feed_lines(reducer: SessionReducer, lines: Iterable[Tuple[int, bytes]], decode: Callable,
+                plan: ExtractionPlan, warnings: LineWarnings,
+                stats: Optional[ParseStats] = None) -> SessionReducer:
+    """Run lines through decode -> extract -> reduce, instrumented when stats is given."""
+    if stats is not None:
+        return stats.run(reducer, lines, decode, plan)
+    return reducer.feed(extract_events(decode(lines, warnings), warnings, plan))
+
+
+def default_checkpoint_path(transcript_path: str) -> str:
+    """Sidecar checkpoint path stored next to the transcript."""
+    return f"{transcript_path}.checkpoint.json"
+
+
+def _head_hash(transcript_path: str, length: int) -> str:
+    """Hash the first `length` bytes of the transcript."""
+    with open(transcript_path, 'rb') as f:
+        return hashlib.sha256(f.read(length)).hexdigest()
+
+
+def load_checkpoint(transcript_path: str, checkpoint_path: str,
+                    plan: ExtractionPlan = ALL_FIELDS) -> Optional[Dict[str, Any]]:
+    """
+    Load a checkpoint if it still describes a prefix of the transcript.
+
+    Returns None (forcing a full parse) when the checkpoint is missing,
+    unreadable, from another format version or field selection, or the
+    transcript was truncated or rotated since it was written.
+    """
+    try:
+        with open(checkpoint_path, 'r') as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring unreadable checkpoint {checkpoint_path}: {e}", file=sys.stderr)
+        return None
+
+    return validate_checkpoint(transcript_path, checkpoint, plan, checkpoint_path)
+
+
+def validate_checkpoint(transcript_path: str, checkpoint: Dict[str, Any], plan: ExtractionPlan,
+                        source: str) -> Optional[Dict[str, Any]]:
+    """Return the checkpoint if it still applies to the transcript, else None."""
+    try:
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            return None
+
+        if checkpoint.get('fields') != plan.fields:
+            print("Warning: Checkpoint was written for other fields, doing full parse", file=sys.stderr)
+            return None
+
+        size = os.path.getsize(transcript_path)
+        if size < checkpoint['offset']:
+            print("Warning: Transcript shrank since checkpoint, doing full parse", file=sys.stderr)
+            return None
+
+        if _head_hash(transcript_path, checkpoint['head_length']) != checkpoint['head_hash']:
+            print("Warning: Transcript head changed since checkpoint, doing full parse", file=sys.stderr)
+            return None
+
+        # Validate the state shape before trusting it
+        SessionReducer.from_state(checkpoint['state'])
+    except (KeyError, TypeError, AttributeError) as e:
+        print(f"Warning: Ignoring malformed checkpoint {source}: {e}", file=sys.stderr)
+        return None
+
+    return checkpoint
+
+
+def build_checkpoint(transcript_path: str, cursor: TranscriptCursor,
+                     reducer: SessionReducer, plan: ExtractionPlan = ALL_FIELDS) -> Dict[str, Any]:
+    """Describe the consumed offset and reducer state."""
+    head_length = min(cursor.offset, CHECKPOINT_HEAD_BYTES)
+    checkpoint = {
+        'version': CHECKPOINT_VERSION,
+        'transcript': str(transcript_path),
+        'offset': cursor.offset,
+        'line_num': cursor.line_num,
+        'head_length': head_length,
+        'head_hash': _head_hash(transcript_path, head_length),
+        'fields': plan.fields,
+        'state': reducer.to_state()
+    }
+    return checkpoint
+
+
+def save_checkpoint(checkpoint_path: str, checkpoint: Dict[str, Any]):
+    """Atomically write a checkpoint sidecar."""
+    tmp_path = f"{checkpoint_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, checkpoint_path)
+
+
+# In-memory checkpoints, enabled by the daemon: (path, fields) -> JSON text.
+# Stored serialized so a cached state is never mutated by a later parse.
+_checkpoint_cache: Optional['OrderedDict[Tuple[str, Tuple[str, ...]], str]'] = None
+_checkpoint_cache_lock = threading.Lock()
+CHECKPOINT_CACHE_SIZE = 256
+
+
+def _cache_key(transcript_path: str, plan: ExtractionPlan) -> Tuple[str, Tuple[str, ...]]:
+    return (os.path.abspath(transcript_path), tuple(plan.fields))
+
+
+def _cached_checkpoint(transcript_path: str, plan: ExtractionPlan) -> Optional[Dict[str, Any]]:
+    with _checkpoint_cache_lock:
+        text = _checkpoint_cache.get(_cache_key(transcript_path, plan))
+    if text is None:
+        return None
+    return validate_checkpoint(transcript_path, json.loads(text), plan, 'in-memory cache')
+
+
+def _cache_checkpoint(transcript_path: str, plan: ExtractionPlan, checkpoint: Dict[str, Any]):
+    key = _cache_key(transcript_path, plan)
+    text = json.dumps(checkpoint)
+    with _checkpoint_cache_lock:
+        _checkpoint_cache[key] = text
+        _checkpoint_cache.move_to_end(key)
+        while len(_checkpoint_cache) > CHECKPOINT_CACHE_SIZE:
+            _checkpoint_cache.popitem(last=False)
+
+
+def parse_transcript(transcript_path: str, checkpoint_path: Optional[str] = None,
+                     jobs: int = 1, decoder: str = 'full',
+                     fields: Optional[Iterable[str]] = None,
+                     stats: Optional[ParseStats] = None) -> Dict[str, Any]:
+    """
+    Parse JSONL session transcript and extract session data.
+
+    Streams read -> decode -> extract -> reduce, so peak memory does not
+    grow with transcript size.
+
+    With checkpoint_path, resumes from the byte offset and reducer state
+    saved by the previous run (if still valid) and saves a new checkpoint
+    after the last complete line.
+
+    With jobs > 1 (and no checkpoint), large files are split into byte
+    ranges parsed in worker processes.
+
+    decoder picks a DECODERS entry: 'full' (json.loads every line), 'fast'
+    (skip decoding lines without tool blocks) or 'verify' (full decode,
+    reporting where the fast path would differ).
+
+    With fields, only the extractors those fields need are run and only
+    those keys are returned (see FIELD_SOURCES).
+
+    Malformed lines are counted and reported once at the end. With stats,
+    phase timings, line/byte counts and tool block counts are recorded.
+
+    Returns dict with:
+    - session_id: str
+    - time_start: ISO timestamp
+    - time_end: ISO timestamp
+    - duration_minutes: int
+    - project: str (cwd)
+    - git_branch: str
+    - files_modified: list of {path, tool, line_count}
+    - commands_run: last RECENT_COMMANDS_LIMIT of {command, description, timestamp}
+    - commands_total: int
+    - tasks_completed: list of {id, subject, status}
+    - commits: list of {hash, message, timestamp}
+    """
+
+    plan = ExtractionPlan(fields)
+
+    try:
+        if jobs > 1 and checkpoint_path is None:
+            return parse_transcript_parallel(transcript_path, jobs, decoder, plan.fields, stats)
+        return parse_transcript_strict(transcript_path, checkpoint_path, decoder, plan.fields, stats)
+    except FileNotFoundError:
+        print(f"Error: Transcript not found: {transcript_path}", file=sys.stderr)
+    except Exception as e:
+        print(f"Error: Failed to parse transcript: {e}", file=sys.stderr)
+
+    return plan.select(SessionReducer().session_data())
+
+
+def parse_transcript_strict(transcript_path: str, checkpoint_path: Optional[str] = None,
+                            decoder: str = 'full',
+                            fields: Optional[Iterable[str]] = None,
+                            stats: Optional[ParseStats] = None,
+                            commands_limit: Optional[int] = RECENT_COMMANDS_LIMIT) -> Dict[str, Any]:
+    """
+    Like parse_transcript(), but raises on I/O and parse failures.
+
+    commands_limit caps commands_run (None returns every command).
+    """
+    decode = DECODERS[decoder]
+    plan = ExtractionPlan(fields)
+    warnings = stats.warnings if stats is not None else LineWarnings()
+
+    use_cache = _checkpoint_cache is not None
+
+    # Byte offsets only make sense for plain files
+    if (checkpoint_path is not None or use_cache) and detect_compression(transcript_path):
+        if checkpoint_path is not None:
+            print("Warning: Checkpoints are not supported for compressed transcripts, doing full parse",
+                  file=sys.stderr)
+        checkpoint_path = None
+        use_cache = False
+
+    if checkpoint_path is None and not use_cache:
+        reducer = _feed_lines(SessionReducer(commands_limit), read_lines(transcript_path),
+                              decode, plan, warnings, stats)
+        warnings.report(transcript_path)
+        return plan.select(finalize_session_data(reducer.session_data(), transcript_path))
+
+    cursor = TranscriptCursor()
+    reducer = SessionReducer(commands_limit)
+    checkpoint = _cached_checkpoint(transcript_path, plan) if use_cache else None
+    if checkpoint is None and checkpoint_path is not None:
+        checkpoint = load_checkpoint(transcript_path, checkpoint_path, plan)
+    if checkpoint and checkpoint['state']['commands_limit'] != commands_limit:
+        # A capped checkpoint cannot supply the commands it dropped
+        checkpoint = None
+    if checkpoint:
+        cursor = TranscriptCursor(checkpoint['offset'], checkpoint['line_num'])
+        reducer = SessionReducer.from_state(checkpoint['state'])
+
+    _feed_lines(reducer, read_lines(transcript_path, cursor), decode, plan, warnings, stats)
+
+    checkpoint = build_checkpoint(transcript_path, cursor, reducer, plan)
+    if use_cache:
+        _cache_checkpoint(transcript_path, plan, checkpoint)
+    if checkpoint_path is not None:
+        try:
+            save_checkpoint(checkpoint_path, checkpoint)
+        except OSError as e:
+            print(f"Warning: Could not write checkpoint {checkpoint_path}: {e}", file=sys.stderr)
+
+    # A partial last line still counts for this run, just not the checkpoint
+    if cursor.partial is not None:
+        _feed_lines(reducer, [(cursor.line_num + 1, cursor.partial)], decode, plan, warnings, stats)
+
+    warnings.report(transcript_path)
+    return plan.select(finalize_session_data(reducer.session_data(), transcript_path))
+
+
+# Fields summarize_transcript() can answer from the head and tail alone
+SUMMARY_FIELDS = ['session_id', 'time_start', 'time_end', 'duration_minutes', 'project']
+
+
+def _decode_dict(line: bytes) -> Optional[Dict[str, Any]]:
+    """Decode one line, returning None for anything but a JSON object."""
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def summarize_transcript(transcript_path: str) -> Dict[str, Any]:
+    """
+    Quick summary from the transcript's first and last lines.
+
+    Memory-maps the file, reads forward to the first timestamped line and
+    backward from EOF to the last timestamp and cwd, so cost does not
+    grow with file size. Returns the SUMMARY_FIELDS subset of
+    parse_transcript() with the same values. Raises on I/O errors.
+    Compressed transcripts cannot be mapped and are streamed instead.
+    """
+    if detect_compression(transcript_path):
+        return parse_transcript_strict(transcript_path, fields=SUMMARY_FIELDS)
+
+    session_data = {
+        'session_id': 'unknown',
+        'time_start': None,
+        'time_end': None,
+        'duration_minutes': 0,
+        'project': 'unknown',
+    }
+
+    with open(transcript_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return finalize_session_data(session_data, transcript_path)
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Forward: session ID from line 1, first timestamp
+            position = 0
+            line_num = 0
+            while position < size and session_data['time_start'] is None:
+                newline = mm.find(b'\n', position)
+                if newline == -1:
+                    newline = size
+                line_num += 1
+                entry = _decode_dict(mm[position:newline])
+                position = newline + 1
+
+                if entry is None:
+                    continue
+                if line_num == 1 and 'session_id' in entry:
+                    session_data['session_id'] = entry['session_id']
+                if 'timestamp' in entry:
+                    session_data['time_start'] = entry['timestamp']
+
+            # Backward: last timestamp and last cwd
+            end = size
+            need_time = session_data['time_start'] is not None
+            need_cwd = True
+            while end > 0 and (need_time or need_cwd):
+                start = mm.rfind(b'\n', 0, end) + 1
+                entry = _decode_dict(mm[start:end]) if start < end else None
+                end = start - 1
+
+                if entry is None:
+                    continue
+                if need_time and 'timestamp' in entry:
+                    session_data['time_end'] = entry['timestamp']
+                    need_time = False
+                if need_cwd and 'cwd' in entry:
+                    session_data['project'] = entry['cwd']
+                    need_cwd = False
+
+    return finalize_session_data(session_data, transcript_path)
+
+
+def split_chunks(transcript_path: str, chunks: int) -> List[Tuple[int, int]]:
+    """
+    Split a transcript into up to `chunks` byte ranges on line boundaries.
+
+    Every range starts at the beginning of a line and ends where the next
+    range starts (or at EOF), so each line belongs to exactly one range.
+    """
+    size = os.path.getsize(transcript_path)
+    boundaries = [0]
+
+    with open(transcript_path, 'rb') as f:
+        for i in range(1, chunks):
+            target = max(size * i // chunks, boundaries[-1] + 1)
+            if target >= size:
+                break
+            # Finish the line containing target-1 so the range starts on a line
+            f.seek(target - 1)
+            f.readline()
+            position = f.tell()
+            if position >= size:
+                break
+            if position > boundaries[-1]:
+                boundaries.append(position)
+
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _read_range(transcript_path: str, start: int, end: int) -> Iterator[Tuple[int, bytes]]:
+    """Stream lines in [start, end) numbered from 1 within the range."""
+    with open(transcript_path, 'rb') as f:
+        f.seek(start)
+        position = start
+        line_num = 0
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            line_num += 1
+            yield line_num, line
+
+
+def _chunk_worker(job: Tuple[str, int, int, str, List[str], bool]
+                  ) -> Tuple[Dict[str, Any], int, LineWarnings, Optional[ParseStats]]:
+    """Parse one byte range; returns (reducer state, line count, warnings, stats)."""
+    transcript_path, start, end, decoder, fields, collect_stats = job
+    decode = DECODERS[decoder]
+    plan = ExtractionPlan(fields)
+    stats = ParseStats() if collect_stats else None
+    warnings = stats.warnings if stats is not None else LineWarnings()
+    line_count = 0
+
+    def counted(lines):
+        nonlocal line_count
+        for item in lines:
+            line_count = item[0]
+            yield item
+
+    lines = counted(_read_range(transcript_path, start, end))
+    reducer = _feed_lines(SessionReducer(), lines, decode, plan, warnings, stats)
+    return reducer.to_state(), line_count, warnings, stats
+
+
+def parse_transcript_parallel(transcript_path: str, jobs: int, decoder: str = 'full',
+                              fields: Optional[Iterable[str]] = None,
+                              stats: Optional[ParseStats] = None) -> Dict[str, Any]:
+    """
+    Parse one transcript by splitting it into line-aligned byte ranges.
+
+    Chunks are reduced in worker processes and merged in file order with
+    SessionReducer.merge(), giving the same result as the serial path.
+    Warnings are re-numbered to global line numbers before reporting.
+    Compressed transcripts cannot be split and are parsed serially.
+    """
+    size = os.path.getsize(transcript_path)
+    chunks = min(jobs, size // MIN_CHUNK_BYTES)
+    if chunks < 2 or detect_compression(transcript_path):
+        return parse_transcript_strict(transcript_path, decoder=decoder, fields=fields, stats=stats)
+
+    plan = ExtractionPlan(fields)
+    work = [(transcript_path, start, end, decoder, plan.fields, stats is not None)
+            for start, end in split_chunks(transcript_path, chunks)]
+    with multiprocessing.Pool(len(work)) as pool:
+        results = pool.map(_chunk_worker, work, 1)
+
+    all_warnings = stats.warnings if stats is not None else LineWarnings()
+    reducer = None
+    line_base = 0
+    for state, line_count, warnings, chunk_stats in results:
+        all_warnings.merge(warnings, line_base)
+        if stats is not None:
+            stats.merge(chunk_stats)
+        line_base += line_count
+
+        chunk_reducer = SessionReducer.from_state(state)
+        if reducer is None:
+            reducer = chunk_reducer
+        else:
+            reducer.merge(chunk_reducer)
+
+    all_warnings.report(transcript_path)
+    return plan.select(finalize_session_data(reducer.session_data(), transcript_path))
+
+
+def render_handoff(session_data: Dict[str, Any], template: str) -> str:
+    """
+    Fill handoff template text with auto-generated data.
+    Leaves manual-input fields with PLACEHOLDER markers.
+    """
+
+    # Format files modified
+    files_list = []
+    for file_info in session_data['files_modified']:
+        if 'line_count' in file_info:
+            files_list.append(f"- {file_info['path']} ({file_info['tool']}, {file_info['line_count']} lines)")
+        else:
+            files_list.append(f"- {file_info['path']} ({file_info['tool']}, {file_info.get('count', 1)} edits)")
+    files_modified = '\n'.join(files_list) if files_list else '(none)'
+
+    # Format commands (limit to last 20)
+    commands = []
+    for cmd in session_data['commands_run'][-RECENT_COMMANDS_LIMIT:]:
+        if cmd['description']:
+            commands.append(f"# {cmd['description']}")
+        commands.append(cmd['command'])
+        commands.append('')
+    commands_run = '\n'.join(commands) if commands else '(none)'
+
+    # Format tasks completed
+    completed_tasks = []
+    for task in session_data['tasks_completed']:
+        completed_tasks.append(f"- Task {task['id']}")
+    completed = '\n'.join(completed_tasks) if completed_tasks else '(none)'
+
+    # Format commits
+    commits_list = []
+    for commit in session_data['commits']:
+        commits_list.append(f"- {commit['command']}")
+    commits_str = '\n'.join(commits_list) if commits_list else '[]'
+
+    # Format date/time
+    if session_data['time_start']:
+        try:
+            dt = datetime.fromisoformat(session_data['time_start'].replace('Z', '+00:00'))
+            date_str = dt.strftime('%Y-%m-%d')
+            time_start_str = dt.strftime('%H:%M')
+        except:
+            date_str = datetime.now().strftime('%Y-%m-%d')
+            time_start_str = 'unknown'
+    else:
+        date_str = datetime.now().strftime('%Y-%m-%d')
+        time_start_str = 'unknown'
+
+    if session_data['time_end']:
+        try:
+            dt = datetime.fromisoformat(session_data['time_end'].replace('Z', '+00:00'))
+            time_end_str = dt.strftime('%H:%M')
+        except:
+            time_end_str = 'unknown'
+    else:
+        time_end_str = 'unknown'
+
+    # Fill template
+    return template.format(
+        session_id=session_data['session_id'],
+        date=date_str,
+        time_start=time_start_str,
+        time_end=time_end_str,
+        duration_minutes=session_data['duration_minutes'],
+        project=session_data['project'],
+        topic='[MANUAL: Enter topic/focus]',
+        tags='[]',
+        git_branch=session_data['git_branch'],
+        commits=commits_str,
+        title='[MANUAL: Enter title]',
+        summary='[MANUAL: 1-2 sentence summary of what was accomplished]',
+        completed=completed,
+        in_progress='[MANUAL: What work is partially complete?]',
+        next_steps='[MANUAL: What should be done next?]\n1. \n2. \n3. ',
+        blockers='[MANUAL: What is blocking progress?]',
+        decisions='[MANUAL: What decisions were made and why?]',
+        files_modified=files_modified,
+        commands_run=commands_run,
+        context_notes='[MANUAL: Any other context worth preserving?]'
+    )
+
+
+# Handoff templates by path: (mtime_ns, text)
+_template_cache: Dict[str, Tuple[int, str]] = {}
+
+
+def load_template(template_path: str) -> str:
+    """Read a handoff template, reusing the cached text while it is unchanged."""
+    mtime = os.stat(template_path).st_mtime_ns
+    cached = _template_cache.get(template_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(template_path, 'r') as f:
+        template = f.read()
+    _template_cache[template_path] = (mtime, template)
+    return template
+
+
+def generate_handoff_skeleton(session_data: Dict[str, Any], template_path: str, output_path: str,
+                              stats: Optional[ParseStats] = None):
+    """
+    Fill handoff template with auto-generated data and write it out.
+    Leaves manual-input fields with PLACEHOLDER markers.
+    """
+
+    try:
+        with _stats_phase(stats, 'render'):
+            template = load_template(template_path)
+            handoff = render_handoff(session_data, template)
+
+        with _stats_phase(stats, 'write'):
+            with open(output_path, 'w') as f:
+                f.write(handoff)
+
+        print(f"Handoff skeleton written to: {output_path}", file=sys.stderr)
+
+    except FileNotFoundError:
+        print(f"Error: Template not found: {template_path}", file=sys.stderr)
+    except Exception as e:
+        print(f"Error: Failed to generate handoff: {e}", file=sys.stderr)
+
+
+def parse_fields_arg(value: str) -> List[str]:
+    """argparse type for --fields: comma-separated FIELD_SOURCES keys."""
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    try:
+        ExtractionPlan(fields)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"{e} (choose from {', '.join(FIELD_SOURCES)})")
+    return fields
+
+
+def expand_transcript_paths(inputs: Iterable[str]) -> List[str]:
+    """
+    Expand files, directories and glob patterns into transcript paths.
+
+    Directories are searched recursively for *.jsonl (plain or compressed,
+    see TRANSCRIPT_PATTERNS). Order follows the
+    inputs, sorted within each input, with duplicates removed.
+    """
+    seen = set()
+    paths = []
+
+    for item in inputs:
+        item = os.path.expanduser(item)
+        if os.path.isdir(item):
+            matches = sorted(str(p) for pattern in TRANSCRIPT_PATTERNS for p in Path(item).rglob(pattern))
+        elif glob.has_magic(item):
+            matches = sorted(p for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+        else:
+            matches = [item]
+
+        for path in matches:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+
+    return paths
+
+
+# Per-worker handoff template, loaded once by _batch_init
+_batch_template: Optional[str] = None
+
+
+def _batch_init(template_path: Optional[str]):
+    global _batch_template
+    if template_path:
+        _batch_template = load_template(template_path)
+
+
+def _batch_worker(job: Tuple[str, Optional[str], str, Optional[List[str]], Optional[int]]) -> Dict[str, Any]:
+    """Parse one transcript, isolating any failure into the result record."""
+    transcript_path, skeleton_dir, decoder, fields, commands_limit = job
+    record: Dict[str, Any] = {'transcript': transcript_path}
+
+    try:
+        if decoder == 'summary':
+            session_data = summarize_transcript(transcript_path)
+        else:
+            session_data = parse_transcript_strict(transcript_path, decoder=decoder, fields=fields,
+                                                   commands_limit=commands_limit)
+        if skeleton_dir:
+            # Transcripts are named <session_id>.jsonl; the stem stays unique per file
+            output_path = os.path.join(skeleton_dir, f"{transcript_stem(transcript_path)}.md")
+            with open(output_path, 'w') as f:
+                f.write(render_handoff(session_data, _batch_template))
+            record['handoff'] = output_path
+        record['status'] = 'ok'
+        record.update(session_data)
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = f"{type(e).__name__}: {e}"
+
+    return record
+
+
+def iter_batch(paths: List[str], jobs: int = 0, ordered: bool = True,
+               skeleton_dir: Optional[str] = None, template_path: Optional[str] = None,
+               decoder: str = 'full', fields: Optional[List[str]] = None,
+               commands_limit: Optional[int] = RECENT_COMMANDS_LIMIT) -> Iterator[Dict[str, Any]]:
     """
-    Parse JSONL session transcript and extract session data.
+    Parse many transcripts across a process pool, yielding one record each.
 
-    Returns dict with:
-    - session_id: str
-    - time_start: ISO timestamp
-    - time_end: ISO timestamp
-    - duration_minutes: int
-    - project: str (cwd)
-    - git_branch: str
-    - files_modified: list of {path, tool, line_count}
-    - commands_run: list of {command, description, timestamp}
-    - tasks_completed: list of {id, subject, status}
-    - commits: list of {hash, message, timestamp}
+    commands_limit caps each record's commands_run (None keeps them all).
     """
+    if skeleton_dir:
+        os.makedirs(skeleton_dir, exist_ok=True)
 
-    session_data = {
-        'session_id': 'unknown',
-        'time_start': None,
-        'time_end': None,
-        'duration_minutes': 0,
-        'project': 'unknown',
-        'git_branch': 'unknown',
-        'files_modified': [],
-        'commands_run': [],
-        'tasks_completed': [],
-        'commits': []
-    }
+    jobs = jobs or os.cpu_count() or 1
+    work = [(path, skeleton_dir, decoder, fields, commands_limit) for path in paths]
 
-    file_operations = {}  # Track unique files
+    if jobs == 1 or len(work) <= 1:
+        _batch_init(template_path)
+        for job in work:
+            yield _batch_worker(job)
+        return
 
+    chunksize = max(1, min(64, len(work) // (jobs * 4)))
+    with multiprocessing.Pool(jobs, initializer=_batch_init, initargs=(template_path,)) as pool:
+        results = pool.imap if ordered else pool.imap_unordered
+        yield from results(_batch_worker, work, chunksize)
+
+
+def run_batch(paths: List[str], output, jobs: int = 0, ordered: bool = True,
+              skeleton_dir: Optional[str] = None, template_path: Optional[str] = None,
+              decoder: str = 'full', fields: Optional[List[str]] = None) -> int:
+    """
+    Parse many transcripts across a process pool.
+
+    Writes one JSON record per transcript to `output` (a text stream) and
+    returns the number of transcripts that failed.
+    """
+    failures = 0
+
+    for record in iter_batch(paths, jobs, ordered, skeleton_dir, template_path, decoder, fields):
+        if record['status'] != 'ok':
+            failures += 1
+            print(f"Error: {record['transcript']}: {record['error']}", file=sys.stderr)
+        output.write(json.dumps(record) + '\n')
+
+    return failures
+
+
+def batch_main(argv: List[str]):
+    parser = argparse.ArgumentParser(
+        prog='handoff-parser.py batch',
+        description='Parse many transcripts in parallel into a JSONL summary stream'
+    )
+    parser.add_argument('inputs', nargs='+', help='Transcript files, directories or glob patterns')
+    parser.add_argument('-o', '--output', help='Write JSONL summaries here (default: stdout)')
+    parser.add_argument('--skeleton-dir', help='Also write one handoff skeleton per session here')
+    parser.add_argument('-j', '--jobs', type=int, default=0, help='Worker processes (default: CPU count)')
+    parser.add_argument('--unordered', action='store_true',
+                        help='Emit records as workers finish instead of in input order')
+    parser.add_argument('--decode', choices=sorted(DECODERS), default='full',
+                        help='Line decoding strategy (default: full)')
+    parser.add_argument('--fields', type=parse_fields_arg,
+                        help='Comma-separated fields to extract (JSON summaries only)')
+    parser.add_argument('--summary', action='store_true',
+                        help=f"Only read each file's head and tail for {', '.join(SUMMARY_FIELDS)}")
+
+    args = parser.parse_args(argv)
+
+    if (args.fields or args.summary) and args.skeleton_dir:
+        parser.error('--fields/--summary cannot be combined with --skeleton-dir')
+    if args.summary and args.fields:
+        parser.error('--summary cannot be combined with --fields')
+
+    paths = expand_transcript_paths(args.inputs)
+    if not paths:
+        print("Error: No transcripts matched", file=sys.stderr)
+        sys.exit(1)
+
+    template_path = None
+    if args.skeleton_dir:
+        template_path = str(Path(__file__).parent / 'handoff.md.template')
+
+    output = open(args.output, 'w') if args.output else sys.stdout
     try:
-        with open(transcript_path, 'r') as f:
-            lines = f.readlines()
+        failures = run_batch(paths, output, args.jobs, not args.unordered,
+                             args.skeleton_dir, template_path,
+                             'summary' if args.summary else args.decode, args.fields)
+    finally:
+        if args.output:
+            output.close()
 
-        for line_num, line in enumerate(lines, 1):
-            try:
-                entry = json.loads(line.strip())
+    print(f"Parsed {len(paths) - failures}/{len(paths)} transcripts", file=sys.stderr)
+    if failures:
+        sys.exit(1)
 
-                # Extract timestamps
-                if 'timestamp' in entry:
-                    ts = entry['timestamp']
-                    if session_data['time_start'] is None:
-                        session_data['time_start'] = ts
-                    session_data['time_end'] = ts
 
-                # Extract session ID from first message
-                if line_num == 1 and 'session_id' in entry:
-                    session_data['session_id'] = entry['session_id']
+# Tables added to the workspace index for parsed sessions (schema version 2).
+# Mirrors templates/workspace-schema.sql so older indexes can be migrated.
+SESSION_INDEX_DDL = """
+CREATE TABLE IF NOT EXISTS session_files (
+    session_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    edit_count INTEGER,
+    line_count INTEGER,
+    PRIMARY KEY (session_id, path),
+    FOREIGN KEY (session_id) REFERENCES sessions(id)
+);
+CREATE TABLE IF NOT EXISTS session_commands (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    command TEXT NOT NULL,
+    description TEXT,
+    timestamp TEXT,
+    PRIMARY KEY (session_id, seq),
+    FOREIGN KEY (session_id) REFERENCES sessions(id)
+);
+CREATE INDEX IF NOT EXISTS idx_session_files_path ON session_files(path, session_id);
+CREATE INDEX IF NOT EXISTS idx_session_commands_command ON session_commands(command);
+CREATE INDEX IF NOT EXISTS idx_sessions_started ON sessions(started_at DESC);
+INSERT OR IGNORE INTO schema_version (version) VALUES (2);
+"""
 
-                # Extract project path (cwd)
-                if 'cwd' in entry:
-                    session_data['project'] = entry['cwd']
+# Inverted index over ingested sessions (schema version 3): each
+# (kind, term) row holds one posting list for a file path or command token
+POSTINGS_DDL = """
+CREATE TABLE IF NOT EXISTS session_keys (
+    doc INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS session_postings (
+    kind TEXT NOT NULL,
+    term TEXT NOT NULL,
+    postings BLOB NOT NULL,
+    PRIMARY KEY (kind, term)
+) WITHOUT ROWID;
+"""
+POSTINGS_SCHEMA_VERSION = 3
+
+# Posting tool codes (stored as one byte per posting)
+POSTING_TOOLS = ('Edit', 'Write', 'Bash')
+
+# Command tokens worth indexing: words, flags and paths of 2+ characters
+_COMMAND_TOKEN = re.compile(r"[\w./@:+-]{2,}")
+
+# Sessions per executemany round trip during ingest
+INGEST_BATCH_SIZE = 500
+
+
+def default_index_path() -> str:
+    return os.path.expanduser('~/.claude/workspace/.index.db')
+
+
+def open_workspace_index(db_path: str) -> sqlite3.Connection:
+    """
+    Open the workspace index in WAL mode, migrating it to the session tables.
+
+    A missing index is created from workspace-schema.sql next to this script.
+    """
+    is_new = not os.path.exists(db_path)
+    schema_path = Path(__file__).parent / 'workspace-schema.sql'
+    if is_new and not schema_path.exists():
+        raise FileNotFoundError(f"Workspace index not found: {db_path}")
+
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    if is_new:
+        conn.executescript(schema_path.read_text())
+    conn.executescript(SESSION_INDEX_DDL)
+    conn.executescript(POSTINGS_DDL)
+
+    migrated = conn.execute('SELECT 1 FROM schema_version WHERE version = ?',
+                            (POSTINGS_SCHEMA_VERSION,)).fetchone()
+    if not migrated:
+        with conn:
+            rebuild_postings(conn)
+            conn.execute('INSERT OR IGNORE INTO schema_version (version) VALUES (?)',
+                         (POSTINGS_SCHEMA_VERSION,))
+    return conn
+
+
+def open_workspace_index_readonly(db_path: str) -> sqlite3.Connection:
+    """
+    Open the workspace index read-only for queries.
+
+    Never runs DDL or migrations; raises sqlite3.DatabaseError when the
+    index predates the posting lists (run ingest once to migrate it).
+    """
+    conn = sqlite3.connect(f"{Path(os.path.abspath(db_path)).as_uri()}?mode=ro", uri=True)
+    try:
+        version = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()[0]
+    except sqlite3.Error:
+        version = None
+    if version is None or version < POSTINGS_SCHEMA_VERSION:
+        conn.close()
+        raise sqlite3.DatabaseError(
+            f"schema version {version or 'unknown'} is older than {POSTINGS_SCHEMA_VERSION}; "
+            f"run 'handoff-parser.py ingest' to migrate it")
+    return conn
+
+
+def _session_rows(session_data: Dict[str, Any], transcript_path: str):
+    """Split one parse_transcript() result into sessions/files/commands rows."""
+    session_id = session_data['session_id']
+    files = session_data['files_modified']
+    summary = (f"{len(files)} files, {session_data['commands_total']} commands, "
+               f"{len(session_data['commits'])} commits, "
+               f"{len(session_data['tasks_completed'])} tasks completed")
+    metadata = {
+        'transcript': transcript_path,
+        'git_branch': session_data['git_branch'],
+        'duration_minutes': session_data['duration_minutes'],
+        'commands_total': session_data['commands_total'],
+        'commits': session_data['commits'],
+        'tasks_completed': session_data['tasks_completed'],
+    }
+
+    session_row = (session_id, session_data['project'], session_data['time_start'],
+                   session_data['time_end'], summary, json.dumps(metadata))
+    file_rows = [(session_id, op['path'], op['tool'], op.get('count'), op.get('line_count'))
+                 for op in files]
+    command_rows = [(session_id, seq, cmd['command'], cmd['description'], cmd['timestamp'])
+                    for seq, cmd in enumerate(session_data['commands_run'])]
+    return session_row, file_rows, command_rows
+
+
+def command_tokens(command: str) -> List[str]:
+    """Lower-cased index tokens of a shell command (program, flags, arguments)."""
+    return sorted({token.lower() for token in _COMMAND_TOKEN.findall(command)})
+
+
+def _session_terms(file_rows: Iterable[Tuple], commands: Iterable[str]) -> Dict[Tuple[str, str], Tuple[int, int]]:
+    """
+    Index terms of one session: (kind, term) -> (tool code, count).
+
+    file_rows are (path, tool, edit_count); a Write counts as one edit.
+    Command tokens count the session's commands containing them (ingest
+    stores every command, so early ones are indexed too).
+    """
+    terms: Dict[Tuple[str, str], Tuple[int, int]] = {}
+    for path, tool, edit_count in file_rows:
+        terms[('file', path)] = (POSTING_TOOLS.index(tool), edit_count or 1)
+
+    bash = POSTING_TOOLS.index('Bash')
+    for command in commands:
+        for token in command_tokens(command):
+            count = terms.get(('command', token), (bash, 0))[1]
+            terms[('command', token)] = (bash, count + 1)
+    return terms
+
+
+def _encode_varint(value: int, out: bytearray):
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def encode_postings(postings: Dict[int, Tuple[int, int]]) -> bytes:
+    """
+    Pack {doc: (tool code, count)} as a compact posting list.
+
+    Docs are written in ascending order as varint deltas, each followed
+    by a tool byte and a varint count, so a list costs ~3 bytes/session.
+    """
+    out = bytearray()
+    previous = 0
+    for doc in sorted(postings):
+        tool, count = postings[doc]
+        _encode_varint(doc - previous, out)
+        out.append(tool)
+        _encode_varint(count, out)
+        previous = doc
+    return bytes(out)
+
+
+def decode_postings(blob: bytes) -> Dict[int, Tuple[int, int]]:
+    """Inverse of encode_postings()."""
+    postings: Dict[int, Tuple[int, int]] = {}
+    doc = 0
+    pos = 0
+    end = len(blob)
+    while pos < end:
+        delta = shift = 0
+        while True:
+            byte = blob[pos]
+            pos += 1
+            delta |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        doc += delta
+
+        tool = blob[pos]
+        pos += 1
+
+        count = shift = 0
+        while True:
+            byte = blob[pos]
+            pos += 1
+            count |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        postings[doc] = (tool, count)
+    return postings
+
+
+def _session_doc(conn: sqlite3.Connection, session_id: str) -> int:
+    conn.execute('INSERT OR IGNORE INTO session_keys (session_id) VALUES (?)', (session_id,))
+    return conn.execute('SELECT doc FROM session_keys WHERE session_id = ?', (session_id,)).fetchone()[0]
+
+
+def _apply_postings(conn: sqlite3.Connection, changes: Dict[Tuple[str, str], Dict[int, Optional[Tuple[int, int]]]]):
+    """Merge {(kind, term): {doc: posting or None to remove}} into stored posting lists."""
+    for kind, term in sorted(changes):
+        row = conn.execute('SELECT postings FROM session_postings WHERE kind = ? AND term = ?',
+                           (kind, term)).fetchone()
+        postings = decode_postings(row[0]) if row else {}
+        for doc, posting in changes[(kind, term)].items():
+            if posting is None:
+                postings.pop(doc, None)
+            else:
+                postings[doc] = posting
+
+        if postings:
+            conn.execute('INSERT OR REPLACE INTO session_postings (kind, term, postings) VALUES (?, ?, ?)',
+                         (kind, term, encode_postings(postings)))
+        elif row:
+            conn.execute('DELETE FROM session_postings WHERE kind = ? AND term = ?', (kind, term))
+
+
+def _update_postings(conn: sqlite3.Connection, pending: Dict[str, Tuple]):
+    """Re-index pending sessions, dropping terms from their previous ingest."""
+    changes: Dict[Tuple[str, str], Dict[int, Optional[Tuple[int, int]]]] = {}
+
+    for session_id, (_, file_rows, command_rows) in pending.items():
+        doc = _session_doc(conn, session_id)
+
+        old_files = conn.execute('SELECT path, tool, edit_count FROM session_files WHERE session_id = ?',
+                                 (session_id,)).fetchall()
+        old_commands = [row[0] for row in conn.execute(
+            'SELECT command FROM session_commands WHERE session_id = ?', (session_id,))]
+        for key in _session_terms(old_files, old_commands):
+            changes.setdefault(key, {})[doc] = None
+
+        new_terms = _session_terms([row[1:4] for row in file_rows], [row[2] for row in command_rows])
+        for key, posting in new_terms.items():
+            changes.setdefault(key, {})[doc] = posting
+
+    _apply_postings(conn, changes)
+
+
+def rebuild_postings(conn: sqlite3.Connection):
+    """Rebuild the inverted index from session_files/session_commands (migration)."""
+    conn.execute('DELETE FROM session_postings')
+    files: Dict[str, List[Tuple]] = {}
+    for session_id, path, tool, edit_count in conn.execute(
+            'SELECT session_id, path, tool, edit_count FROM session_files'):
+        files.setdefault(session_id, []).append((path, tool, edit_count))
+    commands: Dict[str, List[str]] = {}
+    for session_id, command in conn.execute('SELECT session_id, command FROM session_commands ORDER BY seq'):
+        commands.setdefault(session_id, []).append(command)
+
+    changes: Dict[Tuple[str, str], Dict[int, Optional[Tuple[int, int]]]] = {}
+    ordered = conn.execute('SELECT id FROM sessions ORDER BY started_at').fetchall()
+    for (session_id,) in ordered:
+        if session_id not in files and session_id not in commands:
+            continue
+        doc = _session_doc(conn, session_id)
+        for key, posting in _session_terms(files.get(session_id, []), commands.get(session_id, [])).items():
+            changes.setdefault(key, {})[doc] = posting
+
+    _apply_postings(conn, changes)
+
+
+def lookup_postings(conn: sqlite3.Connection, kind: str, term: str,
+                    prefix: bool = False) -> List[Dict[str, Any]]:
+    """
+    Sessions indexed under a file path or command token, newest first.
+
+    With prefix, every term starting with `term` matches (e.g. a
+    directory); a session then appears once per matching term.
+    """
+    if prefix:
+        rows = conn.execute('SELECT term, postings FROM session_postings '
+                            'WHERE kind = ? AND term >= ? AND term < ?',
+                            (kind, term, term + '\U0010ffff')).fetchall()
+    else:
+        rows = conn.execute('SELECT term, postings FROM session_postings WHERE kind = ? AND term = ?',
+                            (kind, term)).fetchall()
+
+    hits = [(doc, matched, tool, count)
+            for matched, blob in rows
+            for doc, (tool, count) in decode_postings(blob).items()]
+
+    sessions: Dict[int, Tuple] = {}
+    docs = sorted({hit[0] for hit in hits})
+    # Stay under SQLite's bound-parameter limit
+    for i in range(0, len(docs), 900):
+        batch = docs[i:i + 900]
+        sessions.update((row[0], row[1:]) for row in conn.execute(
+            f"SELECT k.doc, k.session_id, s.ended_at, s.project_path FROM session_keys k "
+            f"JOIN sessions s ON s.id = k.session_id WHERE k.doc IN ({','.join('?' * len(batch))})",
+            batch))
+
+    results = []
+    for doc, matched, tool, count in hits:
+        if doc not in sessions:
+            continue
+        session_id, timestamp, project = sessions[doc]
+        results.append({
+            'session_id': session_id,
+            'timestamp': timestamp,
+            'tool': POSTING_TOOLS[tool],
+            'count': count,
+            'term': matched,
+            'project': project,
+        })
+    results.sort(key=lambda result: result['timestamp'] or '', reverse=True)
+    return results
+
+
+def _flush_ingest(conn: sqlite3.Connection, pending: Dict[str, Tuple]):
+    sessions = [rows[0] for rows in pending.values()]
+    files = [row for rows in pending.values() for row in rows[1]]
+    commands = [row for rows in pending.values() for row in rows[2]]
+
+    # Needs the previous child rows, so runs before they are replaced
+    _update_postings(conn, pending)
+
+    # Replace child rows wholesale: a re-parse supersedes the previous one
+    ids = [(session_id,) for session_id in pending]
+    conn.executemany('DELETE FROM session_files WHERE session_id = ?', ids)
+    conn.executemany('DELETE FROM session_commands WHERE session_id = ?', ids)
+
+    # Keep any manually written summary; only fill it when empty
+    conn.executemany("""
+        INSERT INTO sessions (id, project_path, started_at, ended_at, summary, metadata)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            project_path = excluded.project_path,
+            started_at = excluded.started_at,
+            ended_at = excluded.ended_at,
+            summary = COALESCE(sessions.summary, excluded.summary),
+            metadata = excluded.metadata
+    """, sessions)
+    conn.executemany("""
+        INSERT OR REPLACE INTO session_files (session_id, path, tool, edit_count, line_count)
+        VALUES (?, ?, ?, ?, ?)
+    """, files)
+    conn.executemany("""
+        INSERT INTO session_commands (session_id, seq, command, description, timestamp)
+        VALUES (?, ?, ?, ?, ?)
+    """, commands)
+
+
+def ingest_sessions(conn: sqlite3.Connection, records: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
+    """
+    Upsert batch records into the workspace index in one transaction.
+
+    Returns (ingested, skipped). Failed parses and sessions without a
+    start timestamp (sessions.started_at is NOT NULL) are skipped.
+    """
+    ingested = 0
+    skipped = 0
+    # session_id -> rows; a later transcript for the same session wins
+    pending: Dict[str, Tuple] = {}
 
-                # Look for content blocks with tool uses
-                if 'content' in entry and isinstance(entry['content'], list):
-                    for block in entry['content']:
-                        if not isinstance(block, dict):
-                            continue
-
-                        # Extract file operations (Edit/Write)
-                        if block.get('type') == 'tool_use':
-                            tool_name = block.get('name')
-                            tool_input = block.get('input', {})
-
-                            if tool_name == 'Edit':
-                                file_path = tool_input.get('file_path')
-                                if file_path:
-                                    if file_path not in file_operations:
-                                        file_operations[file_path] = {
-                                            'path': file_path,
-                                            'tool': 'Edit',
-                                            'count': 0
-                                        }
-                                    file_operations[file_path]['count'] += 1
-
-                            elif tool_name == 'Write':
-                                file_path = tool_input.get('file_path')
-                                content = tool_input.get('content', '')
-                                if file_path:
-                                    file_operations[file_path] = {
-                                        'path': file_path,
-                                        'tool': 'Write',
-                                        'line_count': len(content.split('\n'))
-                                    }
-
-                            # Extract bash commands
-                            elif tool_name == 'Bash':
-                                command = tool_input.get('command')
-                                description = tool_input.get('description', '')
-                                if command:
-                                    # Extract git commits
-                                    if 'git commit' in command:
-                                        session_data['commits'].append({
-                                            'command': command,
-                                            'timestamp': entry.get('timestamp', '')
-                                        })
-
-                                    # Track git branch
-                                    if command.startswith('git branch --show-current') or \
-                                       command.startswith('git rev-parse --abbrev-ref HEAD'):
-                                        # Branch detection command
-                                        pass
-
-                                    session_data['commands_run'].append({
-                                        'command': command,
-                                        'description': description,
-                                        'timestamp': entry.get('timestamp', '')
-                                    })
-
-                            # Extract task completions
-                            elif tool_name == 'TaskUpdate':
-                                if tool_input.get('status') == 'completed':
-                                    task_id = tool_input.get('taskId')
-                                    session_data['tasks_completed'].append({
-                                        'id': task_id,
-                                        'timestamp': entry.get('timestamp', '')
-                                    })
-
-                        # Extract tool results for git branch
-                        elif block.get('type') == 'tool_result':
-                            content = block.get('content')
-                            if isinstance(content, str) and content.strip():
-                                # Check if this looks like a branch name
-                                if '\n' not in content and len(content) < 100 and '/' in content:
-                                    # Could be a branch name
-                                    if session_data['git_branch'] == 'unknown':
-                                        session_data['git_branch'] = content.strip()
-
-            except json.JSONDecodeError:
-                # Skip malformed lines
-                print(f"Warning: Skipping malformed line {line_num}", file=sys.stderr)
+    with conn:
+        for record in records:
+            if record['status'] != 'ok':
+                print(f"Error: {record['transcript']}: {record['error']}", file=sys.stderr)
+                skipped += 1
                 continue
-            except Exception as e:
-                print(f"Warning: Error processing line {line_num}: {e}", file=sys.stderr)
+            if not record['time_start']:
+                print(f"Warning: {record['transcript']}: no timestamps, not ingested", file=sys.stderr)
+                skipped += 1
                 continue
 
-        # Convert file_operations dict to list
-        session_data['files_modified'] = list(file_operations.values())
+            pending[record['session_id']] = _session_rows(record, record['transcript'])
+            ingested += 1
 
-        # Calculate duration
-        if session_data['time_start'] and session_data['time_end']:
-            try:
-                start = datetime.fromisoformat(session_data['time_start'].replace('Z', '+00:00'))
-                end = datetime.fromisoformat(session_data['time_end'].replace('Z', '+00:00'))
-                duration = end - start
-                session_data['duration_minutes'] = int(duration.total_seconds() / 60)
-            except Exception as e:
-                print(f"Warning: Could not calculate duration: {e}", file=sys.stderr)
+            if len(pending) >= INGEST_BATCH_SIZE:
+                _flush_ingest(conn, pending)
+                pending = {}
 
-        # Extract session ID from transcript filename if not found
-        if session_data['session_id'] == 'unknown':
-            session_data['session_id'] = Path(transcript_path).stem
+        if pending:
+            _flush_ingest(conn, pending)
 
-    except FileNotFoundError:
-        print(f"Error: Transcript not found: {transcript_path}", file=sys.stderr)
-    except Exception as e:
-        print(f"Error: Failed to parse transcript: {e}", file=sys.stderr)
+    return ingested, skipped
 
-    return session_data
+
+def ingest_main(argv: List[str]):
+    parser = argparse.ArgumentParser(
+        prog='handoff-parser.py ingest',
+        description='Parse transcripts and upsert them into the workspace SQLite index'
+    )
+    parser.add_argument('inputs', nargs='+', help='Transcript files, directories or glob patterns')
+    parser.add_argument('--db', default=default_index_path(),
+                        help='Workspace index database (default: %(default)s)')
+    parser.add_argument('-j', '--jobs', type=int, default=0, help='Worker processes (default: CPU count)')
+    parser.add_argument('--decode', choices=sorted(DECODERS), default='full',
+                        help='Line decoding strategy (default: full)')
+
+    args = parser.parse_args(argv)
+
+    paths = expand_transcript_paths(args.inputs)
+    if not paths:
+        print("Error: No transcripts matched", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        conn = open_workspace_index(args.db)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error: Could not open workspace index: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        # session_commands holds the full history, not the handoff's recent commands
+        records = iter_batch(paths, args.jobs, ordered=False, decoder=args.decode, commands_limit=None)
+        ingested, skipped = ingest_sessions(conn, records)
+    finally:
+        conn.close()
+
+    print(f"Ingested {ingested}/{len(paths)} sessions into {args.db}", file=sys.stderr)
+    if skipped:
+        sys.exit(1)
+
+
+def lookup_main(argv: List[str]):
+    parser = argparse.ArgumentParser(
+        prog='handoff-parser.py lookup',
+        description='Find ingested sessions that touched a file or ran a command token'
+    )
+    parser.add_argument('term', help='File path (default) or command token')
+    parser.add_argument('--command', action='store_true', help='Look up a command token instead of a file')
+    parser.add_argument('--prefix', action='store_true',
+                        help='Match every indexed term starting with TERM (e.g. a directory)')
+    parser.add_argument('-n', '--limit', type=int, default=50, help='Most recent N hits (0 for all, default: 50)')
+    parser.add_argument('--db', default=default_index_path(),
+                        help='Workspace index database (default: %(default)s)')
+    parser.add_argument('--json', action='store_true', help='Print JSON lines instead of a table')
+
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Error: Workspace index not found: {args.db}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command:
+        kind, term = 'command', args.term.lower()
+    else:
+        kind, term = 'file', os.path.abspath(os.path.expanduser(args.term))
+        if args.prefix and args.term.endswith('/'):
+            term += '/'
+
+    try:
+        conn = open_workspace_index_readonly(args.db)
+        try:
+            results = lookup_postings(conn, kind, term, args.prefix)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"Error: Could not query workspace index: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.limit:
+        results = results[:args.limit]
+    for result in results:
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(f"{result['timestamp'] or '-':<26} {result['session_id']:<38} "
+                  f"{result['tool']:<6} {result['count']:>4}  {result['term']}")
+
+    if not results:
+        print(f"No sessions found for {kind} {term}", file=sys.stderr)
+        sys.exit(1)
+
+
+# Follow mode polling: back off from FOLLOW_POLL_MIN to FOLLOW_POLL_MAX while idle
+FOLLOW_POLL_MIN = 0.25
+FOLLOW_POLL_MAX = 5.0
 
 
-def generate_handoff_skeleton(session_data: Dict[str, Any], template_path: str, output_path: str):
+def _write_atomic(output_path: str, text: str):
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, output_path)
+
+
+def follow_transcript(transcript_path: str, output_path: Optional[str] = None,
+                      decoder: str = 'full', fields: Optional[Iterable[str]] = None,
+                      debounce: float = 2.0, max_wait: float = 10.0):
     """
-    Fill handoff template with auto-generated data.
-    Leaves manual-input fields with PLACEHOLDER markers.
+    Tail a live transcript and refresh its handoff as lines are appended.
+
+    Polls os.stat() with exponential backoff while the file is idle and
+    only decodes newly appended complete lines. Output is debounced: it
+    is refreshed once the file has been quiet for `debounce` seconds, or
+    after `max_wait` seconds of continuous activity. With output_path,
+    the handoff skeleton is rewritten atomically when its text changes;
+    otherwise one JSON line of changed fields is printed per refresh.
+    A truncated or replaced file is re-read from the start.
+
+    Runs until interrupted (SIGINT/SIGTERM), flushing pending changes.
+    Compressed transcripts are archives, not live files, and are rejected.
     """
+    if os.path.exists(transcript_path) and detect_compression(transcript_path):
+        raise ValueError("--follow needs a plain (uncompressed) transcript")
+
+    decode = DECODERS[decoder]
+    plan = ExtractionPlan(fields)
+    template_path = str(Path(__file__).parent / 'handoff.md.template')
+
+    cursor = TranscriptCursor()
+    reducer = SessionReducer()
+    identity = None
+    last_emitted: Any = None
+    dirty_since: Optional[float] = None
+    last_change = 0.0
+    interval = FOLLOW_POLL_MIN
+
+    def emit():
+        nonlocal last_emitted
+        session_data = plan.select(finalize_session_data(reducer.session_data(), transcript_path))
+
+        if output_path:
+            handoff = render_handoff(session_data, load_template(template_path))
+            if handoff != last_emitted:
+                _write_atomic(output_path, handoff)
+                last_emitted = handoff
+            return
+
+        previous = last_emitted or {}
+        delta = {key: value for key, value in session_data.items() if previous.get(key) != value}
+        if delta or last_emitted is None:
+            print(json.dumps(delta), flush=True)
+        last_emitted = copy.deepcopy(session_data)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
 
     try:
-        with open(template_path, 'r') as f:
-            template = f.read()
-
-        # Format files modified
-        files_list = []
-        for file_info in session_data['files_modified']:
-            if 'line_count' in file_info:
-                files_list.append(f"- {file_info['path']} ({file_info['tool']}, {file_info['line_count']} lines)")
-            else:
-                files_list.append(f"- {file_info['path']} ({file_info['tool']}, {file_info.get('count', 1)} edits)")
-        files_modified = '\n'.join(files_list) if files_list else '(none)'
-
-        # Format commands (limit to last 20)
-        commands = []
-        for cmd in session_data['commands_run'][-20:]:
-            if cmd['description']:
-                commands.append(f"# {cmd['description']}")
-            commands.append(cmd['command'])
-            commands.append('')
-        commands_run = '\n'.join(commands) if commands else '(none)'
-
-        # Format tasks completed
-        completed_tasks = []
-        for task in session_data['tasks_completed']:
-            completed_tasks.append(f"- Task {task['id']}")
-        completed = '\n'.join(completed_tasks) if completed_tasks else '(none)'
-
-        # Format commits
-        commits_list = []
-        for commit in session_data['commits']:
-            commits_list.append(f"- {commit['command']}")
-        commits_str = '\n'.join(commits_list) if commits_list else '[]'
-
-        # Format date/time
-        if session_data['time_start']:
+        while True:
+            now = time.monotonic()
             try:
-                dt = datetime.fromisoformat(session_data['time_start'].replace('Z', '+00:00'))
-                date_str = dt.strftime('%Y-%m-%d')
-                time_start_str = dt.strftime('%H:%M')
-            except:
-                date_str = datetime.now().strftime('%Y-%m-%d')
-                time_start_str = 'unknown'
-        else:
-            date_str = datetime.now().strftime('%Y-%m-%d')
-            time_start_str = 'unknown'
+                stat = os.stat(transcript_path)
+            except FileNotFoundError:
+                stat = None
+
+            if stat is not None:
+                if (stat.st_dev, stat.st_ino) != identity or stat.st_size < cursor.offset:
+                    if identity is not None:
+                        print("Warning: Transcript was replaced or truncated, re-reading", file=sys.stderr)
+                    identity = (stat.st_dev, stat.st_ino)
+                    cursor = TranscriptCursor()
+                    reducer = SessionReducer()
+
+                if stat.st_size > cursor.offset:
+                    consumed = cursor.offset
+                    warnings = LineWarnings()
+                    _feed_lines(reducer, read_lines(transcript_path, cursor), decode, plan, warnings)
+                    warnings.report(transcript_path)
+                    if cursor.offset > consumed:
+                        if dirty_since is None:
+                            dirty_since = now
+                        last_change = now
+                        interval = FOLLOW_POLL_MIN
+
+            if dirty_since is not None and (now - last_change >= debounce or now - dirty_since >= max_wait):
+                emit()
+                dirty_since = None
+
+            if dirty_since is None:
+                time.sleep(interval)
+                interval = min(interval * 2, FOLLOW_POLL_MAX)
+            else:
+                time.sleep(min(interval, max(0.0, last_change + debounce - time.monotonic())) or FOLLOW_POLL_MIN)
+
+    except KeyboardInterrupt:
+        if dirty_since is not None:
+            emit()
+
+
+def default_socket_path() -> str:
+    """Daemon socket path (handoff-client.py resolves the same way)."""
+    if os.environ.get('HANDOFF_PARSER_SOCKET'):
+        return os.environ['HANDOFF_PARSER_SOCKET']
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or '/tmp'
+    return os.path.join(runtime_dir, f"handoff-parser-{os.getuid()}.sock")
+
+
+class _ThreadLocalStream:
+    """Stand-in for sys.stdout/sys.stderr that captures writes per thread."""
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+
+    def capture(self) -> io.StringIO:
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
 
-        if session_data['time_end']:
+    def release(self):
+        self._local.buffer = None
+
+    def write(self, text: str) -> int:
+        return (getattr(self._local, 'buffer', None) or self._default).write(text)
+
+    def flush(self):
+        (getattr(self._local, 'buffer', None) or self._default).flush()
+
+    def __getattr__(self, name):
+        return getattr(self._default, name)
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    """One newline-terminated JSON request in, one JSON response out."""
+
+    def handle(self):
+        self.server.begin_request()
+        try:
             try:
-                dt = datetime.fromisoformat(session_data['time_end'].replace('Z', '+00:00'))
-                time_end_str = dt.strftime('%H:%M')
-            except:
-                time_end_str = 'unknown'
-        else:
-            time_end_str = 'unknown'
+                request = json.loads(self.rfile.readline())
+                response = self.server.run_request(request)
+            except (ValueError, AttributeError) as e:
+                response = {'status': 'error', 'error': f"Bad request: {e}"}
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+        finally:
+            self.server.end_request()
 
-        # Fill template
-        handoff = template.format(
-            session_id=session_data['session_id'],
-            date=date_str,
-            time_start=time_start_str,
-            time_end=time_end_str,
-            duration_minutes=session_data['duration_minutes'],
-            project=session_data['project'],
-            topic='[MANUAL: Enter topic/focus]',
-            tags='[]',
-            git_branch=session_data['git_branch'],
-            commits=commits_str,
-            title='[MANUAL: Enter title]',
-            summary='[MANUAL: 1-2 sentence summary of what was accomplished]',
-            completed=completed,
-            in_progress='[MANUAL: What work is partially complete?]',
-            next_steps='[MANUAL: What should be done next?]\n1. \n2. \n3. ',
-            blockers='[MANUAL: What is blocking progress?]',
-            decisions='[MANUAL: What decisions were made and why?]',
-            files_modified=files_modified,
-            commands_run=commands_run,
-            context_notes='[MANUAL: Any other context worth preserving?]'
-        )
-
-        with open(output_path, 'w') as f:
-            f.write(handoff)
 
-        print(f"Handoff skeleton written to: {output_path}", file=sys.stderr)
+class HandoffDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Long-lived handoff-parser serving CLI invocations over a Unix socket.
 
-    except FileNotFoundError:
-        print(f"Error: Template not found: {template_path}", file=sys.stderr)
-    except Exception as e:
-        print(f"Error: Failed to generate handoff: {e}", file=sys.stderr)
+    Requests are {"argv": [...], "cwd": "..."} and run exactly as the
+    command line would, with stdout/stderr captured and returned. The
+    handoff template and per-transcript checkpoints stay in memory, so a
+    repeated request only parses appended lines. Subcommands, --jobs,
+    --follow, --profile and --trace-memory get {"status": "fallback"} so
+    the client runs them directly.
+    """
 
+    daemon_threads = True
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: handoff-parser.py <transcript_path> [output_path]", file=sys.stderr)
-        sys.exit(1)
+    def __init__(self, socket_path: str, idle_timeout: float):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.active = 0
+        self.last_activity = time.monotonic()
+        self.state_lock = threading.Lock()
+        self.transcript_locks: Dict[str, threading.Lock] = {}
 
-    transcript_path = sys.argv[1]
-    output_path = sys.argv[2] if len(sys.argv) > 2 else None
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _DaemonHandler)
+        finally:
+            os.umask(old_umask)
 
-    # Parse transcript
-    session_data = parse_transcript(transcript_path)
+    def begin_request(self):
+        with self.state_lock:
+            self.active += 1
+            self.last_activity = time.monotonic()
+
+    def end_request(self):
+        with self.state_lock:
+            self.active -= 1
+            self.last_activity = time.monotonic()
+
+    def transcript_lock(self, transcript_path: str) -> threading.Lock:
+        with self.state_lock:
+            return self.transcript_locks.setdefault(os.path.abspath(transcript_path), threading.Lock())
+
+    def run_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        argv = [str(arg) for arg in request.get('argv') or []]
+        cwd = request.get('cwd') or os.getcwd()
+        if not argv or argv[0] in SUBCOMMANDS:
+            return {'status': 'fallback'}
+
+        parser = build_parser()
+        stdout = sys.stdout.capture()
+        stderr = sys.stderr.capture()
+        exit_code = 0
+        try:
+            args = parser.parse_intermixed_args(argv)
+            # cProfile and tracemalloc are process-wide, so they cannot run per thread
+            if args.jobs > 1 or args.follow or args.profile or args.trace_memory:
+                return {'status': 'fallback'}
+
+            # Resolve paths against the client's working directory
+            args.transcript_path = os.path.join(cwd, os.path.expanduser(args.transcript_path))
+            if args.output_path and args.output_path != '/dev/null':
+                args.output_path = os.path.join(cwd, os.path.expanduser(args.output_path))
+            if args.checkpoint:
+                args.checkpoint = os.path.join(cwd, os.path.expanduser(args.checkpoint))
+            if args.stats:
+                args.stats = os.path.join(cwd, os.path.expanduser(args.stats))
+
+            with self.transcript_lock(args.transcript_path):
+                run_cli(parser, args)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            sys.stdout.release()
+            sys.stderr.release()
+
+        return {
+            'status': 'ok',
+            'exit_code': exit_code,
+            'stdout': stdout.getvalue(),
+            'stderr': stderr.getvalue()
+        }
+
+    def watch_idle(self):
+        """Shut the server down once it has been idle for idle_timeout."""
+        while True:
+            time.sleep(min(self.idle_timeout, 5.0))
+            with self.state_lock:
+                idle = self.active == 0 and time.monotonic() - self.last_activity >= self.idle_timeout
+            if idle:
+                self.shutdown()
+                return
+
+
+def _socket_in_use(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def serve_main(argv: List[str]):
+    global _checkpoint_cache
+
+    parser = argparse.ArgumentParser(
+        prog='handoff-parser.py serve',
+        description='Serve handoff-parser requests over a Unix socket (see handoff-client.py)'
+    )
+    parser.add_argument('--socket', default=default_socket_path(),
+                        help='Unix socket path (default: %(default)s)')
+    parser.add_argument('--idle-timeout', type=float, default=600,
+                        help='Exit after this many idle seconds (default: %(default)s)')
+
+    args = parser.parse_args(argv)
 
-    if output_path == '/dev/null':
-        # Print JSON to stdout
+    if os.path.exists(args.socket):
+        if _socket_in_use(args.socket):
+            print(f"Error: A daemon is already listening on {args.socket}", file=sys.stderr)
+            sys.exit(1)
+        os.unlink(args.socket)
+
+    _checkpoint_cache = OrderedDict()
+    sys.stdout = _ThreadLocalStream(sys.stdout)
+    sys.stderr = _ThreadLocalStream(sys.stderr)
+
+    server = HandoffDaemon(args.socket, args.idle_timeout)
+    threading.Thread(target=server.watch_idle, daemon=True).start()
+
+    def stop(signum, frame):
+        # shutdown() waits for serve_forever(), which this (main) thread is running
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    print(f"Listening on {args.socket}", file=sys.stderr)
+
+    try:
+        server.serve_forever(poll_interval=0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+        print("Daemon stopped", file=sys.stderr)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='handoff-parser.py',
+        description='Extract session data from Claude Code JSONL transcripts'
+    )
+    parser.add_argument('transcript_path', help='JSONL session transcript')
+    parser.add_argument('output_path', nargs='?',
+                        help='Write handoff skeleton here (/dev/null or omitted prints JSON)')
+    parser.add_argument('--checkpoint', nargs='?', const='', metavar='PATH',
+                        help='Resume from and update a checkpoint sidecar '
+                             '(default: <transcript>.checkpoint.json)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Split large transcripts across N worker processes (default: 1)')
+    parser.add_argument('--decode', choices=sorted(DECODERS), default='full',
+                        help="Line decoding: 'fast' skips json.loads on lines without tool blocks, "
+                             "'verify' cross-checks fast against full (default: full)")
+    parser.add_argument('--fields', type=parse_fields_arg,
+                        help='Comma-separated fields to extract, e.g. duration_minutes,files_modified '
+                             '(JSON output only)')
+    parser.add_argument('--summary', action='store_true',
+                        help=f"Only read the head and tail of the file for {', '.join(SUMMARY_FIELDS)}")
+    parser.add_argument('--follow', action='store_true',
+                        help='Keep tailing the transcript, refreshing the handoff skeleton '
+                             '(or printing JSON deltas) as lines are appended')
+    parser.add_argument('--debounce', type=float, default=2.0,
+                        help='Follow mode: seconds of quiet before refreshing output (default: %(default)s)')
+    parser.add_argument('--stats', nargs='?', const='', metavar='PATH',
+                        help='Report phase timings, line/byte/tool block counts, malformed lines and '
+                             'peak RSS to stderr (or as JSON to PATH)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='With --stats, also report the tracemalloc peak (tracing slows the run several-fold)')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='Write a cProfile dump of the run to PATH (view with python3 -m pstats)')
+    return parser
+
+
+def run_cli(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    """Run a single-transcript invocation (shared by main() and the daemon)."""
+    if args.jobs > 1 and args.checkpoint is not None:
+        parser.error('--jobs cannot be combined with --checkpoint')
+    if (args.fields or args.summary) and args.output_path and args.output_path != '/dev/null':
+        parser.error('--fields/--summary only apply to JSON output, not handoff skeletons')
+    if args.summary and (args.fields or args.checkpoint is not None or args.jobs > 1):
+        parser.error('--summary cannot be combined with --fields, --checkpoint or --jobs')
+    if args.follow and (args.summary or args.checkpoint is not None or args.jobs > 1):
+        parser.error('--follow cannot be combined with --summary, --checkpoint or --jobs')
+    if (args.stats is not None or args.profile) and (args.summary or args.follow):
+        parser.error('--stats/--profile cannot be combined with --summary or --follow')
+    if args.trace_memory and args.stats is None:
+        parser.error('--trace-memory requires --stats')
+
+    transcript_path = args.transcript_path
+    output_path = args.output_path
+
+    if args.summary:
+        try:
+            session_data = summarize_transcript(transcript_path)
+        except FileNotFoundError:
+            print(f"Error: Transcript not found: {transcript_path}", file=sys.stderr)
+            sys.exit(1)
+        except Exception as e:
+            print(f"Error: Failed to summarize transcript: {e}", file=sys.stderr)
+            sys.exit(1)
         print(json.dumps(session_data, indent=2))
-    elif output_path:
+        return
+
+    if args.follow:
+        if output_path == '/dev/null':
+            output_path = None
+        try:
+            follow_transcript(transcript_path, output_path, args.decode, args.fields,
+                              args.debounce, max_wait=max(10.0, args.debounce * 5))
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    checkpoint_path = args.checkpoint
+    if checkpoint_path == '':
+        checkpoint_path = default_checkpoint_path(transcript_path)
+
+    stats = ParseStats() if args.stats is not None else None
+    profiler = cProfile.Profile() if args.profile else None
+    started = time.perf_counter()
+    if args.trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+
+    # Parse transcript
+    session_data = parse_transcript(transcript_path, checkpoint_path, args.jobs, args.decode, args.fields, stats)
+
+    if output_path and output_path != '/dev/null':
         # Generate handoff skeleton
         template_path = Path(__file__).parent / 'handoff.md.template'
-        generate_handoff_skeleton(session_data, str(template_path), output_path)
+        generate_handoff_skeleton(session_data, str(template_path), output_path, stats)
     else:
-        # Print JSON to stdout (default)
-        print(json.dumps(session_data, indent=2))
+        # Print JSON to stdout (default, or output_path /dev/null)
+        with _stats_phase(stats, 'render'):
+            text = json.dumps(session_data, indent=2)
+        with _stats_phase(stats, 'write'):
+            print(text)
+
+    if profiler is not None:
+        profiler.disable()
+        try:
+            profiler.dump_stats(args.profile)
+            print(f"Profile written to: {args.profile}", file=sys.stderr)
+        except OSError as e:
+            print(f"Warning: Could not write profile {args.profile}: {e}", file=sys.stderr)
+
+    if stats is not None:
+        write_stats(stats, transcript_path, args.stats, time.perf_counter() - started)
+
+
+def write_stats(stats: ParseStats, transcript_path: str, stats_path: str, wall_seconds: float):
+    """Finish a --stats run: add wall time and memory peaks, then report or save JSON."""
+    stats.extra['wall_seconds'] = round(wall_seconds, 6)
+    if tracemalloc.is_tracing() and tracemalloc.get_traced_memory()[1]:
+        stats.extra['tracemalloc_peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    if resource is not None:
+        usage = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                    resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+        stats.extra['peak_rss_kb'] = usage
+
+    if not stats_path:
+        stats.report(transcript_path)
+        return
+
+    try:
+        with open(stats_path, 'w') as f:
+            json.dump({'transcript': transcript_path, **stats.to_dict()}, f, indent=2)
+            f.write('\n')
+        print(f"Stats written to: {stats_path}", file=sys.stderr)
+    except OSError as e:
+        print(f"Warning: Could not write stats {stats_path}: {e}", file=sys.stderr)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        SUBCOMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+
+    parser = build_parser()
+    run_cli(parser, parser.parse_intermixed_args())
+
+
+SUBCOMMANDS = {
+    'batch': batch_main,
+    'serve': serve_main,
+    'ingest': ingest_main,
+    'lookup': lookup_main,
+}
 
 
 if __name__ == '__main__':
@@ -4,6 +4,8 @@ CREATE TABLE schema_version (
     applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 INSERT INTO schema_version (version) VALUES (1);
+INSERT INTO schema_version (version) VALUES (2);
+INSERT INTO schema_version (version) VALUES (3);
 
 -- Core artifacts table
 CREATE TABLE artifacts (
@@ -44,6 +46,43 @@ CREATE TABLE sessions (
     metadata TEXT
 );
 
+-- Files touched per session (populated by handoff-parser.py ingest)
+CREATE TABLE session_files (
+    session_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    edit_count INTEGER,
+    line_count INTEGER,
+    PRIMARY KEY (session_id, path),
+    FOREIGN KEY (session_id) REFERENCES sessions(id)
+);
+
+-- All commands run in each session (populated by handoff-parser.py ingest)
+CREATE TABLE session_commands (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    command TEXT NOT NULL,
+    description TEXT,
+    timestamp TEXT,
+    PRIMARY KEY (session_id, seq),
+    FOREIGN KEY (session_id) REFERENCES sessions(id)
+);
+
+-- Inverted index: file path / command token -> posting list of sessions.
+-- postings packs ascending session_keys.doc deltas, tool codes and counts
+-- (see encode_postings() in handoff-parser.py)
+CREATE TABLE session_keys (
+    doc INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE session_postings (
+    kind TEXT NOT NULL,
+    term TEXT NOT NULL,
+    postings BLOB NOT NULL,
+    PRIMARY KEY (kind, term)
+) WITHOUT ROWID;
+
 -- Symlinks tracking
 CREATE TABLE symlinks (
     id TEXT PRIMARY KEY,
@@ -70,4 +109,7 @@ CREATE INDEX idx_artifacts_status ON artifacts(status);
 CREATE INDEX idx_artifacts_session ON artifacts(source_session);
 CREATE INDEX idx_sessions_project ON sessions(project_path);
 CREATE INDEX idx_sessions_ended ON sessions(ended_at DESC);
+CREATE INDEX idx_sessions_started ON sessions(started_at DESC);
+CREATE INDEX idx_session_files_path ON session_files(path, session_id);
+CREATE INDEX idx_session_commands_command ON session_commands(command);
 CREATE INDEX idx_symlinks_artifact ON symlinks(artifact_id);
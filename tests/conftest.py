@@ -0,0 +1,42 @@
+"""Fixtures loading the hyphen-named scripts under test as modules."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_script(name, relative_path):
+    """Import a script that is not a valid module name, registered as `name`."""
+    spec = importlib.util.spec_from_file_location(name, ROOT / relative_path)
+    module = importlib.util.module_from_spec(spec)
+    # pickle looks classes up by module name
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def handoff_parser():
+    return load_script('handoff_parser', 'templates/handoff-parser.py')
+
+
+@pytest.fixture(scope='session')
+def handoff_bench():
+    return load_script('handoff_bench', 'templates/handoff-bench.py')
+
+
+@pytest.fixture(scope='session')
+def form_gen():
+    return load_script('form_gen', 'tools/form-gen.py')
+
+
+@pytest.fixture(scope='session')
+def transcript(tmp_path_factory, handoff_bench):
+    """Seeded synthetic transcript (~2 MB) with every tool kind and some malformed lines."""
+    path = tmp_path_factory.mktemp('transcripts') / 'session.jsonl'
+    handoff_bench.generate_transcript(str(path), 2 * 1024 * 1024, seed=7, malformed_rate=0.01)
+    return path
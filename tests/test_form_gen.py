@@ -0,0 +1,167 @@
+"""Cache, dependency graph and asset optimization checks for tools/form-gen.py."""
+
+import pytest
+import yaml
+
+
+def _write_form(path, questions, title='Test Form'):
+    path.write_text(yaml.safe_dump({'title': title, 'sections': [{'name': 'Main', 'questions': questions}]}))
+    return path
+
+
+def _text(q_id, **extra):
+    return {'id': q_id, 'title': q_id.title(), 'type': 'text', **extra}
+
+
+# Compiled IR cache
+
+class _CompileCounter:
+    def __init__(self, compile_config):
+        self.compile_config = compile_config
+        self.calls = 0
+
+    def __call__(self, config):
+        self.calls += 1
+        return self.compile_config(config)
+
+
+@pytest.fixture
+def counted_compile(form_gen, monkeypatch):
+    counter = _CompileCounter(form_gen.compile_config)
+    monkeypatch.setattr(form_gen, 'compile_config', counter)
+    return counter
+
+
+def test_ir_cache_hit_and_invalidation(form_gen, counted_compile, tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    yaml_path = _write_form(tmp_path / 'form.yaml', [_text('name')])
+
+    first = form_gen.compile_form(yaml_path, cache_dir)
+    cached = form_gen.compile_form(yaml_path, cache_dir)
+    assert counted_compile.calls == 1
+    assert [q.id for q in cached.sections[0].questions] == ['name']
+    assert cached.sections[0].digest == first.sections[0].digest
+
+    # Editing the YAML changes the key
+    _write_form(yaml_path, [_text('name'), _text('email')])
+    edited = form_gen.compile_form(yaml_path, cache_dir)
+    assert counted_compile.calls == 2
+    assert [q.id for q in edited.sections[0].questions] == ['name', 'email']
+
+    # So does an IR format change
+    monkeypatch.setattr(form_gen, 'IR_VERSION', form_gen.IR_VERSION + 1)
+    form_gen.compile_form(yaml_path, cache_dir)
+    assert counted_compile.calls == 3
+
+
+def test_ir_cache_corrupt_entry_is_a_miss(form_gen, counted_compile, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    yaml_path = _write_form(tmp_path / 'form.yaml', [_text('name')])
+    form_gen.compile_form(yaml_path, cache_dir)
+
+    for entry in cache_dir.iterdir():
+        entry.write_bytes(b'not a pickle')
+    form = form_gen.compile_form(yaml_path, cache_dir)
+    assert counted_compile.calls == 2
+    assert form.title == 'Test Form'
+
+
+# --optimize
+
+def test_prune_css_keeps_only_used_rules(form_gen):
+    css = """
+/* theme */
+body { margin: 0; }
+.used, .unused { color: red; }
+.unused { color: blue; }
+.used .unused { color: green; }
+@media (max-width: 600px) { .unused { display: none; } }
+@media print { .used { display: block; } }
+@keyframes pulse { from { opacity: 0; } to { opacity: 1; } }
+@keyframes spin { to { transform: rotate(1turn); } }
+.used:hover { animation: pulse 1s; }
+"""
+    pruned = form_gen.minify_css(form_gen.prune_css(css, {'used'}))
+
+    assert pruned == ('body{margin:0}.used{color:red}@media print{.used{display:block}}'
+                      '.used:hover{animation:pulse 1s}@keyframes pulse{from{opacity:0}to{opacity:1}}')
+
+
+@pytest.mark.parametrize('form_name', ['example-v2-features.yaml', 'example-survey.yaml'])
+def test_optimize_keeps_css_for_every_rendered_class(form_gen, tmp_path, form_name):
+    yaml_path = form_gen.TEMPLATES_DIR / form_name
+    assets = form_gen.load_assets()
+    styled = set(form_gen._CSS_CLASS.findall(assets['css']))
+
+    output_path = form_gen.generate_form(yaml_path, tmp_path / 'form.html', optimize=True)
+    html = output_path.read_text()
+    css = html.split('<style>', 1)[1].split('</style>', 1)[0]
+    body = html.split('</style>', 1)[1]
+
+    rendered = {name for attr in form_gen._CLASS_ATTR.findall(body) for name in attr.split()}
+    kept = set(form_gen._CSS_CLASS.findall(css))
+    assert rendered
+    assert rendered & styled <= kept
+    assert len(css) < len(assets['css'])
+
+
+def test_minify_js_preserves_code_strings_and_templates(form_gen):
+    js = """
+    /* leading */ const a = 1; // trailing
+    const url = 'http://example.com/*not*/';
+    const t = `line one
+        keep ${ {x: 1}.x } // kept
+    `;
+    const m = s.match(/^['"](.+)['"]$/); /* block */ const b = a / 2;
+    """
+    minified = form_gen.minify_js(js)
+
+    assert 'const a = 1;' in minified
+    assert 'leading' not in minified and 'trailing' not in minified and 'block' not in minified
+    assert "'http://example.com/*not*/'" in minified
+    assert '`line one\n        keep ${ {x: 1}.x } // kept\n    `' in minified
+    assert "/^['\"](.+)['\"]$/" in minified
+    assert 'const b = a / 2;' in minified
+
+
+# Conditional dependency graph
+
+def _graph(form_gen, questions):
+    config = {'title': 'Test Form', 'sections': [{'name': 'Main', 'questions': questions}]}
+    return form_gen.compile_config(config).dependents
+
+
+def test_condition_graph_maps_dependents(form_gen):
+    dependents = _graph(form_gen, [
+        _text('a'),
+        _text('b', show_if="a == 'yes'"),
+        _text('c', required_if='a is_filled AND b is_empty', disabled_if='b is_filled'),
+    ])
+    assert dependents == {'a': ['b', 'c'], 'b': ['c']}
+
+
+@pytest.mark.parametrize('conditions, cycle', [
+    ({'a': 'b is_filled', 'b': 'a is_filled'}, 'b -> a -> b'),
+    ({'a': 'c is_filled', 'b': 'a is_filled', 'c': 'b is_filled'}, 'c -> a -> b -> c'),
+])
+def test_condition_graph_rejects_cycles(form_gen, conditions, cycle):
+    questions = [_text(q_id, show_if=conditions.get(q_id)) for q_id in ('a', 'b', 'c')]
+    with pytest.raises(ValueError, match='cycle') as error:
+        _graph(form_gen, questions)
+    assert cycle in str(error.value)
+
+
+def test_condition_graph_resolves_fields_to_their_question(form_gen):
+    dependents = _graph(form_gen, [
+        {'id': 'deploy', 'title': 'Deploy', 'type': 'text', 'comments': True,
+         'follow_ups': [{'title': 'Why', 'type': 'text'}]},
+        _text('deploy-target', show_if='deploy-followup-0 is_filled'),
+        _text('notes', show_if='deploy-target-comments is_filled', required_if='notes-comments is_filled'),
+    ])
+    # The longest matching id owns a field; a condition on a question's own field is not a cycle
+    assert dependents == {'deploy': ['deploy-target'], 'deploy-target': ['notes'], 'notes': ['notes']}
+
+
+def test_condition_graph_rejects_fields_no_question_renders(form_gen):
+    with pytest.raises(ValueError, match="unknown field 'missing'"):
+        _graph(form_gen, [_text('a', show_if='missing is_filled')])
@@ -0,0 +1,184 @@
+"""Parity and round-trip checks for templates/handoff-parser.py."""
+
+import json
+import shutil
+
+
+def _copy_prefix(source, target, fraction):
+    """Write the first `fraction` of source's lines to target; returns the remaining lines."""
+    lines = source.read_bytes().splitlines(keepends=True)
+    line_count = int(len(lines) * fraction)
+    target.write_bytes(b''.join(lines[:line_count]))
+    return lines[line_count:]
+
+
+# Checkpoints
+
+def test_checkpoint_resume_matches_full_parse(handoff_parser, transcript, tmp_path):
+    path = tmp_path / transcript.name
+    checkpoint_path = str(tmp_path / 'session.checkpoint.json')
+    rest = _copy_prefix(transcript, path, 0.5)
+
+    handoff_parser.parse_transcript_strict(str(path), checkpoint_path)
+    with open(path, 'ab') as f:
+        f.write(b''.join(rest))
+    stats = handoff_parser.ParseStats()
+    resumed = handoff_parser.parse_transcript_strict(str(path), checkpoint_path, stats=stats)
+
+    assert resumed == handoff_parser.parse_transcript_strict(str(path))
+    # Only the appended lines were read
+    assert stats.lines == len(rest)
+    checkpoint = handoff_parser.load_checkpoint(str(path), checkpoint_path)
+    assert checkpoint['offset'] == path.stat().st_size
+
+
+def test_checkpoint_invalidated_by_rewrite_truncation_and_fields(handoff_parser, transcript, tmp_path):
+    path = tmp_path / transcript.name
+    checkpoint_path = str(tmp_path / 'session.checkpoint.json')
+    shutil.copyfile(transcript, path)
+    handoff_parser.parse_transcript_strict(str(path), checkpoint_path)
+    assert handoff_parser.load_checkpoint(str(path), checkpoint_path) is not None
+
+    # Another field selection cannot reuse the reducer state
+    plan = handoff_parser.ExtractionPlan(['files_modified'])
+    assert handoff_parser.load_checkpoint(str(path), checkpoint_path, plan) is None
+
+    # Truncated below the checkpointed offset
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) // 2])
+    assert handoff_parser.load_checkpoint(str(path), checkpoint_path) is None
+
+    # Same size, different head (rotated transcript)
+    first = json.loads(data.splitlines()[0])
+    first['session_id'] = 'X' * len(first['session_id'])
+    path.write_bytes(json.dumps(first).encode('utf-8') + b'\n' + data.split(b'\n', 1)[1])
+    assert path.stat().st_size == len(data)
+    assert handoff_parser.load_checkpoint(str(path), checkpoint_path) is None
+
+
+def test_checkpoint_resume_ignores_partial_last_line(handoff_parser, transcript, tmp_path):
+    path = tmp_path / transcript.name
+    checkpoint_path = str(tmp_path / 'session.checkpoint.json')
+    rest = _copy_prefix(transcript, path, 0.3)
+    # Half of the next line: a writer mid-append
+    with open(path, 'ab') as f:
+        f.write(rest[0][:len(rest[0]) // 2])
+
+    handoff_parser.parse_transcript_strict(str(path), checkpoint_path)
+    with open(path, 'ab') as f:
+        f.write(rest[0][len(rest[0]) // 2:] + b''.join(rest[1:]))
+
+    resumed = handoff_parser.parse_transcript_strict(str(path), checkpoint_path)
+    assert resumed == handoff_parser.parse_transcript_strict(str(path))
+
+
+# Chunk-parallel merge
+
+def _parse_in_chunks(handoff_parser, path, chunks):
+    """parse_transcript_parallel() without the process pool: reduce each range, merge in order."""
+    reducer = None
+    for start, end in handoff_parser.split_chunks(str(path), chunks):
+        state, _, _, _ = handoff_parser._chunk_worker((str(path), start, end, 'full', None, False))
+        chunk_reducer = handoff_parser.SessionReducer.from_state(state)
+        reducer = chunk_reducer if reducer is None else reducer.merge(chunk_reducer)
+    return handoff_parser.finalize_session_data(reducer.session_data(), str(path))
+
+
+def test_chunk_merge_matches_serial_parse(handoff_parser, transcript):
+    serial = handoff_parser.parse_transcript_strict(str(transcript))
+    assert serial['commands_total'] > handoff_parser.RECENT_COMMANDS_LIMIT
+
+    for chunks in (2, 3, 7, 16):
+        assert _parse_in_chunks(handoff_parser, transcript, chunks) == serial
+
+
+def test_split_chunks_cover_every_line_once(handoff_parser, transcript):
+    data = transcript.read_bytes()
+    ranges = handoff_parser.split_chunks(str(transcript), 7)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[start - 1:start] == b'\n'
+
+
+def test_parallel_parse_matches_serial_parse(handoff_parser, transcript, monkeypatch):
+    monkeypatch.setattr(handoff_parser, 'MIN_CHUNK_BYTES', 256 * 1024)
+    serial = handoff_parser.parse_transcript_strict(str(transcript))
+    assert handoff_parser.parse_transcript_parallel(str(transcript), 4) == serial
+
+
+# Fast decode path
+
+def test_fast_and_verify_decoders_match_full(handoff_parser, transcript, capsys):
+    full = handoff_parser.parse_transcript_strict(str(transcript))
+    assert handoff_parser.parse_transcript_strict(str(transcript), decoder='fast') == full
+    assert handoff_parser.parse_transcript_strict(str(transcript), decoder='verify') == full
+    assert 'mismatch' not in capsys.readouterr().err
+
+
+def test_fast_decoder_ignores_nested_timestamp_and_cwd(handoff_parser, tmp_path):
+    entries = [
+        {'type': 'system', 'session_id': 's1', 'cwd': '/repo', 'timestamp': '2026-01-01T09:00:00.000Z'},
+        # No top-level timestamp/cwd; nested ones must not be taken as the entry's
+        {'type': 'user', 'toolUseResult': {'timestamp': '2030-01-01T00:00:00.000Z', 'cwd': '/elsewhere'}},
+        {'type': 'user', 'message': {'cwd': '/nested'}, 'timestamp': '2026-01-01T09:30:00.000Z'},
+    ]
+    path = tmp_path / 'nested.jsonl'
+    path.write_text(''.join(json.dumps(entry) + '\n' for entry in entries))
+
+    full = handoff_parser.parse_transcript_strict(str(path))
+    fast = handoff_parser.parse_transcript_strict(str(path), decoder='fast')
+    assert fast == full
+    assert fast['project'] == '/repo'
+    assert fast['time_end'] == '2026-01-01T09:30:00.000Z'
+
+
+def test_targeted_entry_requires_top_level_key(handoff_parser):
+    targeted = handoff_parser._targeted_entry
+    assert targeted(b'{"a": 1, "timestamp": "T", "cwd": "/x"}') == {'timestamp': 'T', 'cwd': '/x'}
+    assert targeted(b'{"a": {"timestamp": "T"}}') is None
+    assert targeted(b'{"a": [{"b": "}"}], "timestamp": "T"}') == {'timestamp': 'T'}
+    assert targeted(b'{"a": "x", "b": 2}') == {}
+
+
+# Inverted index
+
+def test_posting_list_round_trip(handoff_parser):
+    encode, decode = handoff_parser.encode_postings, handoff_parser.decode_postings
+    postings = {1: (0, 1), 2: (1, 127), 130: (2, 128), 20000: (0, 3), 2 ** 40: (2, 2 ** 21 + 5)}
+
+    assert decode(encode(postings)) == postings
+    assert decode(encode({})) == {}
+    # Docs are delta-encoded in ascending order regardless of insertion order
+    assert encode(dict(reversed(list(postings.items())))) == encode(postings)
+
+
+def test_ingest_indexes_every_command(handoff_parser, transcript, tmp_path):
+    db_path = str(tmp_path / 'index.db')
+    conn = handoff_parser.open_workspace_index(db_path)
+    records = handoff_parser.iter_batch([str(transcript)], jobs=1, commands_limit=None)
+    assert handoff_parser.ingest_sessions(conn, records) == (1, 0)
+
+    commands = [row[0] for row in conn.execute('SELECT command FROM session_commands ORDER BY seq')]
+    session = handoff_parser.parse_transcript_strict(str(transcript))
+    assert len(commands) == session['commands_total']
+
+    # Tokens of the earliest commands (before the recent window) are findable
+    for token in handoff_parser.command_tokens(commands[0]):
+        hits = handoff_parser.lookup_postings(conn, 'command', token)
+        assert [hit['session_id'] for hit in hits] == [session['session_id']]
+
+    # Re-ingesting replaces rather than double-counts postings
+    records = handoff_parser.iter_batch([str(transcript)], jobs=1, commands_limit=None)
+    before = conn.execute('SELECT kind, term, postings FROM session_postings ORDER BY kind, term').fetchall()
+    handoff_parser.ingest_sessions(conn, records)
+    after = conn.execute('SELECT kind, term, postings FROM session_postings ORDER BY kind, term').fetchall()
+    assert after == before
+
+    # The migration rebuild derives the same posting lists from the child tables
+    with conn:
+        handoff_parser.rebuild_postings(conn)
+    rebuilt = conn.execute('SELECT kind, term, postings FROM session_postings ORDER BY kind, term').fetchall()
+    assert rebuilt == before
+    conn.close()
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+MESO Forms Generator Benchmark
+Scaling measurements for form-gen.py: phase timings, output size and peak memory.
+
+Usage:
+    python3 tools/form-gen-bench.py generate OUT.yaml [--questions 1000] [--seed 42]
+    python3 tools/form-gen-bench.py run [--sizes 10,100,1000,10000] [--themes terminal,biopunk,artdeco]
+                                        [--repeat 3] [-o results.json] [--compare baseline.json]
+
+`generate` writes a seeded synthetic form mixing every question type (with
+follow-ups, validation and conditions). `run` generates one form per size
+and, for each theme, times load (YAML parse), validate (compile to IR),
+render (sections to HTML) and write (stream the document) in a fresh
+process, plus generate_form() end to end. Output bytes and peak RSS are
+recorded, and results are saved as JSON so runs from different commits
+can be compared.
+
+Authored by Rowan Valle; Executed by Claude Code
+Symbiont Systems LLC
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import yaml
+
+
+FORM_GEN_PATH = Path(__file__).parent / 'form-gen.py'
+RESULTS_VERSION = 1
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+THEMES = ['terminal', 'biopunk', 'artdeco']
+PHASES = ['load', 'validate', 'render', 'write', 'generate']
+
+# Questions per synthetic section
+SECTION_SIZE = 100
+
+# Relative weights of generated question types
+QUESTION_MIX = {
+    'radio': 20,
+    'checkbox': 10,
+    'text': 12,
+    'number': 6,
+    'textarea': 10,
+    'ranking': 6,
+    'star-rating': 8,
+    'likert': 10,
+    'range': 8,
+    'importance': 10,
+}
+
+# Timings below this are too noisy to flag as regressions
+MIN_COMPARE_SECONDS = 0.01
+
+WORDS = ('signal', 'membrane', 'lattice', 'vector', 'cortex', 'relay', 'spore', 'kernel', 'filament',
+         'harbor', 'quorum', 'cipher', 'tendril', 'beacon', 'matrix', 'symbiont', 'archive', 'pulse')
+
+
+def load_form_gen():
+    """Import tools/form-gen.py (not a valid module name)."""
+    spec = importlib.util.spec_from_file_location('form_gen', FORM_GEN_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_sizes(value):
+    try:
+        sizes = [int(size) for size in value.split(',') if size.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid sizes: {value!r} (e.g. 10,100,1000)")
+    if not sizes or any(size < 1 for size in sizes):
+        raise argparse.ArgumentTypeError(f"Invalid sizes: {value!r} (e.g. 10,100,1000)")
+    return sizes
+
+
+def parse_themes(value):
+    themes = [theme.strip() for theme in value.split(',') if theme.strip()]
+    unknown = set(themes) - set(THEMES)
+    if not themes or unknown:
+        raise argparse.ArgumentTypeError(f"Unknown theme(s) in {value!r} (choose from {', '.join(THEMES)})")
+    return themes
+
+
+def _words(rng, count):
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def _options(rng, q_id, count, rich=False):
+    options = []
+    for idx in range(count):
+        option = {'value': f"{q_id}-opt{idx}", 'label': _words(rng, 3).title()}
+        if rich:
+            option['description'] = _words(rng, 10)
+            if rng.random() < 0.3:
+                option['pros'] = [_words(rng, 4) for _ in range(2)]
+                option['cons'] = [_words(rng, 4)]
+        options.append(option)
+    if rich and rng.random() < 0.2:
+        options[0]['recommended'] = True
+    return options
+
+
+def _synthetic_question(rng, q_type, idx, radios):
+    q_id = f"q{idx}"
+    question = {'id': q_id, 'title': f"{_words(rng, 6).capitalize()}?", 'type': q_type}
+    if rng.random() < 0.3:
+        question['context'] = _words(rng, 15)
+    if rng.random() < 0.2:
+        question['help_text'] = _words(rng, 8)
+
+    if q_type == 'radio':
+        question['options'] = _options(rng, q_id, rng.randint(2, 5), rich=True)
+        if rng.random() < 0.25:
+            question['follow_ups'] = [
+                {'title': _words(rng, 5), 'type': 'text', 'placeholder': _words(rng, 2)},
+                {'title': _words(rng, 5), 'type': 'radio', 'options': _options(rng, f"{q_id}-fu", 2)},
+            ]
+        if rng.random() < 0.3:
+            question['reasoning'] = True
+    elif q_type in ('checkbox', 'ranking'):
+        question['options'] = _options(rng, q_id, rng.randint(3, 6))
+    elif q_type in ('text', 'textarea'):
+        question['placeholder'] = _words(rng, 3)
+        if rng.random() < 0.3:
+            question['validation'] = {'required': True, 'min_length': 3, 'max_length': 200}
+        if q_type == 'textarea':
+            question['rows'] = 4
+    elif q_type == 'number':
+        question['validation'] = {'min': 0, 'max': rng.choice([10, 100, 1000])}
+    elif q_type == 'star-rating':
+        question['max'] = 5
+        question['labels'] = {'min': 'Poor', 'max': 'Excellent'}
+    elif q_type == 'likert':
+        question.update({'min': 1, 'max': rng.choice([5, 7, 10]), 'min_label': 'Disagree', 'max_label': 'Agree'})
+    elif q_type == 'range':
+        question.update({'min': 0, 'max': 100, 'step': 5, 'unit': '%'})
+    elif q_type == 'importance':
+        question.update({'min': 1, 'max': 10, 'default': 5})
+
+    # Conditions only reference earlier questions, so the graph stays acyclic
+    if radios and q_type != 'radio' and rng.random() < 0.1:
+        ref_id, ref_value = rng.choice(radios)
+        question['show_if'] = f"{ref_id} == '{ref_value}'"
+    if rng.random() < 0.15:
+        question['comments'] = True
+    return question
+
+
+def synthetic_form(questions, seed=42):
+    """A seeded form definition with `questions` questions of every type."""
+    rng = random.Random(seed)
+    kinds = list(QUESTION_MIX)
+    weights = [QUESTION_MIX[kind] for kind in kinds]
+
+    sections = []
+    radios = []
+    for idx in range(questions):
+        if idx % SECTION_SIZE == 0:
+            sections.append({'name': f"SECTION {len(sections) + 1}: {_words(rng, 2).upper()}", 'questions': []})
+        q_type = rng.choices(kinds, weights)[0]
+        question = _synthetic_question(rng, q_type, idx, radios)
+        if q_type == 'radio':
+            radios.append((question['id'], question['options'][0]['value']))
+        sections[-1]['questions'].append(question)
+
+    return {
+        'title': f"Benchmark Form {questions}",
+        'description': f"Synthetic {questions}-question form (seed {seed})",
+        'total_questions': questions,
+        'sections': sections,
+    }
+
+
+def generate_form_yaml(output_path, questions, seed=42):
+    form = synthetic_form(questions, seed)
+    with open(output_path, 'w') as f:
+        yaml.dump(form, f, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper), sort_keys=False, width=120)
+    return {'path': str(output_path), 'questions': questions, 'seed': seed,
+            'sections': len(form['sections']), 'yaml_bytes': os.path.getsize(output_path)}
+
+
+def measure_case(yaml_path, theme, repeat=3, optimize=False, lazy=False):
+    """
+    Time each phase of one form/theme in this process (best of `repeat`).
+
+    Runs in a fresh process per case (see run_case()) so peak RSS belongs
+    to this form alone.
+    """
+    fg = load_form_gen()
+    assets = fg.load_assets(theme)
+    timings = {phase: [] for phase in PHASES}
+
+    with tempfile.TemporaryDirectory(prefix='form-gen-bench-') as workdir:
+        output_path = Path(workdir) / 'form.html'
+        for _ in range(repeat):
+            start = time.perf_counter()
+            config = fg.load_yaml(yaml_path)
+            timings['load'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            form = fg.compile_config(config)
+            timings['validate'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            rendered = {id(section): fg.render_section(section, theme) for section in form.sections}
+            timings['render'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            js_content = fg.fill_placeholders(assets['js_parts'], fg.form_placeholders(form))
+            with open(output_path, 'w') as f:
+                fg.write_document(f, form, form.sections, assets['css'], js_content, theme,
+                                  render=lambda section, _theme: rendered[id(section)], lazy=lazy)
+            timings['write'].append(time.perf_counter() - start)
+            del rendered
+
+            start = time.perf_counter()
+            fg.generate_form(yaml_path, output_path, theme, assets, optimize=optimize, lazy=lazy)
+            timings['generate'].append(time.perf_counter() - start)
+
+        output_bytes = output_path.stat().st_size
+
+    result = {f"{phase}_seconds": round(min(values), 5) for phase, values in timings.items()}
+    result['output_bytes'] = output_bytes
+    return result
+
+
+def run_case(yaml_path, theme, repeat, optimize, lazy):
+    """measure_case() in a child process; adds its peak RSS."""
+    argv = [sys.executable, str(Path(__file__).resolve()), 'case', str(yaml_path),
+            '--theme', theme, '--repeat', str(repeat)]
+    if optimize:
+        argv.append('--optimize')
+    if lazy:
+        argv.append('--lazy')
+
+    # stderr goes to a file so a long traceback cannot fill its pipe while
+    # stdout is read; wait4() (not communicate()) keeps the child's rusage
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=stderr_file)
+        stdout = proc.stdout.read()
+        proc.stdout.close()
+        _, status, rusage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        if proc.returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors='replace').strip()
+            raise RuntimeError(f"Benchmark case {yaml_path} ({theme}) failed: {stderr}")
+
+    result = json.loads(stdout)
+    result['peak_rss_kb'] = rusage.ru_maxrss
+    return result
+
+
+def run_benchmark(sizes, themes, repeat=3, seed=42, optimize=False, lazy=False, keep_dir=None):
+    results = []
+    if keep_dir is not None:
+        Path(keep_dir).mkdir(parents=True, exist_ok=True)
+    workdir = keep_dir or tempfile.mkdtemp(prefix='form-gen-bench-data-')
+    try:
+        for questions in sizes:
+            form = generate_form_yaml(Path(workdir) / f"bench-{questions}-{seed}.yaml", questions, seed)
+            for theme in themes:
+                result = {'questions': questions, 'theme': theme, 'sections': form['sections'],
+                          'yaml_bytes': form['yaml_bytes']}
+                result.update(run_case(form['path'], theme, repeat, optimize, lazy))
+                result['questions_per_sec'] = round(questions / result['generate_seconds'])
+                results.append(result)
+
+                print(f"  {questions:>6} q {theme:<9} "
+                      + ' '.join(f"{phase} {result[phase + '_seconds']:.3f}s" for phase in PHASES)
+                      + f"  {result['output_bytes'] / 1024:>9.1f} KB {result['peak_rss_kb'] / 1024:>7.1f} MB RSS",
+                      file=sys.stderr)
+    finally:
+        if keep_dir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', '-C', str(Path(__file__).parent), 'rev-parse', 'HEAD'],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(current, baseline, threshold=0.10):
+    """Print per-case time/RSS/size ratios against a baseline; returns regression count."""
+    previous = {(result['questions'], result['theme']): result for result in baseline.get('results', [])}
+    regressions = 0
+
+    print(f"Compared with {baseline.get('git_commit') or 'baseline'}:", file=sys.stderr)
+    for result in current['results']:
+        old = previous.get((result['questions'], result['theme']))
+        if not old:
+            continue
+        ratios = {
+            'time': result['generate_seconds'] / old['generate_seconds'] if old['generate_seconds'] else 1.0,
+            'rss': result['peak_rss_kb'] / old['peak_rss_kb'],
+            'bytes': result['output_bytes'] / old['output_bytes'],
+        }
+        if max(result['generate_seconds'], old['generate_seconds']) < MIN_COMPARE_SECONDS:
+            ratios['time'] = 1.0
+        flag = ''
+        if any(ratio > 1 + threshold for ratio in ratios.values()):
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f"  {result['questions']:>6} q {result['theme']:<9} "
+              + '  '.join(f"{name} x{ratio:.2f}" for name, ratio in ratios.items()) + flag, file=sys.stderr)
+
+    return regressions
+
+
+def generate_main(args):
+    info = generate_form_yaml(args.output, args.questions, args.seed)
+    print(json.dumps(info, indent=2))
+
+
+def case_main(args):
+    print(json.dumps(measure_case(args.form, args.theme, args.repeat, args.optimize, args.lazy)))
+
+
+def run_main(args):
+    fg = load_form_gen()
+    print(f"Benchmarking form-gen {fg.GENERATOR_VERSION}: sizes {', '.join(map(str, args.sizes))}, "
+          f"themes {', '.join(args.themes)}", file=sys.stderr)
+
+    results = {
+        'version': RESULTS_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'generator_version': fg.GENERATOR_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'yaml_loader': fg.YAML_LOADER.__name__,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'optimize': args.optimize,
+        'lazy': args.lazy,
+        'results': run_benchmark(args.sizes, args.themes, args.repeat, args.seed, args.optimize, args.lazy,
+                                 args.keep),
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        print(f"Results written to: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if compare_results(results, baseline):
+            sys.exit(2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark form-gen.py')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_output_args(sub):
+        sub.add_argument('--repeat', type=int, default=3, help='Runs per case, best kept (default: 3)')
+        sub.add_argument('--optimize', action='store_true', help='Benchmark generate_form() with --optimize')
+        sub.add_argument('--lazy', action='store_true', help='Benchmark --lazy output')
+
+    generate = subparsers.add_parser('generate', help='Write a synthetic form YAML')
+    generate.add_argument('output', help='Output YAML path')
+    generate.add_argument('--questions', type=int, default=1000, help='Number of questions (default: 1000)')
+    generate.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    generate.set_defaults(func=generate_main)
+
+    run = subparsers.add_parser('run', help='Benchmark generation across form sizes and themes')
+    run.add_argument('--sizes', type=parse_sizes, default=DEFAULT_SIZES,
+                     help=f"Comma-separated question counts (default: {','.join(map(str, DEFAULT_SIZES))})")
+    run.add_argument('--themes', type=parse_themes, default=THEMES,
+                     help=f"Comma-separated themes (default: {','.join(THEMES)})")
+    run.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    add_output_args(run)
+    run.add_argument('-o', '--output', help='Write results JSON here (default: stdout)')
+    run.add_argument('--compare', help='Baseline results JSON; exits 2 on a >10%% time/RSS/size regression')
+    run.add_argument('--keep', metavar='DIR', help='Write the synthetic forms to DIR and keep them')
+    run.set_defaults(func=run_main)
+
+    # Internal: one measured case, run in a fresh process by `run`
+    case = subparsers.add_parser('case')
+    case.add_argument('form')
+    case.add_argument('--theme', default='terminal', choices=THEMES)
+    add_output_args(case)
+    case.set_defaults(func=case_main)
+
+    args = parser.parse_args()
+    if getattr(args, 'repeat', 1) < 1:
+        parser.error('--repeat must be at least 1')
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,14 +8,114 @@ Symbiont Systems LLC
 """
 
 import argparse
+import glob
+import hashlib
+import inspect
+import itertools
 import json
+import multiprocessing
+import io
 import os
+import pickle
+import re
 import sys
+import time
 import yaml
 from pathlib import Path
 from datetime import datetime
 
 
+# Bump when generated HTML changes, so build manifests are invalidated
+GENERATOR_VERSION = '2.5.1'
+
+TEMPLATES_DIR = Path(__file__).parent.parent / 'templates' / 'forms'
+JS_FILES = ['validation.js', 'conditional-logic.js', 'form-logic.js']
+
+# Per-form values substituted into the JS templates
+PLACEHOLDER_PATTERN = re.compile(r'\{\{(TOTAL_QUESTIONS|STORAGE_KEY|EXPORT_FILENAME|VALIDATION_RULES|CONDITION_DEPENDENTS|FIELD_INDEX)\}\}')
+
+# Lazy mode: placeholder height per question for sections not yet rendered
+LAZY_QUESTION_HEIGHT = 160
+
+# Build mode: per-output content hashes, stored in the output directory
+MANIFEST_NAME = '.form-gen-manifest.json'
+
+
+# C-accelerated loader when libyaml is available
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Bump when the IR records change, so cached IR is not reused
+IR_VERSION = 4
+
+# Validation rules understood by validation.js (and the generated Python
+# validator); flag rules take no constraint and are dropped when false
+VALIDATION_RULES = ('required', 'pattern', 'min_length', 'max_length', 'min', 'max', 'email', 'url', 'slug')
+VALIDATION_FLAGS = ('required', 'email', 'url', 'slug')
+
+# Conditional question fields, and the expression atoms conditional-logic.js
+# evaluates (joined by AND/OR); group 1 is the referenced question id
+CONDITION_FIELDS = ('show_if', 'required_if', 'disabled_if')
+CONDITION_ATOMS = [
+    re.compile(r'(\S+)\s+is_empty'),
+    re.compile(r'(\S+)\s+is_filled'),
+    re.compile(r'(\S+)\s+contains\s+[\'"](.+)[\'"]'),
+    re.compile(r'(\S+)\s+(==|!=|>=|<=|>|<)\s+[\'"]?(.+?)[\'"]?'),
+]
+
+
+def default_cache_dir():
+    """Compiled IR cache: $FORM_GEN_CACHE_DIR, else $XDG_CACHE_HOME/form-gen/ir."""
+    if os.environ.get('FORM_GEN_CACHE_DIR'):
+        return Path(os.environ['FORM_GEN_CACHE_DIR'])
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return Path(cache_home) / 'form-gen' / 'ir'
+
+
+class _Record:
+    """Slotted record; unset fields are None."""
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+
+class Option(_Record):
+    """A radio/checkbox/ranking choice or follow-up radio choice."""
+    __slots__ = ('value', 'label', 'description', 'recommended', 'pros', 'cons', 'implementation')
+
+
+class FollowUp(_Record):
+    __slots__ = ('title', 'type', 'placeholder', 'options')
+
+
+class Question(_Record):
+    """
+    One question. Fields shared by every type carry their render defaults;
+    type-specific numbers (min, max, step, default, rows) stay None when
+    unset because their defaults depend on the type.
+    """
+    __slots__ = ('id', 'title', 'type', 'context', 'help_text', 'tooltip', 'placeholder',
+                 'options', 'min', 'max', 'step', 'rows', 'default', 'unit', 'show_value',
+                 'labels', 'min_label', 'max_label', 'validation', 'rule', 'show_if', 'required_if',
+                 'disabled_if', 'reasoning', 'comments', 'follow_ups')
+
+
+class Section(_Record):
+    """A named group of questions; digest hashes its YAML content (see render memoization)."""
+    __slots__ = ('name', 'questions', 'digest')
+
+
+class Form(_Record):
+    """
+    rules is the deduplicated validation rule table ([checks, message] entries,
+    see compile_validation()) that Question.rule indexes; dependents maps a
+    question id to the ids whose conditions reference it.
+    """
+    __slots__ = ('title', 'description', 'total_questions', 'validation_presets', 'sections',
+                 'rules', 'dependents')
+
+
 def load_yaml(yaml_path):
     """Load and parse YAML form definition."""
     yaml_path = Path(yaml_path)
@@ -23,11 +123,218 @@ def load_yaml(yaml_path):
         raise FileNotFoundError(f"YAML file not found: {yaml_path}")
 
     with open(yaml_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=YAML_LOADER)
+
+
+def _compile_options(raw_options, owner):
+    options = []
+    for idx, raw in enumerate(raw_options or []):
+        for field in ('value', 'label'):
+            if field not in raw:
+                raise ValueError(f"Option {idx} of '{owner}' missing '{field}'")
+        options.append(Option(
+            value=raw['value'],
+            label=raw['label'],
+            description=raw.get('description', ''),
+            recommended=raw.get('recommended', False),
+            pros=raw.get('pros', []),
+            cons=raw.get('cons', []),
+            implementation=raw.get('implementation', ''),
+        ))
+    return options
+
+
+def _compile_question(raw):
+    q_id = raw['id']
+    follow_ups = []
+    for fu_idx, fu in enumerate(raw.get('follow_ups', [])):
+        for field in ('title', 'type'):
+            if field not in fu:
+                raise ValueError(f"Follow-up {fu_idx} of question '{q_id}' missing '{field}'")
+        follow_ups.append(FollowUp(
+            title=fu['title'],
+            type=fu['type'],
+            placeholder=fu.get('placeholder', ''),
+            options=_compile_options(fu.get('options', []), f"{q_id} follow-up {fu_idx}"),
+        ))
+
+    return Question(
+        id=q_id,
+        title=raw['title'],
+        type=raw['type'],
+        context=raw.get('context', ''),
+        help_text=raw.get('help_text', ''),
+        tooltip=raw.get('tooltip', ''),
+        placeholder=raw.get('placeholder', ''),
+        options=_compile_options(raw.get('options', []), q_id),
+        min=raw.get('min'),
+        max=raw.get('max'),
+        step=raw.get('step'),
+        rows=raw.get('rows'),
+        default=raw.get('default'),
+        unit=raw.get('unit', ''),
+        show_value=raw.get('show_value', True),
+        labels=raw.get('labels', {}),
+        min_label=raw.get('min_label'),
+        max_label=raw.get('max_label'),
+        validation=raw.get('validation'),
+        show_if=raw.get('show_if'),
+        required_if=raw.get('required_if'),
+        disabled_if=raw.get('disabled_if'),
+        reasoning=raw.get('reasoning'),
+        comments=raw.get('comments'),
+        follow_ups=follow_ups,
+    )
 
 
-def validate_schema(config):
-    """Validate YAML schema has required fields."""
+def compile_validation(validation, presets, owner):
+    """
+    Compile a question's validation block to ([[rule, constraint], ...], message).
+
+    The preset is merged in and checks keep their order, as validateField()
+    would apply them at runtime; unknown presets and rules are rejected.
+    """
+    if not isinstance(validation, dict):
+        raise ValueError(f"Question '{owner}' validation must be a mapping")
+
+    rules = dict(validation)
+    preset = rules.get('preset')
+    if preset is not None:
+        if preset not in presets:
+            raise ValueError(f"Question '{owner}' uses unknown validation preset '{preset}'")
+        rules.update(presets[preset])
+
+    checks = []
+    for rule, constraint in rules.items():
+        if rule in ('preset', 'error_message'):
+            continue
+        if rule not in VALIDATION_RULES:
+            raise ValueError(f"Question '{owner}' has unknown validation rule '{rule}'")
+        if rule in VALIDATION_FLAGS and constraint is False:
+            continue
+        checks.append([rule, constraint])
+    return checks, rules.get('error_message') or None
+
+
+def validation_table(questions, presets):
+    """Set each question's rule index into a deduplicated table, returned as a list."""
+    if not isinstance(presets, dict):
+        raise ValueError("'validation_presets' must be a mapping")
+
+    table = []
+    index = {}
+    for question in questions:
+        if not question.validation:
+            continue
+        entry = list(compile_validation(question.validation, presets, question.id))
+        key = json.dumps(entry, sort_keys=True)
+        if key not in index:
+            index[key] = len(table)
+            table.append(entry)
+        question.rule = index[key]
+    return table
+
+
+def condition_references(expr):
+    """
+    Question ids referenced by a show_if/required_if/disabled_if expression.
+
+    Splits on AND, then OR, like evaluateExpression(); raises ValueError for
+    an atom conditional-logic.js could not evaluate.
+    """
+    expr = expr.strip()
+    if not expr:
+        return []
+    for joiner in (' AND ', ' OR '):
+        if joiner in expr:
+            return [ref for part in expr.split(joiner) for ref in condition_references(part)]
+    for pattern in CONDITION_ATOMS:
+        match = pattern.fullmatch(expr)
+        if match:
+            return [match.group(1)]
+    raise ValueError(f"Cannot parse condition: {expr!r}")
+
+
+def _field_owner(name, known):
+    """
+    Question id whose rendered fields include `name`, or None.
+
+    Besides the question's own id, fields are named <id>-<suffix>
+    (follow-ups, comments, reasoning, checkbox and ranking options); the
+    longest matching id wins.
+    """
+    if name in known:
+        return name
+    end = name.rfind('-')
+    while end > 0:
+        if name[:end] in known:
+            return name[:end]
+        end = name.rfind('-', 0, end)
+    return None
+
+
+def condition_graph(questions):
+    """
+    Dependency adjacency map for conditional questions: {id: [dependent ids]}.
+
+    A condition may name any field a question renders; it depends on the
+    owning question (see _field_owner()). Rejects names no question can
+    render and dependency cycles, so the client can re-evaluate dependents
+    transitively.
+    """
+    known = {question.id for question in questions}
+    dependents = {}
+    for question in questions:
+        for field in CONDITION_FIELDS:
+            expr = getattr(question, field)
+            if expr is None:
+                continue
+            if not isinstance(expr, str):
+                raise ValueError(f"Question '{question.id}' {field} must be a string")
+            try:
+                refs = condition_references(expr)
+            except ValueError as e:
+                raise ValueError(f"Question '{question.id}' {field}: {e}") from None
+            for ref in refs:
+                owner = _field_owner(ref, known)
+                if owner is None:
+                    raise ValueError(f"Question '{question.id}' {field} references unknown field '{ref}'")
+                targets = dependents.setdefault(owner, [])
+                if question.id not in targets:
+                    targets.append(question.id)
+
+    # Iterative DFS; a grey node reached again closes a cycle
+    state = {}
+    for root in dependents:
+        if root in state:
+            continue
+        state[root] = 'grey'
+        path = [root]
+        stack = [iter(dependents[root])]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                state[path.pop()] = 'black'
+                stack.pop()
+            elif node == path[-1]:
+                # A condition on the question's own follow-up/comment field
+                continue
+            elif state.get(node) == 'grey':
+                cycle = path[path.index(node):] + [node]
+                raise ValueError(f"Conditional dependency cycle: {' -> '.join(cycle)}")
+            elif node not in state:
+                state[node] = 'grey'
+                path.append(node)
+                stack.append(iter(dependents.get(node, ())))
+
+    return dependents
+
+
+def compile_config(config):
+    """Validate a loaded YAML config and build its Form IR in one pass."""
+    if not isinstance(config, dict):
+        raise ValueError("Form definition must be a YAML mapping")
+
     required_fields = ['title', 'sections']
 
     for field in required_fields:
@@ -37,12 +344,14 @@ def validate_schema(config):
     if not isinstance(config['sections'], list) or len(config['sections']) == 0:
         raise ValueError("'sections' must be a non-empty list")
 
+    sections = []
     for section_idx, section in enumerate(config['sections']):
         if 'name' not in section:
             raise ValueError(f"Section {section_idx} missing 'name' field")
         if 'questions' not in section or not section['questions']:
             raise ValueError(f"Section '{section['name']}' has no questions")
 
+        questions = []
         for q_idx, question in enumerate(section['questions']):
             if 'id' not in question:
                 raise ValueError(f"Question {q_idx} in section '{section['name']}' missing 'id'")
@@ -50,6 +359,79 @@ def validate_schema(config):
                 raise ValueError(f"Question '{question['id']}' missing 'title'")
             if 'type' not in question:
                 raise ValueError(f"Question '{question['id']}' missing 'type'")
+            questions.append(_compile_question(question))
+
+        digest = hashlib.sha256(json.dumps(section, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        sections.append(Section(name=section['name'], questions=questions, digest=digest))
+
+    questions = [q for section in sections for q in section.questions]
+    presets = config.get('validation_presets') or {}
+
+    return Form(
+        title=config.get('title', 'Form'),
+        description=config.get('description', ''),
+        total_questions=config.get('total_questions', 0),
+        validation_presets=presets,
+        sections=sections,
+        rules=validation_table(questions, presets),
+        dependents=condition_graph(questions),
+    )
+
+
+def validate_schema(config):
+    """Validate YAML schema has required fields."""
+    compile_config(config)
+
+
+def compile_form(yaml_path, cache_dir=None):
+    """
+    Load, validate and compile a YAML form definition to its Form IR.
+
+    With cache_dir, the IR is pickled there keyed by a hash of the YAML
+    bytes, so unchanged files skip YAML parsing entirely.
+    """
+    yaml_path = Path(yaml_path)
+    if not yaml_path.exists():
+        raise FileNotFoundError(f"YAML file not found: {yaml_path}")
+
+    if cache_dir is None:
+        return compile_config(load_yaml(yaml_path))
+
+    with open(yaml_path, 'rb') as f:
+        source = f.read()
+    key = hashlib.sha256(f"{IR_VERSION}\0".encode('utf-8') + source).hexdigest()
+    cache_path = Path(cache_dir) / f"{key}.pickle"
+
+    # A missing, corrupt or foreign cache entry (e.g. pickled while this file
+    # was imported under another module name) is just a cache miss
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        if isinstance(cached, Form):
+            return cached
+    except Exception:
+        pass
+
+    # Named stream so YAML errors still point at the file
+    stream = io.BytesIO(source)
+    stream.name = str(yaml_path)
+    form = compile_config(yaml.load(stream, Loader=YAML_LOADER))
+
+    # Cache writes are best effort; a read-only cache (or IR classes pickle
+    # cannot import by name) just means no speedup
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(form, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except (OSError, pickle.PicklingError, AttributeError):
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+    return form
 
 
 def build_data_attributes(question):
@@ -57,34 +439,39 @@ def build_data_attributes(question):
     attrs = []
 
     # Validation attributes
-    validation = question.get('validation')
-    if validation:
-        attrs.append(f'data-validation=\'{json.dumps(validation)}\'')
+    # Index into the form's VALIDATION_RULES table
+    if question.rule is not None:
+        attrs.append(f'data-validation="{question.rule}"')
 
     # Conditional logic attributes
-    show_if = question.get('show_if')
+    show_if = question.show_if
     if show_if:
         attrs.append(f'data-show-if="{show_if}"')
 
-    required_if = question.get('required_if')
+    required_if = question.required_if
     if required_if:
         attrs.append(f'data-required-if="{required_if}"')
 
-    disabled_if = question.get('disabled_if')
+    disabled_if = question.disabled_if
     if disabled_if:
         attrs.append(f'data-disabled-if="{disabled_if}"')
 
     return ' '.join(attrs)
 
 
+def _or(value, default):
+    """Type-specific default for an unset (None) Question field."""
+    return default if value is None else value
+
+
 def render_question(question, theme='terminal'):
     """Render a single question to HTML."""
-    q_id = question['id']
-    q_title = question['title']
-    q_type = question['type']
-    q_context = question.get('context', '')
-    help_text = question.get('help_text', '')
-    tooltip = question.get('tooltip', '')
+    q_id = question.id
+    q_title = question.title
+    q_type = question.type
+    q_context = question.context
+    help_text = question.help_text
+    tooltip = question.tooltip
 
     html_parts = []
     html_parts.append(f'<div class="question" data-question="{q_id}">')
@@ -98,15 +485,15 @@ def render_question(question, theme='terminal'):
 
     # Render input based on type
     if q_type == 'radio':
-        options = question.get('options', [])
+        options = question.options
         for idx, option in enumerate(options):
-            opt_value = option['value']
-            opt_label = option['label']
-            opt_desc = option.get('description', '')
-            opt_recommended = option.get('recommended', False)
-            opt_pros = option.get('pros', [])
-            opt_cons = option.get('cons', [])
-            opt_impl = option.get('implementation', '')
+            opt_value = option.value
+            opt_label = option.label
+            opt_desc = option.description
+            opt_recommended = option.recommended
+            opt_pros = option.pros
+            opt_cons = option.cons
+            opt_impl = option.implementation
 
             option_class = 'option'
             if opt_recommended:
@@ -142,12 +529,12 @@ def render_question(question, theme='terminal'):
             html_parts.append('  </div>')
 
     elif q_type == 'checkbox':
-        options = question.get('options', [])
+        options = question.options
         html_parts.append('  <div class="checkbox-group">')
         for idx, option in enumerate(options):
-            opt_value = option['value']
-            opt_label = option['label']
-            opt_desc = option.get('description', '')
+            opt_value = option.value
+            opt_label = option.label
+            opt_desc = option.description
 
             html_parts.append('    <label>')
             # Add data attributes to first checkbox for conditional logic
@@ -161,36 +548,36 @@ def render_question(question, theme='terminal'):
         html_parts.append('  </div>')
 
     elif q_type == 'text':
-        placeholder = question.get('placeholder', '')
+        placeholder = question.placeholder
         html_parts.append(f'  <label for="{q_id}" class="sr-only">{q_title}</label>')
         html_parts.append(f'  <input type="text" id="{q_id}" name="{q_id}" placeholder="{placeholder}" {data_attrs} aria-label="{q_title}">')
 
     elif q_type == 'number':
-        min_val = question.get('min', '')
-        max_val = question.get('max', '')
-        placeholder = question.get('placeholder', '')
+        min_val = _or(question.min, '')
+        max_val = _or(question.max, '')
+        placeholder = question.placeholder
         html_parts.append(f'  <label for="{q_id}" class="sr-only">{q_title}</label>')
         html_parts.append(f'  <input type="number" id="{q_id}" name="{q_id}" min="{min_val}" max="{max_val}" placeholder="{placeholder}" {data_attrs} aria-label="{q_title}">')
 
     elif q_type == 'textarea':
-        placeholder = question.get('placeholder', '')
-        rows = question.get('rows', 4)
+        placeholder = question.placeholder
+        rows = _or(question.rows, 4)
         html_parts.append(f'  <label for="{q_id}" class="sr-only">{q_title}</label>')
         html_parts.append(f'  <textarea id="{q_id}" name="{q_id}" rows="{rows}" placeholder="{placeholder}" {data_attrs} aria-label="{q_title}"></textarea>')
 
     elif q_type == 'ranking':
-        options = question.get('options', [])
+        options = question.options
         for idx, option in enumerate(options):
-            opt_value = option['value']
-            opt_label = option['label']
+            opt_value = option.value
+            opt_label = option.label
             html_parts.append('  <div class="ranking-item">')
             html_parts.append(f'    <input type="number" name="{q_id}-{opt_value}" min="1" max="{len(options)}" value="{idx + 1}">')
             html_parts.append(f'    <span>{opt_label}</span>')
             html_parts.append('  </div>')
 
     elif q_type == 'star-rating':
-        max_stars = question.get('max', 5)
-        labels = question.get('labels', {})
+        max_stars = _or(question.max, 5)
+        labels = question.labels
         min_label = labels.get('min', '')
         max_label = labels.get('max', '')
 
@@ -212,10 +599,10 @@ def render_question(question, theme='terminal'):
         html_parts.append('  </fieldset>')
 
     elif q_type == 'likert':
-        min_val = question.get('min', 1)
-        max_val = question.get('max', 10)
-        min_label = question.get('min_label', '')
-        max_label = question.get('max_label', '')
+        min_val = _or(question.min, 1)
+        max_val = _or(question.max, 10)
+        min_label = _or(question.min_label, '')
+        max_label = _or(question.max_label, '')
 
         html_parts.append('  <fieldset class="likert-scale">')
         html_parts.append(f'    <legend class="sr-only">{q_title}</legend>')
@@ -236,12 +623,12 @@ def render_question(question, theme='terminal'):
         html_parts.append('  </fieldset>')
 
     elif q_type == 'range':
-        min_val = question.get('min', 0)
-        max_val = question.get('max', 100)
-        step = question.get('step', 1)
-        unit = question.get('unit', '')
-        show_value = question.get('show_value', True)
-        default = question.get('default', (min_val + max_val) // 2)
+        min_val = _or(question.min, 0)
+        max_val = _or(question.max, 100)
+        step = _or(question.step, 1)
+        unit = question.unit
+        show_value = question.show_value
+        default = _or(question.default, (min_val + max_val) // 2)
 
         html_parts.append('  <div class="range-input">')
         html_parts.append(f'    <input type="range" id="{q_id}" name="{q_id}" min="{min_val}" max="{max_val}" step="{step}" value="{default}" {data_attrs}>')
@@ -250,11 +637,11 @@ def render_question(question, theme='terminal'):
         html_parts.append('  </div>')
 
     elif q_type == 'importance':
-        min_val = question.get('min', 1)
-        max_val = question.get('max', 10)
-        default = question.get('default', 5)
-        min_label = question.get('min_label', 'Low')
-        max_label = question.get('max_label', 'Critical')
+        min_val = _or(question.min, 1)
+        max_val = _or(question.max, 10)
+        default = _or(question.default, 5)
+        min_label = _or(question.min_label, 'Low')
+        max_label = _or(question.max_label, 'Critical')
 
         html_parts.append('  <div class="importance-gauge">')
         html_parts.append('    <div class="gauge-track">')
@@ -278,21 +665,21 @@ def render_question(question, theme='terminal'):
         html_parts.append(f'  <span class="tooltip" title="{tooltip}"></span>')
 
     # Add reasoning field if requested
-    if question.get('reasoning'):
+    if question.reasoning:
         html_parts.append('  <label class="reasoning-label">Your reasoning:</label>')
         html_parts.append(f'  <textarea name="{q_id}-reasoning" class="reasoning" rows="3" placeholder="Explain your choice..."></textarea>')
 
     # Add comments field if requested
-    if question.get('comments'):
+    if question.comments:
         html_parts.append('  <label class="comments-label">Comments / Additional thoughts:</label>')
         html_parts.append(f'  <textarea name="{q_id}-comments" class="comments" rows="3" placeholder="Any other context, concerns, or ideas..."></textarea>')
 
     # Add follow-up questions
-    follow_ups = question.get('follow_ups', [])
+    follow_ups = question.follow_ups
     for fu_idx, follow_up in enumerate(follow_ups):
-        fu_title = follow_up['title']
-        fu_type = follow_up['type']
-        fu_placeholder = follow_up.get('placeholder', '')
+        fu_title = follow_up.title
+        fu_type = follow_up.type
+        fu_placeholder = follow_up.placeholder
 
         html_parts.append('  <div class="follow-up">')
         html_parts.append(f'    <div class="follow-up-title">{fu_title}</div>')
@@ -304,10 +691,10 @@ def render_question(question, theme='terminal'):
         elif fu_type == 'textarea':
             html_parts.append(f'    <textarea name="{q_id}-followup-{fu_idx}" rows="3" placeholder="{fu_placeholder}"></textarea>')
         elif fu_type == 'radio':
-            fu_options = follow_up.get('options', [])
+            fu_options = follow_up.options
             for fu_opt in fu_options:
-                fu_opt_value = fu_opt['value']
-                fu_opt_label = fu_opt['label']
+                fu_opt_value = fu_opt.value
+                fu_opt_label = fu_opt.label
                 html_parts.append(f'    <label>')
                 html_parts.append(f'      <input type="radio" name="{q_id}-followup-{fu_idx}" value="{fu_opt_value}">')
                 html_parts.append(f'      {fu_opt_label}')
@@ -322,8 +709,8 @@ def render_question(question, theme='terminal'):
 
 def render_section(section, theme='terminal'):
     """Render a section with all its questions."""
-    section_name = section['name']
-    questions = section['questions']
+    section_name = section.name
+    questions = section.questions
 
     html_parts = []
     html_parts.append('<div class="section">')
@@ -337,27 +724,168 @@ def render_section(section, theme='terminal'):
     return '\n'.join(html_parts)
 
 
-def inject_template(config, sections_html, css_content, js_content, theme='terminal'):
-    """Inject generated content into base template."""
-    title = config.get('title', 'Form')
-    description = config.get('description', '')
-    total_questions = config.get('total_questions', 0)
+def split_placeholders(text):
+    """Split template text into literal chunks (even indexes) and placeholder names (odd)."""
+    return PLACEHOLDER_PATTERN.split(text)
+
+
+def fill_placeholders(parts, values):
+    """Join split_placeholders() output, substituting each placeholder once."""
+    return ''.join(values[part] if idx % 2 else part for idx, part in enumerate(parts))
+
+
+def question_fields(question):
+    """
+    Fields that decide whether a question counts as answered, mirroring the
+    rendered HTML: ('radio', names) if it has any radio group, else
+    ('text', names) of its text/number/textarea inputs.
+    """
+    q_id = question.id
+    radios = []
+    if question.type == 'radio' and question.options:
+        radios.append(q_id)
+    elif question.type == 'star-rating' and _or(question.max, 5) >= 1:
+        radios.append(q_id)
+    elif question.type == 'likert' and _or(question.max, 10) >= _or(question.min, 1):
+        radios.append(q_id)
+    for fu_idx, follow_up in enumerate(question.follow_ups):
+        if follow_up.type == 'radio' and follow_up.options:
+            radios.append(f"{q_id}-followup-{fu_idx}")
+    if radios:
+        return 'radio', radios
+
+    inputs = []
+    if question.type in ('text', 'number', 'textarea'):
+        inputs.append(q_id)
+    elif question.type == 'ranking':
+        inputs.extend(f"{q_id}-{option.value}" for option in question.options)
+    if question.reasoning:
+        inputs.append(f"{q_id}-reasoning")
+    if question.comments:
+        inputs.append(f"{q_id}-comments")
+    for fu_idx, follow_up in enumerate(question.follow_ups):
+        if follow_up.type in ('text', 'number', 'textarea'):
+            inputs.append(f"{q_id}-followup-{fu_idx}")
+    return 'text', inputs
+
+
+def field_index(form):
+    """Per-question field index for form-logic.js: {id: [mode, [field names]]}."""
+    return {
+        question.id: list(question_fields(question))
+        for section in form.sections
+        for question in section.questions
+    }
+
+
+def form_placeholders(form):
+    """Per-form placeholder values for the JS templates."""
+    title = form.title
+    slug = title.lower().replace(' ', '-')
+
+    return {
+        'TOTAL_QUESTIONS': str(form.total_questions),
+        # Create storage key from title
+        'STORAGE_KEY': f"meso-form-{slug}",
+        # Create export filename
+        'EXPORT_FILENAME': f"{datetime.now().strftime('%Y-%m-%d')}-{slug}.json",
+        'VALIDATION_RULES': json.dumps(form.rules, separators=(',', ':')),
+        'CONDITION_DEPENDENTS': json.dumps(form.dependents, separators=(',', ':')),
+        'FIELD_INDEX': json.dumps(field_index(form), separators=(',', ':')),
+    }
+
+
+def validator_tables(form):
+    """Rule table and per-question rows embedded in a generated response validator."""
+    questions = [
+        [q.id, q.type, [str(option.value) for option in q.options], q.rule,
+         q.show_if, q.required_if, q.disabled_if]
+        for section in form.sections
+        for q in section.questions
+    ]
+    return {'title': form.title, 'rules': form.rules, 'questions': questions}
+
+
+def response_data(response):
+    """The field mapping of an export ({formTitle, exportDate, data}) or a bare mapping."""
+    if not isinstance(response, dict):
+        raise ValueError("Response must be a JSON object")
+    data = response.get('data', response) if 'exportDate' in response else response
+    if not isinstance(data, dict):
+        raise ValueError("Response 'data' must be a JSON object")
+    return data
+
+
+def iter_responses(paths):
+    """Yield (label, response or exception) for files, directories and '-' (JSON Lines on stdin)."""
+    for path in paths:
+        if path == '-':
+            for line_num, line in enumerate(sys.stdin, 1):
+                if line.strip():
+                    try:
+                        yield f"<stdin>:{line_num}", json.loads(line)
+                    except ValueError as e:
+                        yield f"<stdin>:{line_num}", e
+            continue
+
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in names if name.endswith('.json')
+            )
+        else:
+            files = [path]
+
+        for file_path in files:
+            try:
+                with open(file_path, 'r') as f:
+                    yield file_path, json.load(f)
+            except (OSError, ValueError) as e:
+                yield file_path, e
+
+
+def write_validator(form, output_path):
+    """
+    Write a standalone Python validator for the form's exported responses.
+
+    It embeds the same compiled rule table as the HTML, so server-side and
+    in-browser validation agree (see templates/forms/response-validator.py).
+    The response loader is copied from response_data()/iter_responses(),
+    which form-stats.py shares.
+    """
+    template = (TEMPLATES_DIR / 'response-validator.py').read_text()
+    loader = '\n\n\n'.join(inspect.getsource(fn).rstrip('\n') for fn in (response_data, iter_responses))
+    # JSON goes inside r'''...''', so single quotes must not appear literally
+    tables = json.dumps(validator_tables(form), separators=(',', ':')).replace("'", '\\u0027')
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(template.replace('{{FORM_TABLES}}', tables, 1).replace('{{RESPONSE_LOADER}}', loader, 1))
+    output_path.chmod(0o755)
+    return output_path
+
 
-    # Create storage key from title
-    storage_key = f"meso-form-{title.lower().replace(' ', '-')}"
+def document_shell(form):
+    """
+    Page shell around the inlined assets and sections.
 
-    # Create export filename
-    export_filename = f"{datetime.now().strftime('%Y-%m-%d')}-{title.lower().replace(' ', '-')}.json"
+    Returns (head, header, footer, tail): the document is head + CSS +
+    header + sections + footer + JS + tail.
+    """
+    title = form.title
+    description = form.description
+    total_questions = form.total_questions
 
-    # Build complete HTML
-    html = f"""<!DOCTYPE html>
+    head = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{title}</title>
     <style>
-{css_content}
+"""
+    header = f"""
     </style>
 </head>
 <body>
@@ -378,7 +906,8 @@ def inject_template(config, sections_html, css_content, js_content, theme='termi
     </header>
 
     <form id="form">
-{sections_html}
+"""
+    footer = """
     </form>
 
     <div class="actions">
@@ -389,91 +918,828 @@ def inject_template(config, sections_html, css_content, js_content, theme='termi
     </div>
 
     <script>
-{js_content}
+"""
+    tail = """
     </script>
 </body>
 </html>"""
+    return head, header, footer, tail
+
+
+def write_document(out, form, sections, css_content, js_content, theme='terminal', render=render_section,
+                   lazy=False):
+    """
+    Stream the complete HTML document to `out`.
+
+    Each section is rendered with render(section, theme) and written in
+    turn, so peak memory is one section rather than the whole document.
+    js_content must already have its placeholders filled (see
+    fill_placeholders()).
+
+    With lazy, every section after the first is wrapped in an inert
+    <template> inside a sized placeholder; form-logic.js renders it when
+    scrolled near (or before printing/validating).
+    """
+    head, header, footer, tail = document_shell(form)
+
+    out.write(head)
+    out.write(css_content)
+    out.write(header)
+
+    for idx, section in enumerate(sections):
+        if idx:
+            out.write('\n')
+        if lazy and idx:
+            height = LAZY_QUESTION_HEIGHT * len(section.questions)
+            out.write(f'<div class="lazy-section" style="min-height: {height}px"><template>\n')
+            out.write(render(section, theme))
+            out.write('\n</template></div>')
+        else:
+            out.write(render(section, theme))
 
-    # Replace placeholders in JS
-    html = html.replace('{{TOTAL_QUESTIONS}}', str(total_questions))
-    html = html.replace('{{STORAGE_KEY}}', storage_key)
-    html = html.replace('{{EXPORT_FILENAME}}', export_filename)
-
-    return html
-
-
-def generate_form(yaml_path, output_path=None, theme='terminal'):
-    """Main generation function."""
-    # Load YAML
-    config = load_yaml(yaml_path)
-
-    # Validate schema
-    validate_schema(config)
+    out.write(footer)
+    out.write(js_content)
+    out.write(tail)
 
-    # Determine output path
-    if output_path is None:
-        yaml_file = Path(yaml_path)
-        output_path = yaml_file.parent / f"{yaml_file.stem}.html"
 
-    # Load CSS and JS templates
-    templates_dir = Path(__file__).parent.parent / 'templates' / 'forms'
+def load_assets(theme='terminal'):
+    """
+    Load theme CSS and the combined JS templates.
 
-    css_path = templates_dir / f'{theme}-theme.css'
+    Returns a dict with 'css', 'js' (placeholders unfilled), 'js_modules'
+    ([(file name, source)]), 'js_parts' (see split_placeholders()) and 'digest', a hash of the CSS and JS plus
+    the theme and generator version. Build mode loads this once and
+    shares it across every form.
+    """
+    css_path = TEMPLATES_DIR / f'{theme}-theme.css'
     if not css_path.exists():
-        css_path = templates_dir / 'terminal-theme.css'
-
-    js_paths = [
-        templates_dir / 'validation.js',
-        templates_dir / 'conditional-logic.js',
-        templates_dir / 'form-logic.js'
-    ]
+        css_path = TEMPLATES_DIR / 'terminal-theme.css'
 
     with open(css_path, 'r') as f:
         css_content = f.read()
 
     # Load and combine all JavaScript files
-    js_parts = []
-    for js_path in js_paths:
+    js_modules = []
+    for js_name in JS_FILES:
+        js_path = TEMPLATES_DIR / js_name
         if js_path.exists():
             with open(js_path, 'r') as f:
-                js_parts.append(f.read())
+                js_modules.append((js_name, f.read()))
         else:
             # Skip v2.0 files if they don't exist (backward compatibility)
             if js_path.name not in ['validation.js', 'conditional-logic.js']:
                 raise FileNotFoundError(f"Required JS file not found: {js_path}")
 
-    js_content = '\n\n'.join(js_parts)
+    js_content = '\n\n'.join(text for _, text in js_modules)
+
+    digest = hashlib.sha256()
+    for part in (GENERATOR_VERSION, theme, css_content, js_content):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+
+    return {
+        'theme': theme,
+        'css': css_content,
+        'js': js_content,
+        'js_modules': js_modules,
+        # Split once here; each form then fills the placeholders in one join
+        'js_parts': split_placeholders(js_content),
+        'digest': digest.hexdigest(),
+    }
+
+
+# JS modules only inlined when the form uses their feature
+JS_MODULE_FEATURES = {
+    'validation.js': 'validation',
+    'conditional-logic.js': 'conditionals',
+}
+
+_CSS_STRING_OR_COMMENT = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+_CSS_CLASS = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+_CLASS_ATTR = re.compile(r'class="([^"]*)"')
+_JS_TOKEN = re.compile(r'[\w-]+')
+# Keywords after which '/' starts a regex literal
+_JS_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void', 'delete', 'throw',
+                      'new', 'instanceof', 'yield', 'await'}
+
+
+def form_features(form):
+    """Optional features a form uses: 'validation', 'conditionals'."""
+    features = set()
+    for section in form.sections:
+        for question in section.questions:
+            if question.rule is not None or question.required_if:
+                features.add('validation')
+            if question.show_if or question.required_if or question.disabled_if:
+                features.add('conditionals')
+    return features
+
+
+def _css_blocks(css):
+    """Split comment-free CSS into top-level (prelude, body) blocks; bare statements have body None."""
+    blocks = []
+    depth = 0
+    start = 0
+    body_start = 0
+    quote = None
+    for idx, char in enumerate(css):
+        if quote:
+            if char == quote and css[idx - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            if depth == 0:
+                body_start = idx + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                blocks.append((css[start:body_start - 1].strip(), css[body_start:idx]))
+                start = idx + 1
+        elif char == ';' and depth == 0:
+            blocks.append((css[start:idx + 1].strip(), None))
+            start = idx + 1
+    return blocks
+
+
+def prune_css(css, used_classes):
+    """
+    Drop rules whose selectors need a class the form never uses.
+
+    A selector is kept when all its classes are in used_classes; rules
+    without classes are always kept. Empty @media blocks and @keyframes
+    no kept rule animates with are dropped. Comments are removed.
+    """
+    css = _CSS_STRING_OR_COMMENT.sub(lambda m: m.group(1) or '', css)
+
+    def prune(text):
+        kept = []
+        keyframes = []
+        for prelude, body in _css_blocks(text):
+            if body is None:
+                kept.append(prelude)
+            elif prelude.startswith('@keyframes'):
+                keyframes.append((prelude.split()[1], f"{prelude}{{{body}}}"))
+            elif prelude.startswith('@'):
+                inner, inner_keyframes = prune(body)
+                keyframes.extend(inner_keyframes)
+                if inner.strip():
+                    kept.append(f"{prelude}{{{inner}}}")
+            else:
+                selectors = [selector for selector in prelude.split(',')
+                             if all(name in used_classes for name in _CSS_CLASS.findall(selector))]
+                if selectors:
+                    kept.append(f"{','.join(selectors)}{{{body}}}")
+        return '\n'.join(kept), keyframes
+
+    pruned, keyframes = prune(css)
+    animated = set(_JS_TOKEN.findall(pruned))
+    return '\n'.join([pruned] + [text for name, text in keyframes if name in animated])
+
+
+def minify_css(css):
+    """Collapse whitespace outside strings (comments must already be stripped)."""
+    parts = []
+    for idx, part in enumerate(re.split(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')', css)):
+        if idx % 2:
+            parts.append(part)
+            continue
+        part = re.sub(r'\s+', ' ', part)
+        part = re.sub(r'\s*([{};,>~])\s*', r'\1', part)
+        part = re.sub(r':\s+', ':', part)
+        part = part.replace(';}', '}')
+        parts.append(part)
+    return ''.join(parts).strip()
+
+
+def _js_literal_end(js, idx):
+    """End of the string or regex literal starting at js[idx] (exclusive)."""
+    quote = js[idx]
+    in_class = False
+    idx += 1
+    while idx < len(js):
+        char = js[idx]
+        if char == '\\':
+            idx += 2
+            continue
+        if quote == '/':
+            if char == '[':
+                in_class = True
+            elif char == ']':
+                in_class = False
+            elif char == '/' and not in_class:
+                idx += 1
+                while idx < len(js) and (js[idx].isalnum() or js[idx] == '_'):
+                    idx += 1
+                return idx
+        elif char == quote:
+            return idx + 1
+        if char == '\n' and quote != '`':
+            break
+        idx += 1
+    raise ValueError(f"Unterminated JS literal at offset {idx}")
+
+
+def _js_template_end(js, idx):
+    """Scan template literal text from js[idx]; returns (end, True) at '${' or (end, False) after the closing '`'."""
+    while idx < len(js):
+        char = js[idx]
+        if char == '\\':
+            idx += 2
+        elif char == '`':
+            return idx + 1, False
+        elif char == '$' and js.startswith('${', idx):
+            return idx + 2, True
+        else:
+            idx += 1
+    raise ValueError("Unterminated JS template literal")
+
+
+def _js_regex_allowed(out):
+    """Whether a '/' after the emitted code starts a regex literal rather than a division."""
+    end = len(out)
+    while end and out[end - 1] in ' \t\n':
+        end -= 1
+    if not end:
+        return True
+    last = out[end - 1]
+    if last in '(,=:[!&|?{};+-*%<>~^':
+        return True
+    if last.isalnum() or last in '_$':
+        start = end
+        while start and (out[start - 1].isalnum() or out[start - 1] in '_$'):
+            start -= 1
+        return out[start:end] in _JS_REGEX_KEYWORDS
+    return False
+
+
+def minify_js(js):
+    """
+    Conservatively shrink JS: drop comments, indentation, trailing
+    whitespace and blank lines. Strings, template literals and regex
+    literals are copied verbatim. Line breaks are kept so automatic
+    semicolon insertion is unaffected.
+    """
+    out = ''
+    idx = 0
+    line_start = True
+    # Open `${` expressions in template literals: brace depth within each
+    templates = []
+
+    def newline(text):
+        text = text.rstrip(' \t\r')
+        if text and not text.endswith('\n'):
+            text += '\n'
+        return text
+
+    while idx < len(js):
+        char = js[idx]
+        if char == '\n':
+            out = newline(out)
+            line_start = True
+            idx += 1
+            continue
+        if char in ' \t\r' and line_start:
+            idx += 1
+            continue
+
+        if js.startswith('//', idx):
+            end = js.find('\n', idx)
+            idx = len(js) if end == -1 else end
+            continue
+        if js.startswith('/*', idx):
+            end = js.find('*/', idx + 2)
+            if end == -1:
+                raise ValueError(f"Unterminated JS comment at offset {idx}")
+            if '\n' in js[idx:end]:
+                out = newline(out)
+                line_start = True
+            elif not line_start:
+                out += ' '
+            idx = end + 2
+            continue
+
+        line_start = False
+        if char in '\'"' or (char == '/' and _js_regex_allowed(out)):
+            end = _js_literal_end(js, idx)
+        elif char == '`' or (char == '}' and templates and templates[-1] == 0):
+            if char == '}':
+                templates.pop()
+            end, opened = _js_template_end(js, idx + 1)
+            if opened:
+                templates.append(0)
+        else:
+            if templates and char == '{':
+                templates[-1] += 1
+            elif templates and char == '}':
+                templates[-1] -= 1
+            end = idx + 1
+        out += js[idx:end]
+        idx = end
+
+    return newline(out).rstrip('\n')
+
+
+def used_classes(form, js_content, sections_html):
+    """Class names the document can use: rendered sections, the shell and (dynamically) the JS."""
+    classes = set()
+    for text in itertools.chain(document_shell(form), sections_html):
+        for attr in _CLASS_ATTR.findall(text):
+            classes.update(attr.split())
+    # Classes toggled at runtime appear as tokens in the JS
+    classes.update(_JS_TOKEN.findall(js_content))
+    return classes
+
+
+def optimize_assets(form, assets, theme='terminal', render=None):
+    """
+    Prune and minify the inlined assets for one form.
+
+    JS modules for unused features are omitted (JS_MODULE_FEATURES), CSS
+    rules for classes the form never renders are dropped, and both are
+    minified. Returns (css, js_parts) with placeholders still unfilled.
+
+    Sections are rendered through `render`, a SectionMemo that the caller
+    passes on to write_document() so each section is rendered only once.
+    """
+    if render is None:
+        render = SectionMemo()
+    features = form_features(form)
+    modules = [text for name, text in assets['js_modules']
+               if JS_MODULE_FEATURES.get(name, True) is True or JS_MODULE_FEATURES[name] in features]
+    js_content = minify_js('\n\n'.join(modules))
+    sections_html = (render(section, theme) for section in form.sections)
+    css_content = minify_css(prune_css(assets['css'], used_classes(form, js_content, sections_html)))
+    return css_content, split_placeholders(js_content)
+
+
+def generate_form(yaml_path, output_path=None, theme='terminal', assets=None, cache_dir=None,
+                  optimize=False, sizes=None, lazy=False):
+    """
+    Main generation function.
+
+    With optimize, unused CSS rules and JS modules are pruned and the rest
+    minified (see optimize_assets()). If a `sizes` dict is passed, it is
+    filled with the document's byte size before and after optimization.
+    With lazy, only the first section is rendered on page load (see
+    write_document()).
+    """
+    # Load, validate and compile YAML (or reuse the cached IR)
+    form = compile_form(yaml_path, cache_dir)
 
-    # Extract validation presets (v2.0)
-    validation_presets = config.get('validation_presets', {})
+    # Determine output path
+    if output_path is None:
+        yaml_file = Path(yaml_path)
+        output_path = yaml_file.parent / f"{yaml_file.stem}.html"
 
-    # Inject validation presets into JavaScript
-    js_content = js_content.replace(
-        '{{VALIDATION_PRESETS}}',
-        json.dumps(validation_presets)
-    )
+    # Load CSS and JS templates (unless shared by build mode)
+    if assets is None:
+        assets = load_assets(theme)
+    placeholders = form_placeholders(form)
+    css_content = assets['css']
+    js_content = fill_placeholders(assets['js_parts'], placeholders)
+
+    render = render_section
+    if optimize:
+        full_size = len(css_content.encode('utf-8')) + len(js_content.encode('utf-8'))
+        # CSS pruning needs every section's classes before the <head> is
+        # written, so sections are rendered once up front and reused
+        render = SectionMemo()
+        css_content, js_parts = optimize_assets(form, assets, theme, render)
+        js_content = fill_placeholders(js_parts, placeholders)
+
+    # Stream the document straight to the output file
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Render sections
-    sections_html_parts = []
-    for section in config['sections']:
-        sections_html_parts.append(render_section(section, theme))
+    with open(output_path, 'w') as f:
+        write_document(f, form, form.sections, css_content, js_content, theme, render, lazy)
 
-    sections_html = '\n'.join(sections_html_parts)
+    if sizes is not None:
+        size = output_path.stat().st_size
+        sizes['after'] = size
+        sizes['before'] = size
+        if optimize:
+            sizes['before'] = size - len(css_content.encode('utf-8')) - len(js_content.encode('utf-8')) + full_size
 
-    # Inject into template
-    final_html = inject_template(config, sections_html, css_content, js_content, theme)
+    return output_path
 
-    # Write output
+
+class SectionMemo:
+    """
+    render_section() memoized by section content digest.
+
+    A rebuild only renders sections whose YAML changed; retain() drops
+    entries for sections no longer in the form.
+    """
+
+    def __init__(self):
+        self.rendered = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(section, theme):
+        # Rule indexes depend on the whole form, not just this section's YAML
+        return section.digest, theme, tuple(question.rule for question in section.questions)
+
+    def __call__(self, section, theme='terminal'):
+        key = self.key(section, theme)
+        html = self.rendered.get(key)
+        if html is None:
+            html = render_section(section, theme)
+            self.rendered[key] = html
+            self.misses += 1
+        else:
+            self.hits += 1
+        return html
+
+    def retain(self, form, theme):
+        keep = {self.key(section, theme) for section in form.sections}
+        self.rendered = {key: html for key, html in self.rendered.items() if key in keep}
+        self.hits = self.misses = 0
+
+
+class IncrementalYAML:
+    """
+    Form YAML loader for watch mode that re-parses only changed sections.
+
+    The block sequence under a top-level `sections:` key is split into one
+    text chunk per item, and each chunk's parse is cached by its text.
+    Layouts it cannot split safely (flow style, anchors shared between
+    chunks) fall back to a full parse.
+    """
+
+    def __init__(self):
+        self.chunks = {}
+        self.parsed = 0
+
+    def load(self, yaml_path):
+        with open(yaml_path, 'r') as f:
+            text = f.read()
+
+        self.parsed = 0
+        try:
+            config = self._load_split(text)
+        except yaml.YAMLError:
+            config = None
+
+        if config is None:
+            self.chunks = {}
+            self.parsed = 1
+            stream = io.StringIO(text)
+            stream.name = str(yaml_path)
+            return yaml.load(stream, Loader=YAML_LOADER)
+        return config
+
+    def _parse(self, chunk, chunks):
+        if chunk in self.chunks:
+            value = self.chunks[chunk]
+        else:
+            value = yaml.load(chunk, Loader=YAML_LOADER)
+            self.parsed += 1
+        chunks[chunk] = value
+        return value
+
+    def _load_split(self, text):
+        lines = text.splitlines(keepends=True)
+        start = next((i for i, line in enumerate(lines) if line.rstrip() == 'sections:'), None)
+        if start is None:
+            return None
+
+        # The block ends at the next top-level key
+        end = next((i for i in range(start + 1, len(lines))
+                    if lines[i][:1] not in ('', ' ', '\t', '\n', '\r', '#', '-')), len(lines))
+        body = lines[start + 1:end]
+
+        first = next((line for line in body if line.strip() and not line.lstrip().startswith('#')), None)
+        if first is None or not first.lstrip(' ').startswith('-'):
+            return None
+        item_prefix = first[:len(first) - len(first.lstrip(' '))] + '-'
+        starts = [i for i, line in enumerate(body)
+                  if line.startswith(item_prefix) and line[len(item_prefix):len(item_prefix) + 1] in (' ', '\n', '\r', '')]
+        starts[0] = 0
+
+        chunks = {}
+        header = self._parse(''.join(lines[:start] + lines[end:]), chunks)
+        if header is None:
+            header = {}
+        if not isinstance(header, dict):
+            return None
+
+        sections = []
+        for chunk_start, chunk_end in zip(starts, starts[1:] + [len(body)]):
+            items = self._parse(''.join(body[chunk_start:chunk_end]), chunks)
+            if not isinstance(items, list) or len(items) != 1:
+                return None
+            sections.append(items[0])
+
+        self.chunks = chunks
+        header['sections'] = sections
+        return header
+
+
+def _watched_files(yaml_path, theme):
+    css_path = TEMPLATES_DIR / f'{theme}-theme.css'
+    if not css_path.exists():
+        css_path = TEMPLATES_DIR / 'terminal-theme.css'
+    return [Path(yaml_path), css_path] + [TEMPLATES_DIR / name for name in JS_FILES]
+
+
+def _snapshot(paths):
+    snapshot = []
+    for path in paths:
+        try:
+            stat = path.stat()
+            snapshot.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            snapshot.append(None)
+    return snapshot
+
+
+def watch_form(yaml_path, output_path=None, theme='terminal', interval=0.5, optimize=False, lazy=False,
+               validator_path=None):
+    """
+    Regenerate a form whenever its YAML, theme CSS or JS templates change.
+
+    Polls mtimes every `interval` seconds. Only changed section items are
+    re-parsed (IncrementalYAML) and rendered sections are memoized by
+    content digest, so an edit re-renders only the sections it touched and
+    splices them back between the unchanged ones. optimize and lazy work
+    as in generate_form(); with validator_path, the response validator is
+    rewritten on every rebuild. The IR cache is never used. Errors are
+    reported and watching continues. Runs until interrupted.
+    """
+    if output_path is None:
+        yaml_file = Path(yaml_path)
+        output_path = yaml_file.parent / f"{yaml_file.stem}.html"
     output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, 'w') as f:
-        f.write(final_html)
+    loader = IncrementalYAML()
+    memo = SectionMemo()
+    watched = _watched_files(yaml_path, theme)
+    snapshot = None
+    assets = None
+    assets_snapshot = None
 
-    return output_path
+    try:
+        while True:
+            current = _snapshot(watched)
+            if current != snapshot:
+                snapshot = current
+                started = time.perf_counter()
+                try:
+                    # Section HTML does not depend on assets, so the memo survives asset edits
+                    if current[1:] != assets_snapshot:
+                        assets = load_assets(theme)
+                        assets_snapshot = current[1:]
+
+                    form = compile_config(loader.load(yaml_path))
+                    css_content, js_parts = assets['css'], assets['js_parts']
+                    if optimize:
+                        css_content, js_parts = optimize_assets(form, assets, theme, memo)
+                    js_content = fill_placeholders(js_parts, form_placeholders(form))
+
+                    output_path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = output_path.with_name(output_path.name + '.tmp')
+                    with open(tmp_path, 'w') as f:
+                        write_document(f, form, form.sections, css_content, js_content, theme, memo, lazy)
+                    os.replace(tmp_path, output_path)
+                    if validator_path is not None:
+                        write_validator(form, validator_path)
+
+                    elapsed = (time.perf_counter() - started) * 1000
+                    print(f"✓ Rebuilt {output_path} ({memo.misses}/{len(form.sections)} sections "
+                          f"re-rendered, {loader.parsed} YAML chunks parsed, {elapsed:.0f} ms)", flush=True)
+                    memo.retain(form, theme)
+                except Exception as e:
+                    print(f"✗ Error: {e}", file=sys.stderr, flush=True)
+
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def expand_form_paths(inputs, output_dir=None):
+    """
+    Expand files, directories and glob patterns into (yaml_path, output_path) pairs.
+
+    Directories are searched recursively for *.yaml/*.yml. With output_dir,
+    forms found under a directory keep their relative layout; otherwise
+    each HTML file is written next to its YAML.
+    """
+    seen = set()
+    pairs = []
+
+    for item in inputs:
+        item = os.path.expanduser(item)
+        if os.path.isdir(item):
+            root = Path(item)
+            matches = sorted(p for pattern in ('*.yaml', '*.yml') for p in root.rglob(pattern))
+            relative = [p.relative_to(root) for p in matches]
+        elif glob.has_magic(item):
+            matches = sorted(Path(p) for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+            relative = [Path(p.name) for p in matches]
+        else:
+            matches = [Path(item)]
+            relative = [Path(matches[0].name)]
+
+        for yaml_path, rel in zip(matches, relative):
+            if yaml_path in seen:
+                continue
+            seen.add(yaml_path)
+            if output_dir:
+                output_path = Path(output_dir) / rel.with_suffix('.html')
+            else:
+                output_path = yaml_path.with_suffix('.html')
+            pairs.append((yaml_path, output_path))
+
+    return pairs
+
+
+def format_size_change(sizes):
+    """'42,924 → 18,500 bytes (-57%)' for a generate_form() sizes dict."""
+    before, after = sizes['before'], sizes['after']
+    saved = round(100 * (before - after) / before) if before else 0
+    return f"{before:,} → {after:,} bytes (-{saved}%)"
+
+
+def form_digest(yaml_path, assets, optimize=False, lazy=False):
+    """Content hash of one form: YAML bytes plus the shared asset digest and output options."""
+    digest = hashlib.sha256(assets['digest'].encode('utf-8'))
+    if optimize:
+        digest.update(b'optimize')
+    if lazy:
+        digest.update(b'lazy')
+    with open(yaml_path, 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_path):
+    """Read a build manifest; a missing or unreadable one means rebuild everything."""
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest.get('forms', {})
+
+
+def save_manifest(manifest_path, forms):
+    manifest_path = Path(manifest_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_name(manifest_path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump({'generator_version': GENERATOR_VERSION, 'forms': forms}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+# Per-worker shared assets, set once by _build_init
+_build_assets = None
+
+
+def _build_init(assets):
+    global _build_assets
+    _build_assets = assets
+
+
+def _build_worker(job):
+    """Generate one form, returning (yaml_path, output_path, digest, sizes, error)."""
+    yaml_path, output_path, digest, cache_dir, optimize, lazy = job
+    sizes = {}
+    try:
+        generate_form(yaml_path, output_path, _build_assets['theme'], _build_assets, cache_dir,
+                      optimize, sizes, lazy)
+        return yaml_path, output_path, digest, sizes, None
+    except Exception as e:
+        return yaml_path, output_path, digest, sizes, str(e)
+
+
+def build_forms(inputs, output_dir=None, theme='terminal', jobs=0, force=False, manifest_path=None,
+                cache_dir=None, optimize=False, sizes=None, lazy=False):
+    """
+    Generate every form under the given paths, skipping unchanged ones.
+
+    Theme CSS and JS are loaded once and shared with a process pool. A form
+    is skipped when its output exists and the manifest records the same
+    content hash (YAML + theme + JS + GENERATOR_VERSION). With cache_dir,
+    compiled form IR is reused across builds (see compile_form()). With
+    optimize, each form gets pruned, minified assets (see optimize_assets());
+    a `sizes` dict is filled with the total bytes before and after. lazy
+    is passed through to generate_form().
+
+    Returns (built, skipped, failures) where failures is [(yaml_path, error)].
+    """
+    pairs = expand_form_paths(inputs, output_dir)
+    assets = load_assets(theme)
+
+    if manifest_path is None:
+        manifest_path = Path(output_dir or '.') / MANIFEST_NAME
+    manifest = {} if force else load_manifest(manifest_path)
+
+    work = []
+    skipped = 0
+    for yaml_path, output_path in pairs:
+        key = str(Path(output_path).resolve())
+        try:
+            digest = form_digest(yaml_path, assets, optimize, lazy)
+        except OSError:
+            # Let the worker report the missing/unreadable file
+            work.append((str(yaml_path), key, None, cache_dir, optimize, lazy))
+            continue
+        entry = manifest.get(key)
+        if entry and entry.get('digest') == digest and os.path.exists(key):
+            skipped += 1
+            continue
+        work.append((str(yaml_path), key, digest, cache_dir, optimize, lazy))
+
+    built = 0
+    failures = []
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1 or len(work) <= 1:
+        _build_init(assets)
+        results = map(_build_worker, work)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(min(jobs, len(work)), _build_init, (assets,))
+        results = pool.imap_unordered(_build_worker, work)
+
+    try:
+        for yaml_path, output_path, digest, form_sizes, error in results:
+            if error:
+                failures.append((yaml_path, error))
+                manifest.pop(output_path, None)
+                continue
+            built += 1
+            if sizes is not None:
+                for k, v in form_sizes.items():
+                    sizes[k] = sizes.get(k, 0) + v
+            manifest[output_path] = {'source': str(Path(yaml_path).resolve()), 'theme': theme, 'digest': digest}
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    save_manifest(manifest_path, manifest)
+    return built, skipped, failures
+
+
+def build_main(argv):
+    parser = argparse.ArgumentParser(
+        prog='form-gen.py build',
+        description='Generate HTML forms for every YAML definition under the given paths',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s templates/forms/ -o build/forms
+  %(prog)s 'surveys/**/*.yaml' --theme biopunk -j 8
+        """
+    )
+
+    parser.add_argument('inputs', nargs='+', help='YAML files, directories or glob patterns')
+    parser.add_argument('-o', '--output-dir', help='Output directory (default: next to each YAML)')
+    parser.add_argument('--theme', default='terminal', choices=['terminal', 'biopunk', 'artdeco'],
+                        help='Theme to use (default: terminal)')
+    parser.add_argument('-j', '--jobs', type=int, default=0, help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Rebuild every form, ignoring the manifest')
+    parser.add_argument('--manifest', help=f'Manifest path (default: OUTPUT_DIR/{MANIFEST_NAME})')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the compiled IR cache')
+    parser.add_argument('--optimize', action='store_true',
+                        help='Prune unused CSS/JS and minify the embedded assets')
+    parser.add_argument('--lazy', action='store_true',
+                        help='Render only the first section on load; the rest as they scroll into view')
+
+    args = parser.parse_args(argv)
+    cache_dir = None if args.no_cache else default_cache_dir()
+    sizes = {}
+
+    try:
+        built, skipped, failures = build_forms(args.inputs, args.output_dir, args.theme,
+                                               args.jobs, args.force, args.manifest, cache_dir,
+                                               args.optimize, sizes, args.lazy)
+    except Exception as e:
+        print(f"✗ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for yaml_path, error in failures:
+        print(f"✗ {yaml_path}: {error}", file=sys.stderr)
+    print(f"✓ Built {built} forms ({skipped} unchanged, {len(failures)} failed)")
+    print(f"  Theme: {args.theme}")
+    if args.optimize and sizes:
+        print(f"  Size: {format_size_change(sizes)}")
+
+    if failures:
+        sys.exit(1)
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'build':
+        build_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description='Generate HTML forms from YAML definitions',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -482,6 +1748,8 @@ Examples:
   %(prog)s input.yaml
   %(prog)s input.yaml -o output.html
   %(prog)s input.yaml --theme terminal
+  %(prog)s input.yaml --watch
+  %(prog)s build forms/ -o build/   (see %(prog)s build --help)
         """
     )
 
@@ -489,13 +1757,42 @@ Examples:
     parser.add_argument('-o', '--output', help='Output HTML file (default: input.html)')
     parser.add_argument('--theme', default='terminal', choices=['terminal', 'biopunk', 'artdeco'],
                         help='Theme to use (default: terminal)')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the compiled IR cache')
+    parser.add_argument('--watch', action='store_true',
+                        help='Regenerate on changes to the YAML, theme CSS or JS templates (Ctrl-C to stop)')
+    parser.add_argument('--optimize', action='store_true',
+                        help='Prune unused CSS/JS and minify the embedded assets')
+    parser.add_argument('--lazy', action='store_true',
+                        help='Render only the first section on load; the rest as they scroll into view')
+    parser.add_argument('--validator', nargs='?', const='', metavar='PATH',
+                        help='Also write a Python validator for exported responses '
+                             '(default: OUTPUT_validator.py)')
 
     args = parser.parse_args()
+    cache_dir = None if args.no_cache else default_cache_dir()
+
+    validator_path = None
+    if args.validator is not None:
+        output_path = Path(args.output) if args.output else Path(args.input).with_suffix('.html')
+        validator_path = args.validator or output_path.with_name(f"{output_path.stem}_validator.py")
+
+    if args.watch:
+        print(f"Watching {args.input} (theme: {args.theme})")
+        watch_form(args.input, args.output, args.theme, optimize=args.optimize, lazy=args.lazy,
+                   validator_path=validator_path)
+        return
 
     try:
-        output_path = generate_form(args.input, args.output, args.theme)
+        sizes = {}
+        output_path = generate_form(args.input, args.output, args.theme, cache_dir=cache_dir,
+                                    optimize=args.optimize, sizes=sizes, lazy=args.lazy)
         print(f"✓ Generated form: {output_path}")
         print(f"  Theme: {args.theme}")
+        if args.optimize:
+            print(f"  Size: {format_size_change(sizes)}")
+        if validator_path is not None:
+            write_validator(compile_form(args.input, cache_dir), validator_path)
+            print(f"  Validator: {validator_path}")
         print(f"  Open in browser: file://{output_path.absolute()}")
     except Exception as e:
         print(f"✗ Error: {e}", file=sys.stderr)
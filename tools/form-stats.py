@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+MESO Forms Response Statistics
+Aggregates exported form responses (JSON) into per-question summaries.
+
+Authored by Rowan Valle; Executed by Claude Code
+Symbiont Systems LLC
+"""
+
+import argparse
+import csv
+import functools
+import importlib.util
+import json
+import math
+import sys
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+FORM_GEN_PATH = Path(__file__).parent / 'form-gen.py'
+
+# Responses buffered per question before tallying (bounds memory)
+DEFAULT_BATCH = 4096
+
+# Question types summarized as histograms: type -> (default min, default max)
+SCALE_DEFAULTS = {
+    'likert': (1, 10),
+    'star-rating': (1, 5),
+    'range': (0, 100),
+    'importance': (1, 10),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def load_form_gen():
+    """Import tools/form-gen.py (not a valid module name) for its YAML compiler and response loader."""
+    spec = importlib.util.spec_from_file_location('form_gen', FORM_GEN_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_number(value):
+    """Exported field value as a float, or None when blank or not numeric."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def is_checked(value):
+    """Checkbox fields export their value when checked and false otherwise."""
+    return value not in (None, False, '', 'false')
+
+
+def _bincount(indexes, size, use_numpy):
+    """Counts of each index in range(size)."""
+    if use_numpy:
+        return np.bincount(np.asarray(indexes, dtype=np.intp), minlength=size)
+    counts = [0] * size
+    for index in indexes:
+        counts[index] += 1
+    return counts
+
+
+def _add(totals, counts, use_numpy):
+    if use_numpy:
+        totals += counts
+    else:
+        for index, count in enumerate(counts):
+            totals[index] += count
+
+
+class Tally(ABC):
+    """
+    Per-question aggregate. collect() buffers one response's values;
+    flush() folds the buffer into fixed-size totals.
+    """
+
+    def __init__(self, question, use_numpy):
+        self.question = question
+        self.use_numpy = use_numpy
+        self.answered = 0
+        self.buffer = []
+
+    def _zeros(self, size):
+        return np.zeros(size, dtype=np.int64) if self.use_numpy else [0] * size
+
+    @abstractmethod
+    def collect(self, data):
+        """Count one response's field mapping (answered, buffered values)."""
+
+    def flush(self):
+        self.buffer = []
+
+    def result(self):
+        return {'type': self.question.type, 'answered': self.answered}
+
+
+class ChoiceTally(Tally):
+    """radio/checkbox: count per option; unknown radio values are counted as 'other'."""
+
+    def __init__(self, question, use_numpy):
+        super().__init__(question, use_numpy)
+        self.values = [str(option.value) for option in question.options]
+        self.index = {value: idx for idx, value in enumerate(self.values)}
+        self.counts = self._zeros(len(self.values))
+        self.other = 0
+
+    def collect(self, data):
+        q_id = self.question.id
+        if self.question.type == 'checkbox':
+            checked = [idx for idx, value in enumerate(self.values) if is_checked(data.get(f"{q_id}-{value}"))]
+            if checked:
+                self.answered += 1
+                self.buffer.extend(checked)
+            return
+
+        value = data.get(q_id)
+        if value is None or value == '':
+            return
+        self.answered += 1
+        idx = self.index.get(str(value))
+        if idx is None:
+            self.other += 1
+        else:
+            self.buffer.append(idx)
+
+    def flush(self):
+        if self.buffer:
+            _add(self.counts, _bincount(self.buffer, len(self.values), self.use_numpy), self.use_numpy)
+        super().flush()
+
+    def result(self):
+        result = super().result()
+        result['counts'] = {value: int(count) for value, count in zip(self.values, self.counts)}
+        if self.question.type == 'radio':
+            result['other'] = self.other
+        return result
+
+
+class ScaleTally(Tally):
+    """likert/star-rating/range/importance: histogram over the scale's steps, plus mean."""
+
+    def __init__(self, question, use_numpy):
+        super().__init__(question, use_numpy)
+        low, high = SCALE_DEFAULTS[question.type]
+        if question.type == 'star-rating':
+            self.min, self.max = 1, question.max if question.max is not None else high
+        else:
+            self.min = question.min if question.min is not None else low
+            self.max = question.max if question.max is not None else high
+        self.step = question.step if question.type == 'range' and question.step else 1
+        self.bins = max(int(round((self.max - self.min) / self.step)) + 1, 1)
+        self.counts = self._zeros(self.bins)
+        self.total = 0.0
+        self.out_of_range = 0
+
+    def collect(self, data):
+        value = parse_number(data.get(self.question.id))
+        if value is not None:
+            self.buffer.append(value)
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if self.use_numpy:
+            values = np.asarray(self.buffer, dtype=np.float64)
+            indexes = np.rint((values - self.min) / self.step).astype(np.intp)
+            valid = (indexes >= 0) & (indexes < self.bins)
+            self.counts += np.bincount(indexes[valid], minlength=self.bins)
+            self.total += float(values[valid].sum())
+            in_range = int(valid.sum())
+        else:
+            valid = []
+            for value in self.buffer:
+                idx = int(round((value - self.min) / self.step))
+                if 0 <= idx < self.bins:
+                    self.counts[idx] += 1
+                    valid.append(value)
+            self.total += math.fsum(valid)
+            in_range = len(valid)
+        self.answered += in_range
+        self.out_of_range += len(self.buffer) - in_range
+        super().flush()
+
+    def _label(self, idx):
+        value = self.min + idx * self.step
+        return str(int(value)) if float(value).is_integer() else f"{value:g}"
+
+    def result(self):
+        result = super().result()
+        result['histogram'] = {self._label(idx): int(count) for idx, count in enumerate(self.counts)}
+        result['mean'] = self.total / self.answered if self.answered else None
+        result['out_of_range'] = self.out_of_range
+        return result
+
+
+class NumberTally(Tally):
+    """number: count, mean, min and max."""
+
+    def __init__(self, question, use_numpy):
+        super().__init__(question, use_numpy)
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def collect(self, data):
+        value = parse_number(data.get(self.question.id))
+        if value is not None:
+            self.buffer.append(value)
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if self.use_numpy:
+            values = np.asarray(self.buffer, dtype=np.float64)
+            total, low, high = float(values.sum()), float(values.min()), float(values.max())
+        else:
+            total, low, high = math.fsum(self.buffer), min(self.buffer), max(self.buffer)
+        self.answered += len(self.buffer)
+        self.total += total
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        super().flush()
+
+    def result(self):
+        result = super().result()
+        result['mean'] = self.total / self.answered if self.answered else None
+        result['min'] = self.min
+        result['max'] = self.max
+        return result
+
+
+class RankingTally(Tally):
+    """
+    ranking: per option, the distribution of ranks given ({q_id}-{value}
+    fields hold ranks 1..N), mean rank and first-place count.
+    """
+
+    def __init__(self, question, use_numpy):
+        super().__init__(question, use_numpy)
+        self.values = [str(option.value) for option in question.options]
+        self.size = len(self.values)
+        # Flattened option x rank matrix
+        self.counts = self._zeros(self.size * self.size)
+
+    def collect(self, data):
+        q_id = self.question.id
+        ranked = False
+        for idx, value in enumerate(self.values):
+            rank = parse_number(data.get(f"{q_id}-{value}"))
+            if rank is not None and rank.is_integer() and 1 <= rank <= self.size:
+                self.buffer.append(idx * self.size + int(rank) - 1)
+                ranked = True
+        if ranked:
+            self.answered += 1
+
+    def flush(self):
+        if self.buffer:
+            _add(self.counts, _bincount(self.buffer, self.size * self.size, self.use_numpy), self.use_numpy)
+        super().flush()
+
+    def result(self):
+        result = super().result()
+        options = {}
+        for idx, value in enumerate(self.values):
+            row = [int(count) for count in self.counts[idx * self.size:(idx + 1) * self.size]]
+            ranked = sum(row)
+            options[value] = {
+                'ranks': row,
+                'mean_rank': sum(rank * count for rank, count in enumerate(row, 1)) / ranked if ranked else None,
+                'first': row[0] if row else 0,
+            }
+        result['options'] = options
+        return result
+
+
+class TextTally(Tally):
+    """text/textarea and anything else: how many responses answered."""
+
+    def collect(self, data):
+        value = data.get(self.question.id)
+        if value is not None and str(value).strip():
+            self.answered += 1
+
+
+def make_tally(question, use_numpy):
+    if question.type in ('radio', 'checkbox'):
+        return ChoiceTally(question, use_numpy)
+    if question.type in SCALE_DEFAULTS:
+        return ScaleTally(question, use_numpy)
+    if question.type == 'number':
+        return NumberTally(question, use_numpy)
+    if question.type == 'ranking':
+        return RankingTally(question, use_numpy)
+    return TextTally(question, use_numpy)
+
+
+def aggregate(form, responses, use_numpy=None, batch=DEFAULT_BATCH):
+    """
+    Aggregate (label, response) pairs for a compiled form in constant memory.
+
+    Returns {'form', 'responses', 'skipped', 'questions': {id: summary}};
+    unreadable or malformed responses are counted as skipped and reported
+    on stderr.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    response_data = load_form_gen().response_data
+    tallies = [make_tally(q, use_numpy) for section in form.sections for q in section.questions]
+
+    count = 0
+    skipped = 0
+    pending = 0
+    for label, response in responses:
+        try:
+            if isinstance(response, Exception):
+                raise response
+            data = response_data(response)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Skipped {label}: {e}", file=sys.stderr)
+            skipped += 1
+            continue
+
+        for tally in tallies:
+            tally.collect(data)
+        count += 1
+        pending += 1
+        if pending >= batch:
+            for tally in tallies:
+                tally.flush()
+            pending = 0
+
+    for tally in tallies:
+        tally.flush()
+
+    return {
+        'form': form.title,
+        'responses': count,
+        'skipped': skipped,
+        'questions': {tally.question.id: tally.result() for tally in tallies},
+    }
+
+
+def csv_rows(summary):
+    """Flatten a summary to (question_id, type, metric, key, value) rows."""
+    for q_id, result in summary['questions'].items():
+        q_type = result['type']
+        yield q_id, q_type, 'answered', '', result['answered']
+        for key, value in result.get('counts', {}).items():
+            yield q_id, q_type, 'count', key, value
+        if 'other' in result:
+            yield q_id, q_type, 'count', '(other)', result['other']
+        for key, value in result.get('histogram', {}).items():
+            yield q_id, q_type, 'histogram', key, value
+        for metric in ('mean', 'min', 'max', 'out_of_range'):
+            if metric in result:
+                yield q_id, q_type, metric, '', '' if result[metric] is None else result[metric]
+        for option, stats in result.get('options', {}).items():
+            yield q_id, q_type, 'mean_rank', option, '' if stats['mean_rank'] is None else stats['mean_rank']
+            for rank, value in enumerate(stats['ranks'], 1):
+                yield q_id, q_type, 'rank', f"{option}={rank}", value
+
+
+def write_summary(summary, output, fmt):
+    if fmt == 'csv':
+        writer = csv.writer(output)
+        writer.writerow(['question_id', 'type', 'metric', 'key', 'value'])
+        writer.writerows(csv_rows(summary))
+    else:
+        json.dump(summary, output, indent=2)
+        output.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Aggregate exported form responses into per-question statistics',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s survey.yaml responses/
+  %(prog)s survey.yaml responses/ --format csv -o summary.csv
+  cat responses.jsonl | %(prog)s survey.yaml -
+        """
+    )
+
+    parser.add_argument('form', help='YAML form definition the responses were exported from')
+    parser.add_argument('paths', nargs='+', help='Response JSON files, directories, or - for JSON Lines on stdin')
+    parser.add_argument('--format', default='json', choices=['json', 'csv'], help='Output format (default: json)')
+    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    parser.add_argument('--batch', type=int, default=DEFAULT_BATCH,
+                        help=f'Responses tallied per batch (default: {DEFAULT_BATCH})')
+    parser.add_argument('--no-numpy', action='store_true', help='Tally in pure Python even if NumPy is installed')
+
+    args = parser.parse_args()
+
+    try:
+        form_gen = load_form_gen()
+        form = form_gen.compile_form(args.form)
+        summary = aggregate(form, form_gen.iter_responses(args.paths), use_numpy=np is not None and not args.no_numpy,
+                            batch=max(args.batch, 1))
+        if args.output:
+            with open(args.output, 'w', newline='') as f:
+                write_summary(summary, f, args.format)
+        else:
+            write_summary(summary, sys.stdout, args.format)
+    except Exception as e:
+        print(f"✗ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"✓ Aggregated {summary['responses']} responses ({summary['skipped']} skipped)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()